@@ -3,10 +3,44 @@
 This package provides tools and utilities for working with the ISIC 2019
 skin lesion classification challenge dataset and models.
 
+Public names are resolved lazily through the module-level ``__getattr__`` so
+that ``import isic4kit`` stays cheap: pydantic and the JSON data are only
+loaded when a classifier or model is first used.
+
 Classes:
     ISIC4Classifier: Main classifier for skin lesion images.
 """
 
-from .isic4 import ISIC4Classifier
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    "ISIC4Classifier": ".isic4",
+    "ISICSection": ".models",
+    "ISICDivision": ".models",
+    "ISICGroup": ".models",
+    "ISICClass": ".models",
+    "ISICSubclass": ".models",
+    "ISICHierarchy": ".models",
+    "ISICSearchResult": ".models",
+    "ISICSearchResults": ".models",
+    "ISICSearchPage": ".models",
+    "ISICConcordanceMatch": ".models",
+    "ISICSuggestion": ".models",
+    "ISICConcordance": ".concordance",
+    "Tree": ".tree",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["ISIC4Classifier"]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,264 @@
+"""Aggregation of records by ISIC4 hierarchy level.
+
+Counts (or sums of weights) of records are accumulated per code into an array
+indexed by the node ids of an `ISICIndex`, then rolled up through all levels
+in one bottom-up pass. Because nodes are stored in depth-first order, every
+parent precedes its children, so visiting the nodes in reverse order adds each
+subtree to its parent after the subtree itself is complete.
+
+Distinct codes are counted first (with `collections.Counter` for unweighted
+records), so millions of records cost one hashing pass plus one lookup per
+distinct code.
+
+Example:
+    >>> totals = isic.aggregate(["0111", "0111", "0520", "2824"])
+    >>> totals["01"], totals["B"], totals.total
+    (2, 1, 4)
+    >>> totals.level("division")
+    {'01': 2, '05': 1, '28': 1}
+    >>> totals.print_tree()
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections import Counter
+from typing import IO, TYPE_CHECKING, Iterable
+
+from .index import LEVELS, current_index
+
+if TYPE_CHECKING:
+    from .index import ISICIndex
+
+_MISSING = object()
+
+
+class ISICTotalNode:
+    """A node of the tree of totals built by `ISICTotals.tree`.
+
+    Attributes:
+        code (str): The node code.
+        type (str): The hierarchy level of the node.
+        description (str): The node description.
+        total (int | float): The total of the node and its descendants.
+        children (list[ISICTotalNode]): The children with a non-zero total.
+    """
+
+    __slots__ = ("code", "type", "description", "total", "children")
+
+    def __init__(self, code: str, type: str, description: str, total):
+        self.code = code
+        self.type = type
+        self.description = description
+        self.total = total
+        self.children = []
+
+    def __repr__(self) -> str:
+        return f"ISICTotalNode({self.code!r}, total={self.total!r})"
+
+
+class ISICTotals:
+    """Totals of records per node, rolled up through the hierarchy.
+
+    Attributes:
+        index (ISICIndex): The index whose node ids the totals are indexed by.
+        totals (array): The total of every node, including its descendants.
+        unmatched (dict): Totals of the codes that are not in the hierarchy.
+    """
+
+    def __init__(self, index: ISICIndex, totals: array, unmatched: dict):
+        self.index = index
+        self.totals = totals
+        self.unmatched = unmatched
+
+    @property
+    def total(self):
+        """The total of all matched records."""
+        totals = self.totals
+        return sum(totals[node.id] for node in self.index.nodes if node.parent < 0)
+
+    def __getitem__(self, code: str):
+        """Return the total of a code, including its descendants.
+
+        Raises:
+            KeyError: If the code is not in the hierarchy.
+        """
+        node = self.index.lookup(code)
+        if node is None:
+            raise KeyError(code)
+        return self.totals[node.id]
+
+    def get(self, code: str, default=None):
+        """Return the total of a code, or a default if it is not in the hierarchy."""
+        node = self.index.lookup(code)
+        return default if node is None else self.totals[node.id]
+
+    def level(self, item_type: str, zeros: bool = False) -> dict:
+        """Return the totals of all nodes of one level.
+
+        Args:
+            item_type (str): The hierarchy level ('section', 'division', 'group',
+                'class' or 'subclass').
+            zeros (bool, optional): Include nodes without records. Defaults to
+                False.
+
+        Returns:
+            dict: Totals keyed by code, in hierarchy order.
+
+        Raises:
+            ValueError: If the level is unknown.
+        """
+        if item_type not in LEVELS:
+            raise ValueError(
+                f"Unknown level '{item_type}'. Available levels: {', '.join(LEVELS)}"
+            )
+        totals = self.totals
+        return {
+            node.code: totals[node.id]
+            for node in self.index.nodes
+            if node.type == item_type and (zeros or totals[node.id])
+        }
+
+    def tree(self) -> list[ISICTotalNode]:
+        """Build the tree of nodes with a non-zero total.
+
+        With signed weights, a node may total zero while some descendants do
+        not; such nodes are kept, so every non-zero total has its ancestors.
+
+        Returns:
+            list[ISICTotalNode]: The sections with a non-zero total or such a
+                descendant.
+        """
+        nodes = self.index.nodes
+        totals = self.totals
+        roots = []
+        views = {}
+
+        def view(node_id):
+            node_view = views.get(node_id)
+            if node_view is None:
+                node = nodes[node_id]
+                node_view = ISICTotalNode(
+                    node.code, node.type, node.description, totals[node_id]
+                )
+                views[node_id] = node_view
+                if node.parent < 0:
+                    roots.append(node_view)
+                else:
+                    view(node.parent).children.append(node_view)
+            return node_view
+
+        for node in nodes:
+            if totals[node.id]:
+                view(node.id)
+        return roots
+
+    def print_tree(
+        self,
+        indent: str = "",
+        file: IO[str] | None = None,
+        max_depth: int | None = None,
+        levels=None,
+    ) -> None:
+        """Display the tree of nodes with a non-zero total.
+
+        Every line shows the code, description and total of a node.
+
+        Args:
+            indent (str, optional): String prefix used for indentation.
+                Defaults to "".
+            file (IO[str] | None, optional): The stream to write to. Defaults to
+                None (standard output).
+            max_depth (int | None, optional): Number of levels to show below the
+                sections. Defaults to None (no limit).
+            levels (Iterable[str] | None, optional): Only show nodes of these
+                levels. Defaults to None (all levels).
+
+        Returns:
+            None
+        """
+        from .tree import Tree
+
+        Tree.write(self.tree(), file or sys.stdout, indent, None, max_depth, levels)
+
+
+def aggregate(
+    index: ISICIndex, codes: Iterable, weights: Iterable | None = None
+) -> ISICTotals:
+    """Count records by code and roll the counts up through the hierarchy.
+
+    Args:
+        index (ISICIndex): The index of the hierarchy.
+        codes (Iterable): The code of every record, at any level. Sequences
+            with a ``tolist`` method, such as NumPy arrays, are converted first.
+        weights (Iterable | None, optional): A weight per record, summed instead
+            of counting records. Defaults to None.
+
+    Returns:
+        ISICTotals: The totals.
+
+    Raises:
+        ValueError: If codes and weights have different lengths.
+    """
+    if hasattr(codes, "tolist"):
+        codes = codes.tolist()
+    if weights is None:
+        sums = Counter(codes)
+        totals = array("q", bytes(8 * len(index)))
+    else:
+        if hasattr(weights, "tolist"):
+            weights = weights.tolist()
+        sums = {}
+        codes = iter(codes)
+        weights = iter(weights)
+        for weight in weights:
+            code = next(codes, _MISSING)
+            if code is _MISSING:
+                raise ValueError("codes and weights have different lengths")
+            sums[code] = sums.get(code, 0) + weight
+        if next(codes, _MISSING) is not _MISSING:
+            raise ValueError("codes and weights have different lengths")
+        totals = array("d", bytes(8 * len(index)))
+
+    unmatched = {}
+    lookup = index.lookup
+    for code, value in sums.items():
+        node = lookup(str(code).strip())
+        if node is None:
+            unmatched[code] = value
+        else:
+            totals[node.id] += value
+
+    for node in reversed(index.nodes):
+        if node.parent >= 0:
+            totals[node.parent] += totals[node.id]
+    return ISICTotals(index, totals, unmatched)
+
+
+class ISICAggregateMixin:
+    """Mixin class providing aggregation of records by hierarchy level."""
+
+    def aggregate(self, codes: Iterable, weights: Iterable | None = None) -> ISICTotals:
+        """Count records by code and roll the counts up through the hierarchy.
+
+        If the search index is still being built, this waits for it.
+
+        Args:
+            codes (Iterable): The code of every record, at any level (e.g. the
+                class code of every firm).
+            weights (Iterable | None, optional): A weight per record, summed
+                instead of counting records. Defaults to None.
+
+        Returns:
+            ISICTotals: Totals per node, including descendants. Codes that are
+                not in the hierarchy are collected in ``unmatched``.
+
+        Raises:
+            ValueError: If codes and weights have different lengths.
+
+        Example:
+            >>> totals = isic.aggregate(firms["isic_class"], weights=firms["employees"])
+            >>> totals.level("division")
+        """
+        return aggregate(current_index(self), codes, weights)
@@ -0,0 +1,295 @@
+"""Apache Arrow representation of the flattened ISIC4 hierarchy.
+
+The hierarchy is flattened into one row per node, in depth-first order (so the
+row number is the `ISICIndex` node id), with the codes of every ancestor level
+as columns. The table is written once per data version to an Arrow IPC file in
+the cache directory (see `isic4kit.sources.get_cache_dir`) and memory-mapped
+on later runs, so loading it neither parses nor copies anything. It can be
+handed to dataframe libraries without conversion, e.g.
+``polars.from_arrow(table)`` or ``duckdb.sql("SELECT ... FROM table")``.
+
+`join` enriches an Arrow table of codes with the hierarchy using vectorised
+Arrow compute kernels (a hash lookup of the codes followed by a ``take``),
+instead of looking up codes one by one in Python.
+
+Arrow support requires PyArrow (``pip install isic4kit[arrow]``).
+
+Example:
+    >>> isic = ISIC4Classifier()
+    >>> hierarchy = isic.to_arrow()
+    >>> firms = pyarrow.table({"firm": [1, 2], "isic": ["0111", "2824"]})
+    >>> isic.join_arrow(firms, column="isic")["isic_division"].to_pylist()
+    ['01', '28']
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .index import LEVELS, current_index
+
+if TYPE_CHECKING:
+    from .index import ISICIndex
+
+ARROW_FORMAT = 1
+HIERARCHY_COLUMNS = (
+    "id",
+    "type",
+    "code",
+    "description",
+    "parent",
+    "section",
+    "division",
+    "group",
+    "class",
+    "subclass",
+    "path",
+)
+JOIN_COLUMNS = (
+    "type",
+    "description",
+    "section",
+    "division",
+    "group",
+    "class",
+    "subclass",
+    "path",
+)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Arrow support requires pyarrow: pip install isic4kit[arrow]"
+        ) from None
+    return pyarrow
+
+
+def hierarchy_table(index: ISICIndex):
+    """Flatten a hierarchy into an Arrow table with one row per node.
+
+    Args:
+        index (ISICIndex): The hierarchy.
+
+    Returns:
+        pyarrow.Table: The columns of `HIERARCHY_COLUMNS`. ``id`` is the node
+            id (also the row number), ``parent`` the id of the parent node (null
+            for sections), and the level columns hold the codes of the
+            ancestors of every node (null below its own level). ``type`` is
+            dictionary-encoded.
+
+    Raises:
+        ImportError: If PyArrow is not installed.
+    """
+    pa = _pyarrow()
+    nodes = index.nodes
+    levels = {level: [] for level in LEVELS}
+    for node in nodes:
+        hierarchy = node.hierarchy
+        for depth, level in enumerate(LEVELS[:4]):
+            levels[level].append(hierarchy[depth] if depth < len(hierarchy) else None)
+        levels["subclass"].append(hierarchy[-1] if len(hierarchy) > 4 else None)
+
+    string = pa.string()
+    columns = {
+        "id": pa.array(range(len(nodes)), pa.int32()),
+        "type": pa.array([node.type for node in nodes], string).dictionary_encode(),
+        "code": pa.array([node.code for node in nodes], string),
+        "description": pa.array([node.description for node in nodes], string),
+        "parent": pa.array(
+            [None if node.parent < 0 else node.parent for node in nodes], pa.int32()
+        ),
+        **{level: pa.array(levels[level], string) for level in LEVELS},
+        "path": pa.array([node.path for node in nodes], string),
+    }
+    return pa.table(columns)
+
+
+def write_table(table, path: str | os.PathLike) -> None:
+    """Write an Arrow table to an IPC file atomically.
+
+    Args:
+        table (pyarrow.Table): The table.
+        path (str | os.PathLike): The file to write.
+
+    Raises:
+        ImportError: If PyArrow is not installed.
+        OSError: If the file cannot be written.
+    """
+    pa = _pyarrow()
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def read_table(path: str | os.PathLike):
+    """Memory-map an Arrow IPC file without copying its buffers.
+
+    Args:
+        path (str | os.PathLike): The file to read.
+
+    Returns:
+        pyarrow.Table: The table, backed by the memory-mapped file.
+
+    Raises:
+        ImportError: If PyArrow is not installed.
+        OSError: If the file cannot be read.
+    """
+    pa = _pyarrow()
+    return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+
+def _keys(codes):
+    """Normalise codes for matching: trim whitespace, lower-case section letters."""
+    import pyarrow.compute as pc
+
+    codes = pc.utf8_trim_whitespace(codes)
+    return pc.if_else(pc.equal(pc.utf8_length(codes), 1), pc.utf8_lower(codes), codes)
+
+
+def join(
+    table,
+    hierarchy,
+    column: str = "code",
+    columns=JOIN_COLUMNS,
+    level: str | None = None,
+    prefix: str = "isic_",
+):
+    """Enrich an Arrow table of codes with hierarchy columns.
+
+    Codes are matched like `ISICIndex.lookup`: surrounding whitespace is
+    ignored and section codes are case-insensitive. Rows whose code is null or
+    not in the hierarchy get null hierarchy columns.
+
+    Args:
+        table (pyarrow.Table): The table to enrich.
+        hierarchy (pyarrow.Table): The flattened hierarchy (see `hierarchy_table`).
+        column (str, optional): The column of ``table`` holding the codes.
+            Defaults to "code".
+        columns (Iterable[str], optional): The hierarchy columns to add.
+            Defaults to `JOIN_COLUMNS`.
+        level (str | None, optional): Only match codes of this level. Defaults
+            to None (any level).
+        prefix (str, optional): Prefix of the names of the added columns.
+            Defaults to "isic_".
+
+    Returns:
+        pyarrow.Table: ``table`` with the hierarchy columns appended.
+
+    Raises:
+        ImportError: If PyArrow is not installed.
+        KeyError: If ``column`` or one of ``columns`` does not exist.
+        ValueError: If the level is unknown.
+    """
+    _pyarrow()
+    import pyarrow.compute as pc
+
+    if level is not None:
+        if level not in LEVELS:
+            raise ValueError(
+                f"Unknown level '{level}'. Available levels: {', '.join(LEVELS)}"
+            )
+        hierarchy = hierarchy.filter(pc.equal(hierarchy["type"].cast("string"), level))
+    codes = table[column]
+    if codes.type != "string":
+        codes = codes.cast("string")
+    rows = pc.index_in(_keys(codes), value_set=_keys(hierarchy["code"]))
+    for name in columns:
+        table = table.append_column(f"{prefix}{name}", hierarchy[name].take(rows))
+    return table
+
+
+class ISICArrowMixin:
+    """Mixin class providing the hierarchy as an Apache Arrow table.
+
+    The table is cached on disk per data version and kept in memory per index.
+    """
+
+    _arrow_table = None
+    _arrow_index = None
+
+    def to_arrow(self, use_cache: bool = True):
+        """Return the flattened hierarchy as an Arrow table.
+
+        Args:
+            use_cache (bool, optional): Read and write the table in the cache
+                directory. Defaults to True.
+
+        Returns:
+            pyarrow.Table: One row per node (see `isic4kit.arrow.hierarchy_table`).
+
+        Raises:
+            ImportError: If PyArrow is not installed.
+        """
+        index = current_index(self)
+        if self._arrow_table is not None and self._arrow_index is index:
+            return self._arrow_table
+
+        table = None
+        path = None
+        if use_cache:
+            from .sources import get_cache_dir
+
+            path = (
+                get_cache_dir() / "arrow" / f"{ARROW_FORMAT}-{self.data_version}.arrow"
+            )
+            try:
+                table = read_table(path)
+            except (OSError, ValueError):
+                table = None
+            if table is not None and table.num_rows != len(index):
+                table = None
+        if table is None:
+            table = hierarchy_table(index)
+            if path is not None:
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    write_table(table, path)
+                    table = read_table(path)
+                except OSError:
+                    pass
+        self._arrow_table = table
+        self._arrow_index = index
+        return table
+
+    def join_arrow(
+        self,
+        table,
+        column: str = "code",
+        columns=JOIN_COLUMNS,
+        level: str | None = None,
+        prefix: str = "isic_",
+    ):
+        """Enrich an Arrow table of codes with hierarchy columns.
+
+        Args:
+            table (pyarrow.Table): The table to enrich, e.g. one record per firm.
+            column (str, optional): The column holding the codes. Defaults to
+                "code".
+            columns (Iterable[str], optional): The hierarchy columns to add.
+                Defaults to type, description, the level codes and the path.
+            level (str | None, optional): Only match codes of this level.
+                Defaults to None (any level).
+            prefix (str, optional): Prefix of the names of the added columns.
+                Defaults to "isic_".
+
+        Returns:
+            pyarrow.Table: ``table`` with the hierarchy columns appended.
+
+        Raises:
+            ImportError: If PyArrow is not installed.
+            KeyError: If a column does not exist.
+            ValueError: If the level is unknown.
+
+        Example:
+            >>> firms = pyarrow.table({"isic": ["0111", "2824", "9999"]})
+            >>> isic.join_arrow(firms, column="isic", columns=["division"])
+        """
+        return join(table, self.to_arrow(), column, columns, level, prefix)
@@ -1,11 +1,20 @@
-from .models import ISICSection, ISICDivision, ISICGroup, ISICClass
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .index import ready_index
+
+if TYPE_CHECKING:
+    from .models import ISICSection, ISICDivision, ISICGroup, ISICClass, ISICSubclass
 
 
 class BaseISIC4:
     """Base class providing common ISIC4 (International Standard Industrial Classification Revision 4) functionality.
 
     This class provides methods to retrieve ISIC4 classifications at different levels
-    of the hierarchy (section, division, group, and class).
+    of the hierarchy (section, division, group, class and subclass). Lookups use the code
+    tables of the search index once it is ready, or those of the columnar store
+    (`ISICColumns`) if the classifier uses one, and walk the sections otherwise.
 
     Attributes:
         sections: A list of ISICSection objects representing all ISIC4 sections.
@@ -20,7 +29,14 @@ class BaseISIC4:
         Returns:
             ISICSection | None: The matching ISICSection object if found, None otherwise.
         """
-        return next((s for s in self.sections if s.code == code.lower()), None)
+        index = ready_index(self)
+        if index is not None:
+            return index.get("section", code)
+        columns = getattr(self, "columns", None)
+        if columns is not None:
+            return columns.get("section", code)
+        code = code.lower()
+        return next((s for s in self.sections if s.code.lower() == code), None)
 
     def get_division(self, code: str) -> ISICDivision | None:
         """Retrieve an ISIC4 division by its code.
@@ -31,6 +47,12 @@ class BaseISIC4:
         Returns:
             ISICDivision | None: The matching ISICDivision object if found, None otherwise.
         """
+        index = ready_index(self)
+        if index is not None:
+            return index.get("division", code)
+        columns = getattr(self, "columns", None)
+        if columns is not None:
+            return columns.get("division", code)
         for section in self.sections:
             division = next((d for d in section.divisions if d.code == code), None)
             if division:
@@ -46,6 +68,12 @@ class BaseISIC4:
         Returns:
             ISICGroup | None: The matching ISICGroup object if found, None otherwise.
         """
+        index = ready_index(self)
+        if index is not None:
+            return index.get("group", code)
+        columns = getattr(self, "columns", None)
+        if columns is not None:
+            return columns.get("group", code)
         for section in self.sections:
             for division in section.divisions:
                 group = next((g for g in division.groups if g.code == code), None)
@@ -62,6 +90,12 @@ class BaseISIC4:
         Returns:
             ISICClass | None: The matching ISICClass object if found, None otherwise.
         """
+        index = ready_index(self)
+        if index is not None:
+            return index.get("class", code)
+        columns = getattr(self, "columns", None)
+        if columns is not None:
+            return columns.get("class", code)
         for section in self.sections:
             for division in section.divisions:
                 for group in division.groups:
@@ -69,3 +103,63 @@ class BaseISIC4:
                     if class_:
                         return class_
         return None
+
+    def get_subclass(self, code: str) -> ISICSubclass | None:
+        """Retrieve a national ISIC subclass by its code.
+
+        Subclasses (5 digits or more) only exist in data loaded from an external
+        source that extends the ISIC4 classes.
+
+        Args:
+            code (str): The subclass code to search for.
+
+        Returns:
+            ISICSubclass | None: The matching ISICSubclass object if found, None otherwise.
+        """
+        index = ready_index(self)
+        if index is not None:
+            return index.get("subclass", code)
+        columns = getattr(self, "columns", None)
+        if columns is not None:
+            return columns.get("subclass", code)
+
+        def find(subclasses):
+            for subclass in subclasses:
+                if subclass.code == code:
+                    return subclass
+                found = find(subclass.subclasses)
+                if found:
+                    return found
+            return None
+
+        for section in self.sections:
+            for division in section.divisions:
+                for group in division.groups:
+                    for class_ in group.classes:
+                        subclass = find(class_.subclasses)
+                        if subclass:
+                            return subclass
+        return None
+
+    def get_json(self, item_type: str, code: str) -> bytes | None:
+        """Retrieve the serialized JSON of a node and its subtree.
+
+        Once the search index is ready, the JSON is assembled from fragments
+        memoised per node, so repeated requests for the same code or for
+        overlapping subtrees do not serialize the models again.
+
+        Args:
+            item_type (str): The hierarchy level ('section', 'division', 'group',
+                'class' or 'subclass').
+            code (str): The code to look up.
+
+        Returns:
+            bytes | None: The same bytes as ``model_dump_json()`` of the matching
+                node, or None if no node matches.
+        """
+        index = ready_index(self)
+        if index is not None:
+            node = index.lookup(code, item_type)
+            return None if node is None else index.node_json(node.id)
+        node = getattr(self, f"get_{item_type}")(code)
+        return None if node is None else node.model_dump_json().encode()
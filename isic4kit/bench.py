@@ -0,0 +1,435 @@
+"""Reproducible performance benchmarks for ISIC4Kit.
+
+Run the suite from the command line and store the JSON report so it can be
+compared against the report of another release:
+
+    python -m isic4kit.bench --output bench.json
+    python -m isic4kit.bench --compare bench.json
+
+Every benchmark runs a fixed, seeded workload so two reports produced on the
+same machine are directly comparable.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+SCHEMA_VERSION = 1
+THREADS = 4
+
+QUERIES = {
+    "en": [
+        "mining",
+        "manufacture of",
+        "retail sale",
+        "wholesale",
+        "food",
+        "computer",
+        "services",
+        "transport",
+        "growing of",
+        "repair",
+        "05",
+        "0111",
+        "47",
+        "nonexistentterm",
+    ],
+    "ar": [
+        "تعدين",
+        "صناعة",
+        "بيع بالتجزئة",
+        "الجملة",
+        "الأغذية",
+        "الحاسوب",
+        "خدمات",
+        "النقل",
+        "زراعة",
+        "إصلاح",
+        "05",
+        "0111",
+        "47",
+        "غيرموجود",
+    ],
+}
+
+
+def _package_version() -> str:
+    try:
+        from importlib.metadata import version
+
+        return version("isic4kit")
+    except Exception:
+        return "unknown"
+
+
+def _timeit(func, repeat: int, number: int) -> dict:
+    """Time ``func`` and return per-call statistics in microseconds.
+
+    Args:
+        func: A zero-argument callable executing one unit of work.
+        repeat (int): Number of timing rounds.
+        number (int): Number of calls per round.
+
+    Returns:
+        dict: Statistics across rounds, normalised to a single call.
+    """
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            for _ in range(number):
+                func()
+            timings.append((time.perf_counter_ns() - start) / number / 1000)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {
+        "rounds": repeat,
+        "calls_per_round": number,
+        "mean_us": statistics.fmean(timings),
+        "median_us": statistics.median(timings),
+        "min_us": min(timings),
+        "max_us": max(timings),
+        "stdev_us": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+def _lookup_workload(classifier, seed: int) -> list:
+    """Build a shuffled mix of hits and misses across all hierarchy levels."""
+    calls = []
+    for section in classifier.sections:
+        calls.append((classifier.get_section, section.code))
+        for division in section.divisions:
+            calls.append((classifier.get_division, division.code))
+            for group in division.groups:
+                calls.append((classifier.get_group, group.code))
+                for class_ in group.classes:
+                    calls.append((classifier.get_class, class_.code))
+    calls.extend(
+        [
+            (classifier.get_section, "z"),
+            (classifier.get_division, "00"),
+            (classifier.get_group, "000"),
+            (classifier.get_class, "0000"),
+        ]
+    )
+    random.Random(seed).shuffle(calls)
+    return calls
+
+
+def _measure_memory(classifier_cls, language: str, **kwargs) -> dict:
+    """Measure allocations made while loading one classifier.
+
+    The search index is not built in the background, so no thread allocates
+    during or after the measurement.
+    """
+    kwargs.setdefault("background_index", False)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        classifier = classifier_cls(language=language, **kwargs)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del classifier
+    return {"retained_bytes": current, "peak_bytes": peak}
+
+
+def _columnar_benchmarks(
+    language: str, queries: list, seed: int, repeat: int, number: int
+) -> dict:
+    """Time loading, lookups and searches of a classifier with columnar storage."""
+    from .isic4 import ISIC4Classifier
+
+    classifier = ISIC4Classifier(
+        language=language, storage="columnar", background_index=False
+    )
+    columns = classifier.columns
+    getters = {
+        "section": classifier.get_section,
+        "division": classifier.get_division,
+        "group": classifier.get_group,
+        "class": classifier.get_class,
+    }
+    lookups = [
+        (getters[columns.type(i)], columns.code(i))
+        for i in range(len(columns))
+        if columns.type(i) in getters
+    ]
+    random.Random(seed).shuffle(lookups)
+
+    def load():
+        ISIC4Classifier(language=language, storage="columnar", background_index=False)
+
+    def lookup():
+        for getter, code in lookups:
+            getter(code)
+
+    def search():
+        for query in queries:
+            classifier.search(query)
+
+    def match():
+        for query in queries:
+            columns.match(query)
+
+    benchmarks = {
+        "load_columnar": _timeit(load, repeat, max(1, number // 4)),
+        "lookup_mix_columnar": _timeit(lookup, repeat, max(1, number // 4)),
+        "search_mix_columnar": _timeit(search, repeat, number),
+        "match_mix_columnar": _timeit(match, repeat, number),
+    }
+    benchmarks["lookup_mix_columnar"]["ops_per_call"] = len(lookups)
+    benchmarks["search_mix_columnar"]["ops_per_call"] = len(queries)
+    benchmarks["match_mix_columnar"]["ops_per_call"] = len(queries)
+    return benchmarks
+
+
+def _semantic_benchmarks(classifier, queries: list, repeat: int, number: int) -> dict:
+    """Time semantic search, if NumPy is installed.
+
+    Embeddings are built (or loaded from the cache) before timing, so the
+    numbers are per-query latencies of the single-query and batched paths.
+    """
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return {}
+
+    classifier.semantic_index()
+
+    def semantic_search():
+        for query in queries:
+            classifier.semantic_search(query, k=10)
+
+    def semantic_batch():
+        classifier.semantic_search_many(queries, k=10)
+
+    benchmarks = {
+        "semantic_search_mix": _timeit(semantic_search, repeat, number),
+        "semantic_search_batch": _timeit(semantic_batch, repeat, number),
+    }
+    for stats in benchmarks.values():
+        stats["ops_per_call"] = len(queries)
+    return benchmarks
+
+
+def run(
+    languages: list[str] | None = None,
+    repeat: int = 5,
+    number: int = 20,
+    seed: int = 0,
+) -> dict:
+    """Run the benchmark suite and return the report as a dictionary.
+
+    Args:
+        languages (list[str] | None): Languages to benchmark. Defaults to all
+            languages with a query mix.
+        repeat (int): Timing rounds per benchmark. Defaults to 5.
+        number (int): Calls per round. Workloads with many operations (lookups,
+            searches) count one full pass over the mix as a single call.
+            Defaults to 20.
+        seed (int): Seed used to shuffle the workloads. Defaults to 0.
+
+    Returns:
+        dict: A JSON-serialisable report.
+    """
+    from .index import current_index
+    from .isic4 import ISIC4Classifier
+
+    languages = languages or list(QUERIES)
+    report = {
+        "schema": SCHEMA_VERSION,
+        "package_version": _package_version(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "parameters": {"repeat": repeat, "number": number, "seed": seed},
+        "languages": {},
+    }
+
+    for language in languages:
+        classifier = ISIC4Classifier(language=language, background_index=False)
+        current_index(classifier)
+        lookups = _lookup_workload(classifier, seed)
+        queries = list(QUERIES.get(language, QUERIES["en"]))
+        search_results = classifier.search(queries[0])
+        random.Random(seed).shuffle(queries)
+        section = classifier.sections[0]
+
+        # Without a background thread per load, which would still be indexing
+        # while the later benchmarks run
+        def load():
+            ISIC4Classifier(language=language, background_index=False)
+
+        def lookup():
+            for getter, code in lookups:
+                getter(code)
+
+        def search():
+            for query in queries:
+                classifier.search(query)
+
+        def find():
+            for query in queries:
+                classifier.index.find(query)
+
+        def search_threads():
+            workers = [threading.Thread(target=search) for _ in range(THREADS)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        def render_section():
+            with contextlib.redirect_stdout(io.StringIO()):
+                section.print_tree()
+
+        def render_results():
+            with contextlib.redirect_stdout(io.StringIO()):
+                search_results.print_tree()
+
+        benchmarks = {
+            "load": _timeit(load, repeat, max(1, number // 4)),
+            "lookup_mix": _timeit(lookup, repeat, number),
+            "search_mix": _timeit(search, repeat, number),
+            "find_mix": _timeit(find, repeat, number),
+            "search_mix_threads": _timeit(search_threads, repeat, number),
+            "print_tree_section": _timeit(render_section, repeat, number),
+            "print_tree_search": _timeit(render_results, repeat, number),
+        }
+        benchmarks["lookup_mix"]["ops_per_call"] = len(lookups)
+        benchmarks["search_mix"]["ops_per_call"] = len(queries)
+        benchmarks["find_mix"]["ops_per_call"] = len(queries)
+        benchmarks["search_mix_threads"]["ops_per_call"] = len(queries) * THREADS
+        benchmarks.update(_columnar_benchmarks(language, queries, seed, repeat, number))
+        benchmarks.update(_semantic_benchmarks(classifier, queries, repeat, number))
+
+        memory = _measure_memory(ISIC4Classifier, language)
+        columnar_memory = _measure_memory(ISIC4Classifier, language, storage="columnar")
+        memory.update({f"columnar_{k}": v for k, v in columnar_memory.items()})
+        report["languages"][language] = {"benchmarks": benchmarks, "memory": memory}
+
+    return report
+
+
+def compare(baseline: dict, current: dict) -> list[dict]:
+    """Compare two reports produced by :func:`run`.
+
+    Args:
+        baseline (dict): The reference report.
+        current (dict): The report to compare against the reference.
+
+    Returns:
+        list[dict]: One row per benchmark present in both reports, with the
+            median timings (or memory sizes) and their ratio
+            (``current / baseline``).
+    """
+    rows = []
+    for language, data in current["languages"].items():
+        base_data = baseline.get("languages", {}).get(language)
+        if not base_data:
+            continue
+        for name, stats in data["benchmarks"].items():
+            base_stats = base_data["benchmarks"].get(name)
+            if not base_stats:
+                continue
+            rows.append(
+                {
+                    "language": language,
+                    "benchmark": name,
+                    "baseline": base_stats["median_us"],
+                    "current": stats["median_us"],
+                    "ratio": (
+                        stats["median_us"] / base_stats["median_us"]
+                        if base_stats["median_us"]
+                        else float("inf")
+                    ),
+                }
+            )
+        for name, value in data["memory"].items():
+            base_value = base_data.get("memory", {}).get(name)
+            if base_value is None:
+                continue
+            rows.append(
+                {
+                    "language": language,
+                    "benchmark": f"memory.{name}",
+                    "baseline": base_value,
+                    "current": value,
+                    "ratio": value / base_value if base_value else float("inf"),
+                }
+            )
+    return rows
+
+
+def _format_report(report: dict) -> str:
+    lines = []
+    for language, data in report["languages"].items():
+        lines.append(f"[{language}]")
+        for name, stats in data["benchmarks"].items():
+            lines.append(
+                f"  {name:<22} median {stats['median_us']:>12.1f} us"
+                f"  min {stats['min_us']:>12.1f} us"
+            )
+        for name, value in data["memory"].items():
+            lines.append(f"  {'memory.' + name:<30} {value / 1024:>12.1f} KiB")
+    return "\n".join(lines)
+
+
+def _format_comparison(rows: list[dict]) -> str:
+    lines = []
+    for row in rows:
+        lines.append(
+            f"[{row['language']}] {row['benchmark']:<24}"
+            f" {row['baseline']:>14.1f} -> {row['current']:>14.1f}"
+            f"  x{row['ratio']:.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m isic4kit.bench",
+        description="Benchmark ISIC4Kit loading, lookups, search and rendering.",
+    )
+    parser.add_argument(
+        "--languages", nargs="+", default=None, help="languages to benchmark"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timing rounds")
+    parser.add_argument("--number", type=int, default=20, help="calls per round")
+    parser.add_argument("--seed", type=int, default=0, help="workload shuffle seed")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="compare against a previous JSON report")
+    args = parser.parse_args(argv)
+
+    report = run(args.languages, args.repeat, args.number, args.seed)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    print(_format_report(report))
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print()
+        print(_format_comparison(compare(baseline, report)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
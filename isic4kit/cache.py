@@ -0,0 +1,224 @@
+"""Persistent search cache shared between processes.
+
+Search results are stored as serialized JSON in an SQLite database in the
+cache directory (see `isic4kit.sources.get_cache_dir`), keyed by the
+normalised query, the language and the data version of the classifier. A
+restarted batch job, or any number of worker processes on the same machine,
+answer repeated queries from the database instead of searching again.
+
+The database runs in write-ahead-log mode, so readers never block each other
+or the writer, and writers wait for each other instead of failing. The total
+size of the stored values is kept in the database by triggers; when it grows
+beyond ``max_bytes`` the least recently used entries are evicted. Access times
+are refreshed at most once per ``touch_interval`` seconds, so hits are reads
+only. Any error of the database is treated as a cache miss, so a broken or
+read-only cache never breaks searches.
+
+Example:
+    >>> isic = ISIC4Classifier(search_cache=True)
+    >>> isic.search("mining")  # searched, then stored
+    >>> isic.search("mining")  # read from the cache, also by other processes
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+CACHE_FORMAT = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS meta (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE meta SET size = size + new.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE meta SET size = size - old.size WHERE id = 0;
+END;
+"""
+
+
+class ISICSearchCache:
+    """Size-bounded, persistent key-value cache in an SQLite database.
+
+    Connections are opened per thread and per process, so an instance can be
+    shared between threads and survives a fork.
+
+    Attributes:
+        path (Path): The database file.
+        max_bytes (int): The maximum total size of the stored values.
+        touch_interval (float): Minimum number of seconds between two updates
+            of the access time of an entry.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        touch_interval: float = 60.0,
+        timeout: float = 10.0,
+    ):
+        """Initialize the cache. The database is created on first use.
+
+        Args:
+            path (str | os.PathLike | None, optional): The database file.
+                Defaults to ``search-v1.sqlite3`` in the cache directory.
+            max_bytes (int, optional): The maximum total size of the stored
+                values. Defaults to 64 MiB.
+            touch_interval (float, optional): Minimum number of seconds between
+                two updates of the access time of an entry. Defaults to 60.
+            timeout (float, optional): Seconds to wait for a concurrent writer.
+                Defaults to 10.
+        """
+        if path is None:
+            from .sources import get_cache_dir
+
+            path = get_cache_dir() / f"search-v{CACHE_FORMAT}.sqlite3"
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    @staticmethod
+    def key(*parts) -> str:
+        """Build a cache key from its parts (e.g. kind, language, version, query)."""
+        return "\x00".join(map(str, parts))
+
+    def get(self, key: str) -> bytes | None:
+        """Return the value of a key, or None on a miss or a database error."""
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT value, accessed FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[1] >= self.touch_interval:
+                connection.execute(
+                    "UPDATE entries SET accessed = ? WHERE key = ?", (now, key)
+                )
+            return row[0]
+        except (sqlite3.Error, OSError):
+            return None
+
+    def put(self, key: str, value: bytes) -> bool:
+        """Store a value, evicting the least recently used entries if needed.
+
+        Args:
+            key (str): The key.
+            value (bytes): The value.
+
+        Returns:
+            bool: True if the value was stored, False if it is larger than
+                ``max_bytes`` or the database could not be written.
+        """
+        size = len(value)
+        if size > self.max_bytes:
+            return False
+        try:
+            connection = self._connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                connection.execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?)",
+                    (key, value, size, time.time()),
+                )
+                self._evict(connection)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            return True
+        except (sqlite3.Error, OSError):
+            return False
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        # Evict down to 90% of the limit, so eviction is not needed on every put
+        total = connection.execute("SELECT size FROM meta WHERE id = 0").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * 9 // 10
+        rows = connection.execute("SELECT key, size FROM entries ORDER BY accessed")
+        evicted = []
+        for key, size in rows:
+            if total <= target:
+                break
+            evicted.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM entries WHERE key = ?", evicted)
+
+    def size(self) -> int:
+        """Return the total size of the stored values."""
+        return (
+            self._connection()
+            .execute("SELECT size FROM meta WHERE id = 0")
+            .fetchone()[0]
+        )
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._connection().execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Close the connection of the current thread.
+
+        Other threads open a new connection on their next access.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            connection.close()
+        self._local = threading.local()
+
+
+def open_search_cache(search_cache) -> ISICSearchCache | None:
+    """Resolve the ``search_cache`` argument of `ISIC4Classifier`.
+
+    Args:
+        search_cache: None or False for no cache, True for the default cache
+            file, a path, or an `ISICSearchCache`.
+
+    Returns:
+        ISICSearchCache | None: The cache, or None.
+    """
+    if search_cache is None or search_cache is False:
+        return None
+    if search_cache is True:
+        return ISICSearchCache()
+    if isinstance(search_cache, ISICSearchCache):
+        return search_cache
+    return ISICSearchCache(search_cache)
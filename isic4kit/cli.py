@@ -0,0 +1,362 @@
+"""Command-line interface for ISIC4Kit.
+
+Usage:
+    isic4kit lookup|search|validate [CODE_OR_QUERY ...] [--format tsv|jsonl]
+    isic4kit tree [CODE ...] [--format text|jsonl]
+    python -m isic4kit serve [--host HOST] [--port PORT] [--languages en ar]
+    python -m isic4kit diff [--old-source OLD] [--new-source NEW]
+                            [--old-language en] [--new-language ar]
+                            [--ignore-descriptions] [--format text|jsonl]
+
+The bulk commands (lookup, search, tree and validate) read one code or query
+per line from standard input when none are given as arguments, and write the
+results to standard output in batches. The data is loaded once per process, so
+they can be used as filters in a pipeline:
+
+    cut -f3 firms.tsv | isic4kit lookup --format jsonl > classes.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+
+LEVEL_CHOICES = ("section", "division", "group", "class", "subclass")
+BATCH_SIZE = 4096
+CACHE_SIZE = 65536
+
+
+def _non_negative(value: str) -> int:
+    """Parse a non-negative integer argument."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"expected a non-negative integer: {value!r}")
+    return number
+
+
+def _serve(args) -> int:
+    from .server import create_server
+
+    server = create_server(
+        host=args.host,
+        port=args.port,
+        languages=args.languages,
+        source=args.source,
+        cache_size=args.cache_size,
+        verbose=args.verbose,
+    )
+    host, port = server.server_address[:2]
+    print(
+        f"Serving ISIC4 on http://{host}:{port} ({', '.join(args.languages)})",
+        flush=True,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def _diff(args) -> int:
+    from .diff import diff, write_report
+    from .isic4 import ISIC4Classifier
+
+    old = ISIC4Classifier(
+        language=args.old_language, source=args.old_source, background_index=False
+    )
+    new = ISIC4Classifier(
+        language=args.new_language, source=args.new_source, background_index=False
+    )
+    counts = write_report(
+        diff(old, new, descriptions=not args.ignore_descriptions),
+        sys.stdout,
+        format=args.format,
+    )
+    return 1 if any(counts.values()) else 0
+
+
+def _inputs(args):
+    if args.values:
+        return iter(args.values)
+    return (line.rstrip("\r\n") for line in sys.stdin)
+
+
+def _field(value) -> str:
+    if value is None:
+        return ""
+    return value.replace("\t", " ").replace("\n", " ")
+
+
+def _json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _row(*values) -> str:
+    return "\t".join(map(_field, values)) + "\n"
+
+
+def _run(args, render) -> None:
+    """Render every input with a per-process cache and write in batches.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+        render (Callable[[str], str]): Returns the output of one input.
+    """
+    out = sys.stdout
+    cache = {}
+    batch = []
+    for value in _inputs(args):
+        text = cache.get(value)
+        if text is None:
+            text = render(value)
+            if len(cache) >= CACHE_SIZE:
+                cache.clear()
+            cache[value] = text
+        batch.append(text)
+        if len(batch) >= BATCH_SIZE:
+            out.write("".join(batch))
+            batch.clear()
+    out.write("".join(batch))
+    out.flush()
+
+
+def _index(args):
+    from .index import current_index
+    from .isic4 import ISIC4Classifier
+
+    return current_index(
+        ISIC4Classifier(
+            language=args.language, source=args.source, background_index=False
+        )
+    )
+
+
+def _lookup(args) -> int:
+    index = _index(args)
+    item_type = args.level
+
+    def render(code):
+        node = index.lookup(code.strip(), item_type)
+        if args.format == "jsonl":
+            result = "null" if node is None else index.result_json(node.id).decode()
+            return f'{{"input":{_json(code)},"result":{result}}}\n'
+        if node is None:
+            return _row(code, None, None, None, None)
+        return _row(code, node.type, node.code, node.description, node.path)
+
+    _run(args, render)
+    return 0
+
+
+def _search(args) -> int:
+    from .text import normalize_query
+
+    index = _index(args)
+    limit = args.limit
+
+    def render(query):
+        normalized = normalize_query(query)
+        if not normalized:
+            return ""
+        nodes = index.match(normalized)
+        if limit is not None:
+            nodes = nodes[:limit]
+        if args.format == "jsonl":
+            results = index.results_json(nodes).decode()
+            return f'{{"query":{_json(query)},{results[1:]}\n'
+        return "".join(
+            _row(query, node.type, node.code, node.description, node.path)
+            for node in nodes
+        )
+
+    _run(args, render)
+    return 0
+
+
+def _tree(args) -> int:
+    import io
+
+    index = _index(args)
+
+    def render(code):
+        node = index.lookup(code.strip())
+        if args.format == "jsonl":
+            data = "null" if node is None else index.node_json(node.id).decode()
+            return f'{{"input":{_json(code)},"node":{data}}}\n'
+        if node is None:
+            return ""
+        output = io.StringIO()
+        index.get(node.type, node.code).print_tree(
+            max_depth=args.max_depth, levels=args.levels, file=output
+        )
+        return output.getvalue()
+
+    _run(args, render)
+    return 0
+
+
+def _validate(args) -> int:
+    index = _index(args)
+    item_type = args.level
+    invalid = False
+    if args.suggest:
+        from .suggest import ISICSuggestIndex
+
+        suggest_index = ISICSuggestIndex(index)
+
+    def suggestions(code, node):
+        if node is not None:
+            return ()
+        return tuple(
+            index.nodes[node_id].code
+            for node_id, _, _ in suggest_index.suggest(code, args.suggest, item_type)
+        )
+
+    def render(code):
+        nonlocal invalid
+        node = index.lookup(code.strip(), item_type)
+        if node is None:
+            invalid = True
+        item = None if node is None else node.type
+        if args.format == "jsonl":
+            data = {"input": code, "valid": node is not None, "type": item}
+            if args.suggest:
+                data["suggestions"] = list(suggestions(code, node))
+            return _json(data) + "\n"
+        status = "invalid" if node is None else "valid"
+        if args.suggest:
+            return _row(code, status, item, ",".join(suggestions(code, node)))
+        return _row(code, status, item)
+
+    _run(args, render)
+    return 1 if invalid else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="isic4kit", description="Work with ISIC Revision 4 classifications."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run the HTTP lookup/search service")
+    serve.add_argument("--host", default="127.0.0.1", help="interface to bind")
+    serve.add_argument("--port", type=int, default=8000, help="port to bind")
+    serve.add_argument(
+        "--languages", nargs="+", default=["en"], help="languages to serve"
+    )
+    serve.add_argument("--source", help="external JSON/CSV data file or directory")
+    serve.add_argument(
+        "--cache-size", type=int, default=4096, help="cached responses per kind"
+    )
+    serve.add_argument("--verbose", action="store_true", help="log every request")
+    serve.set_defaults(handler=_serve)
+
+    compare = commands.add_parser(
+        "diff",
+        help="compare two data sets or languages",
+        description="Compare two hierarchies by code. Exits with status 1 if "
+        "they differ, like diff(1).",
+    )
+    compare.add_argument("--old-source", help="old JSON/CSV data (default: bundled)")
+    compare.add_argument("--new-source", help="new JSON/CSV data (default: bundled)")
+    compare.add_argument("--old-language", default="en", help="language of old data")
+    compare.add_argument("--new-language", default="en", help="language of new data")
+    compare.add_argument(
+        "--ignore-descriptions",
+        action="store_true",
+        help="only compare codes and parents, e.g. across languages",
+    )
+    compare.add_argument(
+        "--format", choices=("text", "jsonl"), default="text", help="report format"
+    )
+    compare.set_defaults(handler=_diff)
+
+    bulk = argparse.ArgumentParser(add_help=False)
+    bulk.add_argument("--language", default="en", help="language of the data")
+    bulk.add_argument("--source", help="external JSON/CSV data file or directory")
+
+    lookup = commands.add_parser(
+        "lookup",
+        parents=[bulk],
+        help="look up codes",
+        description="Look up codes of any level. TSV rows are: input, type, "
+        "code, description, path (empty fields for unknown codes).",
+    )
+    lookup.add_argument("values", nargs="*", metavar="CODE", help="default: stdin")
+    lookup.add_argument("--level", choices=LEVEL_CHOICES, help="restrict to a level")
+    lookup.add_argument("--format", choices=("tsv", "jsonl"), default="tsv")
+    lookup.set_defaults(handler=_lookup)
+
+    search = commands.add_parser(
+        "search",
+        parents=[bulk],
+        help="search codes and descriptions",
+        description="Search codes and descriptions. TSV rows are: query, type, "
+        "code, description, path (one row per result). JSONL lines hold all "
+        "results of one query. Blank lines are skipped.",
+    )
+    search.add_argument("values", nargs="*", metavar="QUERY", help="default: stdin")
+    search.add_argument("--limit", type=_non_negative, help="maximum results per query")
+    search.add_argument("--format", choices=("tsv", "jsonl"), default="tsv")
+    search.set_defaults(handler=_search)
+
+    tree = commands.add_parser(
+        "tree",
+        parents=[bulk],
+        help="print the subtrees of codes",
+        description="Print the subtree of every code, as a text tree or as the "
+        "JSON of the node. Unknown codes print nothing (text) or null (JSONL).",
+    )
+    tree.add_argument("values", nargs="*", metavar="CODE", help="default: stdin")
+    tree.add_argument("--format", choices=("text", "jsonl"), default="text")
+    tree.add_argument(
+        "--max-depth", type=_non_negative, help="levels to show below every code (text)"
+    )
+    tree.add_argument(
+        "--levels", nargs="+", choices=LEVEL_CHOICES, help="levels to show (text)"
+    )
+    tree.set_defaults(handler=_tree)
+
+    validate = commands.add_parser(
+        "validate",
+        parents=[bulk],
+        help="check that codes exist",
+        description="Check that codes exist. TSV rows are: input, valid or "
+        "invalid, type, and with --suggest the comma-separated suggestions for "
+        "invalid codes. Exits with status 1 if any code is invalid.",
+    )
+    validate.add_argument("values", nargs="*", metavar="CODE", help="default: stdin")
+    validate.add_argument(
+        "--level", choices=LEVEL_CHOICES, help="require codes of a level"
+    )
+    validate.add_argument(
+        "--suggest",
+        type=_non_negative,
+        default=0,
+        metavar="N",
+        help="suggest up to N valid codes for every invalid code",
+    )
+    validate.add_argument("--format", choices=("tsv", "jsonl"), default="tsv")
+    validate.set_defaults(handler=_validate)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except ValueError as e:
+        print(f"isic4kit: error: {e}", file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        # The reader closed the pipe (e.g. `| head`); stop quietly, and keep the
+        # interpreter from failing again when it flushes stdout at exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.close(devnull)
+        return 141
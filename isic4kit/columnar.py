@@ -0,0 +1,443 @@
+"""Compact columnar storage of an ISIC4 hierarchy.
+
+`ISICColumns` stores the hierarchy as parallel arrays indexed by node id, in
+depth-first order:
+
+- ``levels``: the level of every node, as an index into `LEVELS`;
+- ``parents``: the id of every node's parent (-1 for sections);
+- ``ends``: the id following the last node of every node's subtree;
+- ``offsets``: start and end offsets of every code and description in a single
+  string buffer, in which identical descriptions are stored once.
+
+A second buffer holds the normalised code and description of every node, so
+a search is a handful of ``str.find`` calls over one contiguous string
+instead of a walk over thousands of objects. The pydantic object tree is
+produced on demand, per node or for the whole hierarchy.
+
+Use ``ISIC4Classifier(storage="columnar")`` to keep only the columns in memory;
+``sections`` is then materialised the first time it is accessed.
+
+Example:
+    >>> columns = ISICColumns.from_data(json.load(open("data/en.json")))
+    >>> columns.get("class", "0111").description
+    'Growing of cereals (except rice), leguminous crops and oil seeds'
+    >>> [columns.code(i) for i in columns.match("hard coal")]
+    ['051', '0510']
+    >>> columns.node(columns.lookup("01")).print_tree()
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Iterator
+
+from .index import HIERARCHY_FIELDS, LEVELS
+from .text import match_spans, normalize
+
+if TYPE_CHECKING:
+    from .models import ISICSearchResult, ISICSearchResults
+
+_KEYS = ("section", "division", "group", "class", "subclass")
+_CHILDREN = ("divisions", "groups", "classes", "subclasses", "subclasses")
+
+
+def _records(sections, fields):
+    """Yield ``(level, code, description, parent)`` records in depth-first order.
+
+    Args:
+        sections (Iterable): The section nodes.
+        fields (Callable): Returns ``(code, description, children)`` for a node
+            and its level.
+    """
+    stack = [(section, 0, -1) for section in reversed(list(sections))]
+    node_id = 0
+    while stack:
+        node, level, parent = stack.pop()
+        code, description, children = fields(node, level)
+        yield level, code, description, parent
+        child_level = min(level + 1, 4)
+        stack.extend((child, child_level, node_id) for child in reversed(children))
+        node_id += 1
+
+
+class ISICColumns:
+    """Parallel-array representation of an ISIC4 hierarchy.
+
+    Instances are read-only once built and can be shared between threads.
+
+    Attributes:
+        levels (array): Level of every node, as an index into `LEVELS`.
+        parents (array): Parent id of every node, -1 for sections.
+        ends (array): For every node, the id following its subtree.
+        offsets (array): ``offsets[4 * i]`` to ``offsets[4 * i + 1]`` delimit the
+            code of node ``i`` in `buffer`; ``offsets[4 * i + 2]`` to
+            ``offsets[4 * i + 3]`` its description.
+        buffer (str): All codes and distinct descriptions.
+        text (str): Normalised codes and descriptions, NUL-separated.
+        starts (array): Offset of every node's entry in `text`.
+        roots (tuple[int, ...]): Ids of the sections.
+    """
+
+    __slots__ = (
+        "levels",
+        "parents",
+        "ends",
+        "offsets",
+        "buffer",
+        "text",
+        "starts",
+        "roots",
+        "_codes",
+    )
+
+    def __init__(self, records):
+        """Build the columns from depth-first ``(level, code, description, parent)`` records.
+
+        Prefer `from_data` or `from_sections`.
+
+        Args:
+            records (Iterable[tuple[int, str, str, int]]): Records in depth-first
+                order, with levels as indexes into `LEVELS` and parents as
+                record positions (-1 for sections).
+        """
+        levels = array("b")
+        parents = array("i")
+        offsets = array("I")
+        starts = array("I")
+        chunks = []
+        text = []
+        interned = {}
+        size = 0
+        text_size = 0
+        codes = {}
+
+        for level, code, description, parent in records:
+            node_id = len(levels)
+            levels.append(level)
+            parents.append(parent)
+            offsets.append(size)
+            chunks.append(code)
+            size += len(code)
+            offsets.append(size)
+            span = interned.get(description)
+            if span is None:
+                span = (size, size + len(description))
+                interned[description] = span
+                chunks.append(description)
+                size += len(description)
+            offsets.extend(span)
+            entry = f"{normalize(code)}\x00{normalize(description)}\x00"
+            starts.append(text_size)
+            text.append(entry)
+            text_size += len(entry)
+            codes.setdefault(code.lower() if level == 0 else code, node_id)
+
+        ends = array("i", range(1, len(levels) + 1))
+        for node_id in range(len(levels) - 1, -1, -1):
+            parent = parents[node_id]
+            if parent >= 0 and ends[node_id] > ends[parent]:
+                ends[parent] = ends[node_id]
+
+        object.__setattr__(self, "levels", levels)
+        object.__setattr__(self, "parents", parents)
+        object.__setattr__(self, "ends", ends)
+        object.__setattr__(self, "offsets", offsets)
+        object.__setattr__(self, "buffer", "".join(chunks))
+        object.__setattr__(self, "text", "".join(text))
+        object.__setattr__(self, "starts", starts)
+        object.__setattr__(
+            self, "roots", tuple(i for i, parent in enumerate(parents) if parent < 0)
+        )
+        object.__setattr__(self, "_codes", codes)
+
+    @classmethod
+    def from_data(cls, data: dict) -> ISICColumns:
+        """Build the columns directly from data in the bundled JSON format.
+
+        No model objects are created.
+
+        Args:
+            data (dict): The hierarchy as ``{"sections": [...]}``.
+
+        Returns:
+            ISICColumns: The columns.
+        """
+        return cls(
+            _records(
+                data["sections"],
+                lambda node, level: (
+                    node[_KEYS[level]],
+                    node["description"],
+                    node.get(_CHILDREN[level]) or (),
+                ),
+            )
+        )
+
+    @classmethod
+    def from_sections(cls, sections) -> ISICColumns:
+        """Build the columns from loaded section models.
+
+        Args:
+            sections (list[ISICSection]): The sections.
+
+        Returns:
+            ISICColumns: The columns.
+        """
+        return cls(
+            _records(
+                sections,
+                lambda obj, level: (
+                    obj.code,
+                    obj.description,
+                    getattr(obj, _CHILDREN[level]),
+                ),
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def type(self, node_id: int) -> str:
+        """Return the level name of a node."""
+        return LEVELS[self.levels[node_id]]
+
+    def code(self, node_id: int) -> str:
+        """Return the code of a node."""
+        offsets = self.offsets
+        return self.buffer[offsets[4 * node_id] : offsets[4 * node_id + 1]]
+
+    def description(self, node_id: int) -> str:
+        """Return the description of a node."""
+        offsets = self.offsets
+        return self.buffer[offsets[4 * node_id + 2] : offsets[4 * node_id + 3]]
+
+    def children(self, node_id: int) -> list[int]:
+        """Return the ids of a node's children."""
+        ends = self.ends
+        children = []
+        child = node_id + 1
+        end = ends[node_id]
+        while child < end:
+            children.append(child)
+            child = ends[child]
+        return children
+
+    def hierarchy(self, node_id: int) -> tuple[str, ...]:
+        """Return the codes from the section down to a node."""
+        codes = []
+        parents = self.parents
+        while node_id >= 0:
+            codes.append(self.code(node_id))
+            node_id = parents[node_id]
+        return tuple(reversed(codes))
+
+    def lookup(self, code: str, item_type: str | None = None) -> int | None:
+        """Look up the id of a node by code.
+
+        Args:
+            code (str): The code. Section codes are case-insensitive.
+            item_type (str | None, optional): Only return nodes of this level.
+                Defaults to None.
+
+        Returns:
+            int | None: The node id, or None if no node matches.
+        """
+        node_id = self._codes.get(code.lower() if len(code) == 1 else code)
+        if node_id is None or (
+            item_type is not None and LEVELS[self.levels[node_id]] != item_type
+        ):
+            return None
+        return node_id
+
+    def match(self, query: str) -> list[int]:
+        """Return the ids of the nodes whose code or description contains a query.
+
+        Args:
+            query (str): A normalised query (see `isic4kit.text.normalize_query`).
+
+        Returns:
+            list[int]: The matching node ids in hierarchy order.
+        """
+        return list(self.iter_match(query))
+
+    def iter_match(self, query: str, start: int = 0) -> Iterator[int]:
+        """Yield the ids of the nodes matching a query lazily, in hierarchy order.
+
+        Args:
+            query (str): A normalised query (see `isic4kit.text.normalize_query`).
+            start (int, optional): The id of the first node to consider.
+                Defaults to 0.
+
+        Yields:
+            int: The matching node ids.
+        """
+        count = len(self.levels)
+        if "\x00" in query or start >= count:
+            return
+        if not query:
+            yield from range(start, count)
+            return
+        starts = self.starts
+        find = self.text.find
+        position = find(query, starts[start])
+        while position >= 0:
+            node_id = bisect_right(starts, position) - 1
+            yield node_id
+            if node_id + 1 >= count:
+                break
+            position = find(query, starts[node_id + 1])
+
+    def model(self, node_id: int):
+        """Build the model object of a node and its subtree.
+
+        Args:
+            node_id (int): The node id.
+
+        Returns:
+            ISICSection | ISICDivision | ISICGroup | ISICClass | ISICSubclass:
+                A new model object.
+        """
+        from .models import ISICClass, ISICDivision, ISICGroup, ISICSection
+        from .models import ISICSubclass
+
+        models = (ISICSection, ISICDivision, ISICGroup, ISICClass, ISICSubclass)
+
+        def build(node_id):
+            level = self.levels[node_id]
+            return models[level](
+                code=self.code(node_id),
+                description=self.description(node_id),
+                **{_CHILDREN[level]: [build(c) for c in self.children(node_id)]},
+            )
+
+        return build(node_id)
+
+    def sections(self) -> list:
+        """Build the complete object tree.
+
+        Returns:
+            list[ISICSection]: New section models.
+        """
+        return [self.model(root) for root in self.roots]
+
+    def get(self, item_type: str, code: str):
+        """Build the model object of a node by level and code.
+
+        Args:
+            item_type (str): The hierarchy level.
+            code (str): The code. Section codes are case-insensitive.
+
+        Returns:
+            The model object of the node and its subtree, or None.
+        """
+        node_id = self.lookup(code, item_type)
+        return None if node_id is None else self.model(node_id)
+
+    def node(self, node_id: int) -> ISICColumnNode:
+        """Return a lightweight view of a node, usable with `Tree.print`."""
+        return ISICColumnNode(self, node_id)
+
+    def _payload(self, node_id: int, query: str | None) -> dict:
+        hierarchy = self.hierarchy(node_id)
+        fields = dict(zip(HIERARCHY_FIELDS, hierarchy[:4]))
+        if len(hierarchy) > 4:
+            fields["subclass"] = hierarchy[-1]
+        payload = {
+            "type": LEVELS[self.levels[node_id]],
+            "code": hierarchy[-1],
+            "description": self.description(node_id),
+            "hierarchy": fields,
+            "path": "/".join(hierarchy),
+        }
+        if query is not None:
+            payload["spans"] = match_spans(query, hierarchy[-1], payload["description"])
+        return payload
+
+    def result(self, node_id: int, query: str | None = None) -> ISICSearchResult:
+        """Build the search result for one node.
+
+        Args:
+            node_id (int): The node id.
+            query (str | None, optional): A normalised query. If given, the
+                result carries the match spans of the query. Defaults to None.
+
+        Returns:
+            ISICSearchResult: The search result.
+        """
+        from .models import ISICSearchResult
+
+        return ISICSearchResult.model_validate(self._payload(node_id, query))
+
+    def results(self, node_ids, query: str | None = None) -> ISICSearchResults:
+        """Build search results for node ids.
+
+        Args:
+            node_ids (Iterable[int]): Node ids.
+            query (str | None, optional): A normalised query. If given, every
+                result carries the match spans of the query. Defaults to None.
+
+        Returns:
+            ISICSearchResults: One result per node, in the given order.
+        """
+        from .models import ISICSearchResults
+
+        return ISICSearchResults.model_validate(
+            {"results": [self._payload(node_id, query) for node_id in node_ids]}
+        )
+
+
+class ISICColumnNode:
+    """A view of one node of an `ISICColumns`, without model objects.
+
+    Attributes:
+        columns (ISICColumns): The columns the node belongs to.
+        id (int): The node id.
+    """
+
+    __slots__ = ("columns", "id")
+
+    def __init__(self, columns: ISICColumns, node_id: int):
+        self.columns = columns
+        self.id = node_id
+
+    @property
+    def type(self) -> str:
+        return self.columns.type(self.id)
+
+    @property
+    def code(self) -> str:
+        return self.columns.code(self.id)
+
+    @property
+    def description(self) -> str:
+        return self.columns.description(self.id)
+
+    @property
+    def children(self) -> list[ISICColumnNode]:
+        columns = self.columns
+        return [ISICColumnNode(columns, child) for child in columns.children(self.id)]
+
+    def model(self):
+        """Build the model object of this node and its subtree."""
+        return self.columns.model(self.id)
+
+    def print_tree(
+        self, indent: str = "", max_depth=None, levels=None, file=None
+    ) -> None:
+        """Display a tree representation of this node and its subtree.
+
+        Accepts the same depth limit, level filter and stream as `Tree.print`.
+        """
+        from .tree import Tree
+
+        Tree.print(self, indent, max_depth=max_depth, levels=levels, file=file)
+
+    def __repr__(self) -> str:
+        return f"ISICColumnNode({self.type!r}, {self.code!r})"
@@ -0,0 +1,341 @@
+"""Concordance between other classifications and ISIC Revision 4.
+
+A concordance (correspondence table) maps codes of another classification
+system, such as ISIC Rev.3.1, NACE or NAICS, to ISIC Rev.4 nodes. Mappings are
+many-to-many: one legacy code may be split across several ISIC4 codes, each
+with a weight giving the share of the legacy code assigned to it.
+
+Tables are read from CSV files with ``source`` and ``target`` columns and an
+optional ``weight`` column, or from JSON files containing a list of objects
+with the same keys. Tables placed in ``data/concordance/{name}.csv`` (or
+``.json``) can be loaded by name.
+
+Example:
+    >>> isic = ISIC4Classifier()
+    >>> concordance = ISICConcordance.load("isic31_to_isic4.csv", isic)
+    >>> concordance.translate_codes("0111")
+    (('0111', 0.5), ('0112', 0.5))
+    >>> for code, targets in concordance.translate_many(legacy_codes):
+    ...     ...
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from .index import current_index
+
+if TYPE_CHECKING:
+    from .models import ISICConcordanceMatch
+
+BUNDLED_CONCORDANCE_DIR = Path(__file__).parent / "data" / "concordance"
+
+
+def normalize_code(code: str) -> str:
+    """Normalise a source code for matching.
+
+    Strips surrounding whitespace, removes dots (``"01.11"`` becomes ``"0111"``)
+    and upper-cases letters.
+
+    Args:
+        code (str): A code of the source classification.
+
+    Returns:
+        str: The normalised code.
+    """
+    return code.strip().replace(".", "").upper()
+
+
+class ISICConcordance:
+    """Hashed many-to-many mapping from another classification to ISIC4 nodes.
+
+    Every source code maps to a tuple of ``(node id, weight)`` pairs pointing
+    into the classifier's `ISICIndex`, so translating a code is a single
+    dictionary lookup. The mapping is read-only once built and can be shared
+    between threads.
+
+    Attributes:
+        name (str): Name of the source classification.
+        index (ISICIndex): The index of the ISIC4 hierarchy targets point into.
+        mappings (dict[str, tuple[tuple[int, float], ...]]): Target node ids and
+            weights keyed by normalised source code.
+    """
+
+    def __init__(
+        self,
+        classifier,
+        pairs: Iterable[tuple],
+        name: str = "source",
+        normalize=normalize_code,
+        strict: bool = True,
+    ):
+        """Build a concordance from ``(source, target[, weight])`` pairs.
+
+        Pairs without a weight share their source code equally between all of
+        its targets.
+
+        Args:
+            classifier (ISIC4Classifier): The classifier whose hierarchy the
+                targets refer to.
+            pairs (Iterable[tuple]): ``(source, target)`` or
+                ``(source, target, weight)`` tuples. A weight of None counts as
+                missing.
+            name (str, optional): Name of the source classification.
+                Defaults to "source".
+            normalize (Callable[[str], str] | None, optional): Function applied
+                to source codes when building and when translating. Defaults to
+                `normalize_code`; None keeps codes unchanged.
+            strict (bool, optional): Raise on targets that are not ISIC4 codes of
+                the classifier. If False such pairs are skipped. Defaults to True.
+
+        Raises:
+            ValueError: If a source or target is not a non-empty string, a
+                target is unknown (in strict mode), a weight is not a positive
+                number, or a source code mixes weighted and unweighted targets.
+        """
+        self.name = name
+        self.normalize = normalize
+        self.index = current_index(classifier)
+
+        targets = {}
+        unweighted = set()
+        weighted = set()
+        for pair in pairs:
+            source, target = pair[0], pair[1]
+            weight = pair[2] if len(pair) > 2 else None
+            if not all(isinstance(code, str) and code.strip() for code in pair[:2]):
+                raise ValueError(
+                    f"{name}: invalid row {tuple(pair)!r}: source and target must "
+                    "be non-empty strings"
+                )
+            node = self.index.lookup(str(target).strip())
+            if node is None:
+                if strict:
+                    raise ValueError(
+                        f"{name}: target '{target}' of '{source}' is not an ISIC4 code"
+                    )
+                continue
+            key = normalize(source) if normalize else source
+            if weight is None or weight == "":
+                if key in weighted:
+                    raise ValueError(
+                        f"{name}: '{source}' mixes weighted and unweighted targets"
+                    )
+                unweighted.add(key)
+                weight = 1.0
+            else:
+                if key in unweighted:
+                    raise ValueError(
+                        f"{name}: '{source}' mixes weighted and unweighted targets"
+                    )
+                weighted.add(key)
+                try:
+                    weight = float(weight)
+                except ValueError:
+                    raise ValueError(
+                        f"{name}: invalid weight '{weight}' for '{source}'"
+                    ) from None
+                if not math.isfinite(weight) or weight <= 0:
+                    raise ValueError(
+                        f"{name}: invalid weight '{weight}' for '{source}'"
+                    )
+            entries = targets.setdefault(key, {})
+            entries[node.id] = entries.get(node.id, 0.0) + weight
+
+        self.mappings = {}
+        for key, entries in targets.items():
+            if key in unweighted:
+                share = 1.0 / len(entries)
+                entries = dict.fromkeys(entries, share)
+            self.mappings[key] = tuple(entries.items())
+
+        nodes = self.index.nodes
+        self._codes = {
+            key: tuple((nodes[node_id].code, weight) for node_id, weight in entries)
+            for key, entries in self.mappings.items()
+        }
+        self._reverse = {}
+        for key, entries in self.mappings.items():
+            for node_id, weight in entries:
+                self._reverse.setdefault(nodes[node_id].code, []).append((key, weight))
+
+    @classmethod
+    def load(
+        cls,
+        source,
+        classifier,
+        name: str | None = None,
+        normalize=normalize_code,
+        strict: bool = True,
+    ) -> ISICConcordance:
+        """Load a concordance table from a file or a bundled table name.
+
+        Args:
+            source (str | os.PathLike): A CSV/JSON file, or the name of a table
+                in ``data/concordance``.
+            classifier (ISIC4Classifier): The classifier targets refer to.
+            name (str | None, optional): Name of the source classification.
+                Defaults to the file stem.
+            normalize (Callable[[str], str] | None, optional): See `__init__`.
+            strict (bool, optional): See `__init__`. Defaults to True.
+
+        Returns:
+            ISICConcordance: The loaded concordance.
+
+        Raises:
+            ValueError: If the table cannot be found, parsed or validated.
+        """
+        path = _resolve_table(source)
+        return cls(
+            classifier,
+            _read_pairs(path),
+            name=name or path.stem,
+            normalize=normalize,
+            strict=strict,
+        )
+
+    @staticmethod
+    def available() -> list[str]:
+        """List the concordance tables bundled with the package.
+
+        Returns:
+            list[str]: Names accepted by `load`.
+        """
+        if not BUNDLED_CONCORDANCE_DIR.is_dir():
+            return []
+        return sorted(
+            p.stem
+            for p in BUNDLED_CONCORDANCE_DIR.iterdir()
+            if p.suffix.lower() in (".csv", ".json")
+        )
+
+    def __len__(self) -> int:
+        return len(self.mappings)
+
+    def __contains__(self, code: str) -> bool:
+        return self._key(code) in self.mappings
+
+    def _key(self, code: str) -> str:
+        return self.normalize(code) if self.normalize else code
+
+    def translate_codes(self, code: str) -> tuple[tuple[str, float], ...]:
+        """Translate one source code to ISIC4 codes and weights.
+
+        Args:
+            code (str): A code of the source classification.
+
+        Returns:
+            tuple[tuple[str, float], ...]: ``(isic4 code, weight)`` pairs, empty
+                if the code has no mapping.
+        """
+        return self._codes.get(self._key(code), ())
+
+    def translate(self, code: str) -> list[ISICConcordanceMatch]:
+        """Translate one source code to ISIC4 nodes.
+
+        Args:
+            code (str): A code of the source classification.
+
+        Returns:
+            list[ISICConcordanceMatch]: One match per target, with the target's
+                level, code, description and weight.
+        """
+        from .models import ISICConcordanceMatch
+
+        nodes = self.index.nodes
+        return [
+            ISICConcordanceMatch(
+                source=code,
+                type=nodes[node_id].type,
+                code=nodes[node_id].code,
+                description=nodes[node_id].description,
+                weight=weight,
+            )
+            for node_id, weight in self.mappings.get(self._key(code), ())
+        ]
+
+    def translate_many(
+        self, codes: Iterable[str]
+    ) -> Iterator[tuple[str, tuple[tuple[str, float], ...]]]:
+        """Translate a stream of source codes in one pass.
+
+        Codes are processed lazily, so arbitrarily large iterables can be
+        translated with constant memory. Repeated codes cost one dictionary
+        lookup each.
+
+        Args:
+            codes (Iterable[str]): Codes of the source classification.
+
+        Yields:
+            tuple[str, tuple[tuple[str, float], ...]]: Each input code with its
+                ``(isic4 code, weight)`` pairs (empty if unmapped).
+        """
+        lookup = self._codes.get
+        normalize = self.normalize
+        empty = ()
+        if normalize is None:
+            for code in codes:
+                yield code, lookup(code, empty)
+        else:
+            for code in codes:
+                yield code, lookup(normalize(code), empty)
+
+    def reverse(self, code: str) -> tuple[tuple[str, float], ...]:
+        """List the source codes mapped to an ISIC4 code.
+
+        Args:
+            code (str): An ISIC4 code.
+
+        Returns:
+            tuple[tuple[str, float], ...]: ``(source code, weight)`` pairs.
+        """
+        return tuple(self._reverse.get(code, ()))
+
+
+def _resolve_table(source) -> Path:
+    path = Path(source)
+    if path.is_file():
+        return path
+    for suffix in (".csv", ".json"):
+        candidate = BUNDLED_CONCORDANCE_DIR / f"{source}{suffix}"
+        if candidate.is_file():
+            return candidate
+    available = ISICConcordance.available()
+    raise ValueError(
+        f"Concordance table '{source}' not found. "
+        f"Bundled tables: {', '.join(available) if available else 'none'}"
+    )
+
+
+def _read_pairs(path: Path) -> list[tuple]:
+    if path.suffix.lower() == ".json":
+        with open(path, "r", encoding="utf-8-sig") as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}: invalid JSON: {e}") from e
+        if isinstance(data, dict):
+            data = data.get("mappings", [])
+        try:
+            return [(m["source"], m["target"], m.get("weight")) for m in data]
+        except (KeyError, TypeError, AttributeError):
+            raise ValueError(
+                f"{path}: expected a list of objects with 'source' and 'target'"
+            ) from None
+
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        fields = {name.strip().lower(): name for name in reader.fieldnames or []}
+        missing = [name for name in ("source", "target") if name not in fields]
+        if missing:
+            raise ValueError(f"{path}: missing CSV column(s): {', '.join(missing)}")
+        source_key, target_key = fields["source"], fields["target"]
+        weight_key = fields.get("weight")
+        return [
+            (row[source_key], row[target_key], row[weight_key] if weight_key else None)
+            for row in reader
+        ]
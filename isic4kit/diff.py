@@ -0,0 +1,194 @@
+"""Differences between two loaded ISIC4 hierarchies.
+
+Compares two classifiers (or their `ISICIndex`) by code: every node is looked
+up in the other hierarchy's code table once, so a diff runs in time linear in
+the number of nodes. Changes are produced lazily and can be written to a
+stream as they are found, which keeps memory flat for large national
+hierarchies and lets CI jobs fail on the first unexpected change.
+
+Example:
+    >>> old = ISIC4Classifier(source="isic4_2023.csv")
+    >>> new = ISIC4Classifier(source="isic4_2024.csv")
+    >>> for change in diff(old, new):
+    ...     print(change.kind, change.code)
+    >>> # Compare coverage between languages, ignoring translated descriptions
+    >>> counts = write_report(
+    ...     diff(ISIC4Classifier("en"), ISIC4Classifier("ar"), descriptions=False),
+    ...     sys.stdout,
+    ... )
+
+The same comparison is available from the command line:
+
+    python -m isic4kit diff --old-source old.csv --new-source new.csv
+"""
+
+from __future__ import annotations
+
+import json
+from typing import IO, Iterable, Iterator, NamedTuple
+
+from .index import ISICIndex, current_index
+
+KINDS = ("added", "removed", "changed", "moved")
+
+
+class ISICChange(NamedTuple):
+    """A difference between two hierarchies for one code.
+
+    Attributes:
+        kind (str): 'added', 'removed', 'changed' (description differs) or
+            'moved' (parent differs).
+        type (str): The hierarchy level of the node.
+        code (str): The node code.
+        old_description (str | None): The description in the old hierarchy.
+        new_description (str | None): The description in the new hierarchy.
+        old_parent (str | None): The parent code in the old hierarchy.
+        new_parent (str | None): The parent code in the new hierarchy.
+    """
+
+    kind: str
+    type: str
+    code: str
+    old_description: str | None
+    new_description: str | None
+    old_parent: str | None
+    new_parent: str | None
+
+
+def _index(source) -> ISICIndex:
+    return source if isinstance(source, ISICIndex) else current_index(source)
+
+
+def _parent_code(index: ISICIndex, node) -> str | None:
+    return None if node.parent < 0 else index.nodes[node.parent].code
+
+
+def _key(code: str | None) -> str | None:
+    return code.lower() if code is not None and len(code) == 1 else code
+
+
+def diff(old, new, descriptions: bool = True) -> Iterator[ISICChange]:
+    """Compare two hierarchies node by node.
+
+    Removed, changed and moved nodes are produced in the depth-first order of
+    the old hierarchy, followed by added nodes in the order of the new one. A
+    node whose description and parent both changed produces a 'changed' and a
+    'moved' change. Section codes are compared case-insensitively.
+
+    Args:
+        old (ISIC4Classifier | ISICIndex): The reference hierarchy.
+        new (ISIC4Classifier | ISICIndex): The hierarchy to compare with it.
+        descriptions (bool, optional): Report description changes. Disable it to
+            compare the coverage of two languages. Defaults to True.
+
+    Yields:
+        ISICChange: The differences.
+    """
+    old_index = _index(old)
+    new_index = _index(new)
+    new_nodes = new_index.nodes
+    new_codes = new_index.codes
+
+    for node in old_index.nodes:
+        key = _key(node.code)
+        new_id = new_codes[node.type].get(key)
+        old_parent = _parent_code(old_index, node)
+        if new_id is None:
+            yield ISICChange(
+                "removed",
+                node.type,
+                node.code,
+                node.description,
+                None,
+                old_parent,
+                None,
+            )
+            continue
+        other = new_nodes[new_id]
+        new_parent = _parent_code(new_index, other)
+        if descriptions and node.description != other.description:
+            yield ISICChange(
+                "changed",
+                node.type,
+                node.code,
+                node.description,
+                other.description,
+                old_parent,
+                new_parent,
+            )
+        if _key(old_parent) != _key(new_parent):
+            yield ISICChange(
+                "moved",
+                node.type,
+                node.code,
+                node.description,
+                other.description,
+                old_parent,
+                new_parent,
+            )
+
+    old_codes = old_index.codes
+    for node in new_nodes:
+        if _key(node.code) not in old_codes[node.type]:
+            yield ISICChange(
+                "added",
+                node.type,
+                node.code,
+                None,
+                node.description,
+                None,
+                _parent_code(new_index, node),
+            )
+
+
+def format_change(change: ISICChange) -> str:
+    """Format a change as one line of a text report.
+
+    Args:
+        change (ISICChange): The change.
+
+    Returns:
+        str: The line, without a trailing newline.
+    """
+    label = f"{change.type} {change.code}"
+    if change.kind == "added":
+        return f"+ {label}: {change.new_description}"
+    if change.kind == "removed":
+        return f"- {label}: {change.old_description}"
+    if change.kind == "changed":
+        return f"~ {label}: {change.old_description!r} -> {change.new_description!r}"
+    return f"> {label}: moved from {change.old_parent} to {change.new_parent}"
+
+
+def write_report(
+    changes: Iterable[ISICChange], stream: IO[str], format: str = "text"
+) -> dict:
+    """Write changes to a stream as they are produced.
+
+    Args:
+        changes (Iterable[ISICChange]): The changes, e.g. from `diff`.
+        stream (IO[str]): The text stream to write to.
+        format (str, optional): 'text' for one readable line per change and a
+            summary line, or 'jsonl' for one JSON object per change.
+            Defaults to "text".
+
+    Returns:
+        dict: The number of changes of each kind.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if format not in ("text", "jsonl"):
+        raise ValueError(f"Unknown report format '{format}': expected text or jsonl")
+
+    counts = dict.fromkeys(KINDS, 0)
+    for change in changes:
+        counts[change.kind] += 1
+        if format == "jsonl":
+            stream.write(json.dumps(change._asdict(), ensure_ascii=False))
+        else:
+            stream.write(format_change(change))
+        stream.write("\n")
+    if format == "text":
+        stream.write(", ".join(f"{counts[kind]} {kind}" for kind in KINDS) + "\n")
+    return counts
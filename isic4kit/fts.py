@@ -0,0 +1,305 @@
+"""SQLite FTS5 full-text search over the ISIC4 hierarchy.
+
+The default search scans the normalised text of every node for a substring.
+For large extended hierarchies, the full-text backend answers queries from an
+inverted index instead: the codes and normalised descriptions of all nodes are
+stored in an SQLite FTS5 table, built once per data version and cached on disk
+(see `isic4kit.sources.get_cache_dir`), then shared read-only by any number of
+threads and processes.
+
+Queries are matched by words rather than substrings, in one of three modes:
+
+- ``"prefix"``: every word of the query starts a word of the code or
+  description, so "manuf food" matches "Manufacture of food products".
+- ``"phrase"``: the words of the query appear consecutively.
+- ``"query"``: the query is passed to FTS5 as is, to use ``OR``, ``NOT``,
+  ``NEAR`` or column filters like ``code: 01*``.
+
+Results are returned in hierarchy order, like `ISIC4Classifier.search`, or
+ranked by BM25 relevance.
+
+Example:
+    >>> isic = ISIC4Classifier(search_backend="fts")
+    >>> isic.search("manuf food")  # prefix matching in hierarchy order
+    >>> isic.full_text_search("dairy OR bakery", mode="query", ranked=True)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .index import current_index
+from .text import normalize_query
+
+if TYPE_CHECKING:
+    from .index import ISICIndex
+    from .models import ISICSearchResults
+
+FTS_FORMAT = 1
+MODES = ("prefix", "phrase", "query")
+_WORD = re.compile(r"\w+")
+
+
+def fts5_available() -> bool:
+    """Return whether the SQLite library supports FTS5."""
+    connection = sqlite3.connect(":memory:")
+    try:
+        connection.execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        connection.close()
+
+
+class ISICFullTextIndex:
+    """FTS5 index over the codes and descriptions of an `ISICIndex`.
+
+    Row ids of the FTS5 table are the node ids of the index, so matches are
+    mapped back to nodes without a join. Connections are opened read-only,
+    per thread and per process.
+
+    Attributes:
+        index (ISICIndex): The indexed hierarchy.
+        path (Path): The database file.
+    """
+
+    def __init__(self, index: ISICIndex, path: str | os.PathLike | None = None):
+        """Open the full-text index of a hierarchy, building it if needed.
+
+        Args:
+            index (ISICIndex): The hierarchy to index.
+            path (str | os.PathLike | None, optional): The database file.
+                Defaults to a file in the cache directory named after a hash of
+                the indexed text, so every data set is built once.
+
+        Raises:
+            RuntimeError: If the SQLite library does not support FTS5.
+        """
+        self.index = index
+        if path is None:
+            from .sources import get_cache_dir
+
+            digest = hashlib.sha256(f"{FTS_FORMAT}:".encode())
+            for node in index.nodes:
+                digest.update(node.text.encode("utf-8"))
+                digest.update(b"\x01")
+            path = get_cache_dir() / "fts" / f"{digest.hexdigest()}.sqlite3"
+        self.path = Path(path)
+        self._local = threading.local()
+        if not self._is_valid():
+            self._build()
+
+    def _is_valid(self) -> bool:
+        """Return whether the database file exists and indexes this hierarchy.
+
+        Files that are corrupt, truncated, of another format or of another
+        number of nodes are rebuilt rather than failing on every query.
+        """
+        if not self.path.is_file():
+            return False
+        try:
+            connection = sqlite3.connect(f"{self.path.as_uri()}?mode=ro", uri=True)
+            try:
+                (version,) = connection.execute("PRAGMA user_version").fetchone()
+                (count,) = connection.execute("SELECT count(*) FROM nodes").fetchone()
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            return False
+        return version == FTS_FORMAT and count == len(self.index.nodes)
+
+    def _build(self) -> None:
+        if not fts5_available():
+            raise RuntimeError("The SQLite library does not support FTS5")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        connection = sqlite3.connect(tmp_path)
+        try:
+            connection.execute(
+                "CREATE VIRTUAL TABLE nodes USING fts5("
+                "code, description, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            connection.executemany(
+                "INSERT INTO nodes (rowid, code, description) VALUES (?, ?, ?)",
+                ((node.id, *node.text.split("\x00", 1)) for node in self.index.nodes),
+            )
+            connection.execute("INSERT INTO nodes (nodes) VALUES ('optimize')")
+            connection.execute(f"PRAGMA user_version = {FTS_FORMAT}")
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(tmp_path, self.path)
+
+    def _connection(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.connection = sqlite3.connect(
+                f"{self.path.as_uri()}?mode=ro", uri=True, check_same_thread=False
+            )
+            local.pid = os.getpid()
+        return local.connection
+
+    @staticmethod
+    def terms(query: str) -> tuple[str, ...]:
+        """Split a query into normalised words.
+
+        Args:
+            query (str): The query.
+
+        Returns:
+            tuple[str, ...]: The words, lower-cased and without Arabic diacritics.
+        """
+        return tuple(_WORD.findall(normalize_query(query)))
+
+    def match(
+        self,
+        query: str,
+        mode: str = "prefix",
+        ranked: bool = False,
+        limit: int | None = None,
+    ) -> list[int]:
+        """Return the ids of the nodes matching a query.
+
+        Args:
+            query (str): The query.
+            mode (str, optional): 'prefix', 'phrase' or 'query' (see the module
+                documentation). Defaults to "prefix".
+            ranked (bool, optional): Order by relevance instead of hierarchy
+                order. Defaults to False.
+            limit (int | None, optional): Maximum number of ids. Defaults to None.
+
+        Returns:
+            list[int]: The matching node ids. A 'prefix' or 'phrase' query
+                without words matches every node.
+
+        Raises:
+            ValueError: If the mode is unknown or an FTS5 query is invalid.
+        """
+        if mode not in MODES:
+            raise ValueError(
+                f"Unknown full-text mode '{mode}'. Available modes: {', '.join(MODES)}"
+            )
+        if mode == "query":
+            expression = query
+        else:
+            terms = self.terms(query)
+            if not terms:
+                ids = range(len(self.index))
+                return list(ids if limit is None else ids[:limit])
+            if mode == "prefix":
+                expression = " ".join(f'"{term}"*' for term in terms)
+            else:
+                expression = '"' + " ".join(terms) + '"'
+
+        order = "rank" if ranked else "rowid"
+        sql = f"SELECT rowid FROM nodes WHERE nodes MATCH ? ORDER BY {order}"
+        parameters = (expression,)
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters += (limit,)
+        try:
+            rows = self._connection().execute(sql, parameters).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid full-text query {query!r}: {e}") from None
+        return [row[0] for row in rows]
+
+    def search(
+        self,
+        query: str,
+        mode: str = "prefix",
+        ranked: bool = False,
+        limit: int | None = None,
+        spans: bool = False,
+    ) -> ISICSearchResults:
+        """Search the hierarchy and build the results.
+
+        Args:
+            query (str): The query.
+            mode (str, optional): 'prefix', 'phrase' or 'query'. Defaults to
+                "prefix".
+            ranked (bool, optional): Order by relevance instead of hierarchy
+                order. Defaults to False.
+            limit (int | None, optional): Maximum number of results. Defaults
+                to None.
+            spans (bool, optional): Include the positions of the query words
+                in every result. Defaults to False.
+
+        Returns:
+            ISICSearchResults: The matching nodes.
+
+        Raises:
+            ValueError: If the mode is unknown or an FTS5 query is invalid.
+        """
+        nodes = self.index.nodes
+        ids = self.match(query, mode, ranked, limit)
+        terms = self.terms(query) if spans else None
+        return self.index.results((nodes[i] for i in ids), terms)
+
+
+class ISICFullTextMixin:
+    """Mixin class providing full-text search through an FTS5 index.
+
+    The full-text index is opened (and built, the first time a data set is
+    seen) on first use, and rebuilt when the classifier's index changes.
+    """
+
+    _full_text_index = None
+
+    def full_text_index(self) -> ISICFullTextIndex:
+        """Return the full-text index of the current data.
+
+        Returns:
+            ISICFullTextIndex: The full-text index.
+
+        Raises:
+            RuntimeError: If the SQLite library does not support FTS5.
+        """
+        index = current_index(self)
+        full_text = self._full_text_index
+        if full_text is None or full_text.index is not index:
+            full_text = ISICFullTextIndex(index)
+            self._full_text_index = full_text
+        return full_text
+
+    def full_text_search(
+        self,
+        query: str,
+        mode: str = "prefix",
+        ranked: bool = True,
+        limit: int | None = None,
+        spans: bool = False,
+    ) -> ISICSearchResults:
+        """Search codes and descriptions by words with the FTS5 index.
+
+        Args:
+            query (str): The query.
+            mode (str, optional): 'prefix' (every word starts a word of the
+                node), 'phrase' (consecutive words) or 'query' (FTS5 query
+                syntax). Defaults to "prefix".
+            ranked (bool, optional): Order by BM25 relevance instead of
+                hierarchy order. Defaults to True.
+            limit (int | None, optional): Maximum number of results. Defaults
+                to None.
+            spans (bool, optional): Include the positions of the query words
+                in every result. Defaults to False.
+
+        Returns:
+            ISICSearchResults: The matching nodes.
+
+        Raises:
+            ValueError: If the mode is unknown or an FTS5 query is invalid.
+            RuntimeError: If the SQLite library does not support FTS5.
+
+        Example:
+            >>> isic.full_text_search("manuf food", limit=5)
+            >>> isic.full_text_search("mining of coal", mode="phrase")
+            >>> isic.full_text_search("code: 01* AND crops", mode="query")
+        """
+        return self.full_text_index().search(query, mode, ranked, limit, spans)
@@ -0,0 +1,673 @@
+from __future__ import annotations
+
+import threading
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Iterator, NamedTuple
+
+from .text import (
+    find_spans,
+    find_term_spans,
+    map_spans,
+    normalize,
+    normalize_query,
+    offset_map,
+)
+
+if TYPE_CHECKING:
+    from .models import ISICSearchResult, ISICSearchResults
+
+LEVELS = ("section", "division", "group", "class", "subclass")
+HIERARCHY_FIELDS = ("section", "division", "group", "class_")
+RESULT_HIERARCHY_FIELDS = (b"section", b"division", b"group", b"class_", b"subclass")
+TERM_MASK_CACHE_SIZE = 1024
+CHILD_FIELDS = {
+    "section": b"divisions",
+    "division": b"groups",
+    "group": b"classes",
+    "class": b"subclasses",
+    "subclass": b"subclasses",
+}
+# Levels whose children are omitted from the JSON when empty (see models)
+OPTIONAL_CHILD_FIELDS = ("class", "subclass")
+
+
+def _bitset(flags) -> int:
+    """Pack booleans, one per node id, into an integer bitset."""
+    bits = "".join("1" if flag else "0" for flag in flags)
+    return int(bits[::-1] or "0", 2)
+
+
+_encode_string = None
+
+
+def _json_string(value: str | None) -> bytes:
+    """Encode a string the way pydantic's JSON serializer does."""
+    global _encode_string
+    if value is None:
+        return b"null"
+    if _encode_string is None:
+        # Bound on first use, so that importing the package does not load json;
+        # the same function as json.dumps(value, ensure_ascii=False)
+        from json.encoder import encode_basestring as _encode_string
+    return _encode_string(value).encode()
+
+
+class ISICNode(NamedTuple):
+    """An immutable, pre-normalised node of an `ISICIndex`.
+
+    Attributes:
+        id (int): Position of the node in depth-first order.
+        type (str): The hierarchy level ('section', 'division', 'group', 'class'
+            or 'subclass').
+        code (str): The node code.
+        description (str): The node description.
+        parent (int): The id of the parent node, or -1 for sections.
+        hierarchy (tuple[str, ...]): The codes from the section down to this node.
+        path (str): The hierarchy codes joined by '/'.
+        text (str): Normalised ``code`` and ``description`` (see
+            `isic4kit.text.normalize`) separated by a NUL character, used for
+            substring search.
+    """
+
+    id: int
+    type: str
+    code: str
+    description: str
+    parent: int
+    hierarchy: tuple
+    path: str
+    text: str
+
+
+class ISICIndex:
+    """Immutable, pre-normalised index over a loaded ISIC4 hierarchy.
+
+    The index stores every node of the hierarchy in depth-first order as an
+    `ISICNode` together with its normalised search text, and keeps a read-only
+    code table per level. Searching the index is a single pass over pre-computed
+    strings instead of a nested walk that lower-cases every description for
+    every query, and `find` returns the shared node tuples without building any
+    pydantic objects.
+
+    The index is never modified after construction, so any number of threads
+    can read it concurrently without locking. The only exception are the
+    memoised JSON fragments returned by `node_json` and `result_json` and the
+    term bitsets of `term_mask`, which are filled on first use.
+
+    Sets of nodes can be represented as bitsets: Python integers whose bit ``i``
+    is set when node ``i`` belongs to the set. Because nodes are stored in
+    depth-first order, the subtree of a node is a contiguous range of ids and its
+    bitset is a single mask (see `subtree_mask`). `isic4kit.query` combines
+    such masks to evaluate composite queries.
+
+    Attributes:
+        sections (list[ISICSection]): The sections the index was built from.
+        nodes (tuple[ISICNode, ...]): All nodes, in the same order as the linear
+            search visits them.
+        children (tuple[tuple[int, ...], ...]): Child node ids of every node.
+        ends (tuple[int, ...]): For every node, the id following the last node of
+            its subtree.
+        codes (Mapping[str, Mapping[str, int]]): Node ids keyed by level and code.
+            Section codes are lower-cased.
+
+    Example:
+        >>> index = ISICIndex(classifier.sections)
+        >>> index.get("class", "0111").description
+        'Growing of cereals (except rice), leguminous crops and oil seeds'
+        >>> [node.code for node in index.find("hard coal")]
+        ['051', '0510']
+    """
+
+    __slots__ = (
+        "sections",
+        "nodes",
+        "children",
+        "ends",
+        "codes",
+        "_objects",
+        "_payloads",
+        "_offsets",
+        "_node_json",
+        "_result_json",
+        "_level_masks",
+        "_term_masks",
+    )
+
+    def __init__(self, sections):
+        """Build the index.
+
+        Args:
+            sections (list[ISICSection]): The loaded ISIC4 sections.
+        """
+        nodes = []
+        children = []
+        objects = []
+        payloads = []
+        offsets = []
+        codes = {level: {} for level in LEVELS}
+
+        def add(item_type, obj, parent, hierarchy):
+            node_id = len(nodes)
+            nodes.append(
+                ISICNode(
+                    node_id,
+                    item_type,
+                    obj.code,
+                    obj.description,
+                    parent,
+                    hierarchy,
+                    "/".join(hierarchy),
+                    f"{normalize(obj.code)}\x00{normalize(obj.description)}",
+                )
+            )
+            code_offsets = offset_map(obj.code)
+            description_offsets = offset_map(obj.description)
+            offsets.append(
+                None
+                if code_offsets is None and description_offsets is None
+                else (code_offsets, description_offsets)
+            )
+            children.append([])
+            if parent >= 0:
+                children[parent].append(node_id)
+            objects.append(obj)
+            payloads.append(
+                {
+                    "type": item_type,
+                    "code": obj.code,
+                    "description": obj.description,
+                    "hierarchy": dict(zip(HIERARCHY_FIELDS, hierarchy[:4])),
+                    "path": "/".join(hierarchy),
+                }
+            )
+            if len(hierarchy) > 4:
+                payloads[-1]["hierarchy"]["subclass"] = hierarchy[-1]
+            key = obj.code.lower() if item_type == "section" else obj.code
+            codes[item_type].setdefault(key, node_id)
+            return node_id
+
+        def add_subclasses(obj, parent, hierarchy):
+            for subclass in obj.subclasses:
+                subclass_hierarchy = hierarchy + (subclass.code,)
+                subclass_id = add("subclass", subclass, parent, subclass_hierarchy)
+                add_subclasses(subclass, subclass_id, subclass_hierarchy)
+
+        for section in sections:
+            section_id = add("section", section, -1, (section.code,))
+            for division in section.divisions:
+                division_hierarchy = (section.code, division.code)
+                division_id = add("division", division, section_id, division_hierarchy)
+                for group in division.groups:
+                    group_hierarchy = division_hierarchy + (group.code,)
+                    group_id = add("group", group, division_id, group_hierarchy)
+                    for class_ in group.classes:
+                        class_hierarchy = group_hierarchy + (class_.code,)
+                        class_id = add("class", class_, group_id, class_hierarchy)
+                        add_subclasses(class_, class_id, class_hierarchy)
+
+        object.__setattr__(self, "sections", sections)
+        object.__setattr__(self, "nodes", tuple(nodes))
+        object.__setattr__(self, "_objects", tuple(objects))
+        object.__setattr__(self, "_payloads", tuple(payloads))
+        object.__setattr__(self, "_offsets", tuple(offsets))
+        object.__setattr__(self, "children", tuple(map(tuple, children)))
+        ends = list(range(1, len(nodes) + 1))
+        for node in reversed(nodes):
+            if node.parent >= 0:
+                ends[node.parent] = max(ends[node.parent], ends[node.id])
+        object.__setattr__(self, "ends", tuple(ends))
+        object.__setattr__(
+            self,
+            "_level_masks",
+            MappingProxyType(
+                {
+                    level: _bitset(node.type == level for node in nodes)
+                    for level in LEVELS
+                }
+            ),
+        )
+        object.__setattr__(self, "_term_masks", {})
+        # Memoised JSON fragments, filled lazily. Concurrent fills of the same
+        # slot compute identical bytes, so no lock is needed.
+        object.__setattr__(self, "_node_json", [None] * len(nodes))
+        object.__setattr__(self, "_result_json", [None] * len(nodes))
+        object.__setattr__(
+            self,
+            "codes",
+            MappingProxyType(
+                {level: MappingProxyType(table) for level, table in codes.items()}
+            ),
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def lookup(self, code: str, item_type: str | None = None) -> ISICNode | None:
+        """Look up the node for a code.
+
+        Args:
+            code (str): The code to look up. Section codes are case-insensitive.
+            item_type (str | None, optional): Restrict the lookup to one level.
+                Defaults to None, which picks the level implied by the code.
+
+        Returns:
+            ISICNode | None: The matching node if found, None otherwise.
+        """
+        if item_type is None:
+            for table in self.codes.values():
+                node_id = table.get(code.lower() if len(code) == 1 else code)
+                if node_id is not None:
+                    return self.nodes[node_id]
+            return None
+        node_id = self.codes[item_type].get(
+            code.lower() if item_type == "section" else code
+        )
+        return None if node_id is None else self.nodes[node_id]
+
+    def get(self, item_type: str, code: str):
+        """Look up the model object of a node by level and code.
+
+        Args:
+            item_type (str): The hierarchy level ('section', 'division', 'group',
+                'class' or 'subclass').
+            code (str): The code to look up. Section codes are case-insensitive.
+
+        Returns:
+            The matching model object if found, None otherwise.
+        """
+        node_id = self.codes[item_type].get(
+            code.lower() if item_type == "section" else code
+        )
+        return None if node_id is None else self._objects[node_id]
+
+    def match(self, query: str) -> list[ISICNode]:
+        """Return the nodes whose code or description contains the query.
+
+        Args:
+            query (str): A normalised query (see `isic4kit.text.normalize_query`).
+
+        Returns:
+            list[ISICNode]: The matching nodes in hierarchy order.
+        """
+        if "\x00" in query:
+            return []
+        return [node for node in self.nodes if query in node.text]
+
+    def spans(self, node_id: int, query: str) -> dict:
+        """Locate a query in the code and description of a node.
+
+        Matches are found in the normalised search text and mapped back to the
+        original strings with offset maps computed when the index is built. Only
+        nodes whose normalisation moves characters (e.g. Arabic text with
+        diacritics) store a map.
+
+        Args:
+            node_id (int): The id of the node.
+            query (str | tuple[str, ...]): A normalised query (see
+                `isic4kit.text.normalize_query`), or a tuple of normalised terms
+                whose spans are merged.
+
+        Returns:
+            dict: ``{"code": [...], "description": [...]}`` with ``(start, end)``
+                offsets into the original code and description.
+        """
+        code, description = self.nodes[node_id].text.split("\x00", 1)
+        offsets = self._offsets[node_id] or (None, None)
+        if isinstance(query, str):
+            find = find_spans
+        else:
+            find = find_term_spans
+        return {
+            "code": map_spans(find(query, code), offsets[0]),
+            "description": map_spans(find(query, description), offsets[1]),
+        }
+
+    def iter_match(self, query: str, start: int = 0) -> Iterator[ISICNode]:
+        """Yield the nodes matching a query lazily, in hierarchy order.
+
+        Args:
+            query (str): A normalised query (see `isic4kit.text.normalize_query`).
+            start (int, optional): The id of the first node to consider.
+                Defaults to 0.
+
+        Yields:
+            ISICNode: The matching nodes.
+        """
+        if "\x00" in query:
+            return
+        nodes = self.nodes
+        for node_id in range(start, len(nodes)):
+            node = nodes[node_id]
+            if query in node.text:
+                yield node
+
+    def result(self, node_id: int, query: str | None = None) -> ISICSearchResult:
+        """Build the search result for one node.
+
+        Args:
+            node_id (int): The id of the node.
+            query (str | None, optional): A normalised query. If given, the
+                result carries the match spans of the query. Defaults to None.
+
+        Returns:
+            ISICSearchResult: The search result.
+        """
+        from .models import ISICSearchResult
+
+        payload = self._payloads[node_id]
+        if query is not None:
+            payload = {**payload, "spans": self.spans(node_id, query)}
+        return ISICSearchResult.model_validate(payload)
+
+    def results(self, nodes, query: str | None = None) -> ISICSearchResults:
+        """Build search results for index nodes.
+
+        The result payloads are prepared when the index is built and validated
+        in a single call, which is cheaper than constructing each result model
+        separately.
+
+        Args:
+            nodes (Iterable[ISICNode]): Nodes of this index.
+            query (str | tuple[str, ...] | None, optional): A normalised query or
+                tuple of terms. If given, every result carries the match spans
+                of the query (see `spans`). Defaults to None.
+
+        Returns:
+            ISICSearchResults: One result per node, in the given order.
+        """
+        from .models import ISICSearchResults
+
+        payloads = self._payloads
+        if query is None:
+            results = [payloads[node.id] for node in nodes]
+        else:
+            results = [
+                {**payloads[node.id], "spans": self.spans(node.id, query)}
+                for node in nodes
+            ]
+        return ISICSearchResults.model_validate({"results": results})
+
+    def node_json(self, node_id: int) -> bytes:
+        """Return the JSON of a node and its whole subtree.
+
+        The bytes equal ``model_dump_json()`` of the node's model as it was when
+        the index was built. They are assembled from the memoised fragments of
+        the children, so every subtree is serialized only once.
+
+        Args:
+            node_id (int): The id of the node.
+
+        Returns:
+            bytes: The serialized node.
+        """
+        cached = self._node_json[node_id]
+        if cached is not None:
+            return cached
+        node = self.nodes[node_id]
+        children = b",".join(self.node_json(child) for child in self.children[node_id])
+        if children or node.type not in OPTIONAL_CHILD_FIELDS:
+            children = b',"%s":[%s]' % (CHILD_FIELDS[node.type], children)
+        cached = b"".join(
+            (
+                b'{"code":',
+                _json_string(node.code),
+                b',"description":',
+                _json_string(node.description),
+                children,
+                b"}",
+            )
+        )
+        self._node_json[node_id] = cached
+        return cached
+
+    def result_json(self, node_id: int) -> bytes:
+        """Return the JSON of the search result for a node.
+
+        The bytes equal ``model_dump_json()`` of the `ISICSearchResult` that
+        `results` builds for the node.
+
+        Args:
+            node_id (int): The id of the node.
+
+        Returns:
+            bytes: The serialized search result.
+        """
+        cached = self._result_json[node_id]
+        if cached is not None:
+            return cached
+        node = self.nodes[node_id]
+        path = node.hierarchy
+        depth = len(path)
+        hierarchy = (
+            path[0],
+            path[1] if depth > 1 else None,
+            path[2] if depth > 2 else None,
+            path[3] if depth > 3 else None,
+            path[-1] if depth > 4 else None,
+        )
+        cached = b"".join(
+            (
+                b'{"type":',
+                _json_string(node.type),
+                b',"code":',
+                _json_string(node.code),
+                b',"description":',
+                _json_string(node.description),
+                b',"hierarchy":{',
+                b",".join(
+                    b'"%s":%s' % (field, _json_string(value))
+                    for field, value in zip(RESULT_HIERARCHY_FIELDS, hierarchy)
+                    if value is not None or field != b"subclass"
+                ),
+                b'},"path":',
+                _json_string(node.path),
+                b"}",
+            )
+        )
+        self._result_json[node_id] = cached
+        return cached
+
+    def results_json(self, nodes) -> bytes:
+        """Serialize search results for index nodes without building models.
+
+        Args:
+            nodes (Iterable[ISICNode]): Nodes of this index.
+
+        Returns:
+            bytes: The same JSON as ``results(nodes).model_dump_json()``.
+        """
+        result_json = self.result_json
+        return (
+            b'{"results":[' + b",".join(result_json(node.id) for node in nodes) + b"]}"
+        )
+
+    @property
+    def all_mask(self) -> int:
+        """int: The bitset containing every node."""
+        return (1 << len(self.nodes)) - 1
+
+    def level_mask(self, item_type: str) -> int:
+        """Return the bitset of all nodes of one level.
+
+        Args:
+            item_type (str): The hierarchy level ('section', 'division', 'group',
+                'class' or 'subclass').
+
+        Returns:
+            int: The bitset of the level's nodes.
+        """
+        return self._level_masks[item_type]
+
+    def subtree_mask(self, node_id: int) -> int:
+        """Return the bitset of a node and all of its descendants.
+
+        Args:
+            node_id (int): The id of the node.
+
+        Returns:
+            int: The bitset of the subtree.
+        """
+        return (1 << self.ends[node_id]) - (1 << node_id)
+
+    def term_mask(self, term: str) -> int:
+        """Return the bitset of the nodes whose code or description contains a term.
+
+        Matching is the same as `match`. Bitsets are memoised per term, so a
+        term costs one scan of the index however often it is queried.
+
+        Args:
+            term (str): A normalised search term.
+
+        Returns:
+            int: The bitset of the matching nodes.
+        """
+        mask = self._term_masks.get(term)
+        if mask is None:
+            if "\x00" in term:
+                mask = 0
+            else:
+                mask = _bitset(term in node.text for node in self.nodes)
+            if len(self._term_masks) >= TERM_MASK_CACHE_SIZE:
+                self._term_masks.clear()
+            self._term_masks[term] = mask
+        return mask
+
+    def select(self, mask: int) -> list[ISICNode]:
+        """Return the nodes of a bitset.
+
+        Args:
+            mask (int): A bitset of node ids.
+
+        Returns:
+            list[ISICNode]: The nodes in hierarchy order.
+        """
+        nodes = self.nodes
+        bits = bin(mask)[:1:-1]
+        selected = []
+        i = bits.find("1")
+        while i >= 0:
+            selected.append(nodes[i])
+            i = bits.find("1", i + 1)
+        return selected
+
+    def find(self, query: str) -> list[ISICNode]:
+        """Search the index without creating any model objects.
+
+        Uses the same normalised substring matching as
+        `ISICSearchMixin.search`.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            list[ISICNode]: The matching nodes in hierarchy order.
+        """
+        return self.match(normalize_query(query))
+
+
+def ready_index(owner) -> ISICIndex | None:
+    """Return the index of ``owner`` if it is built and still current.
+
+    Args:
+        owner: An object using :class:`ISICIndexMixin`.
+
+    Returns:
+        ISICIndex | None: The index, or None while it is still being built or
+            if ``owner.sections`` has been replaced since it was built.
+    """
+    index = getattr(owner, "_index", None)
+    if index is not None and index.sections is owner.sections:
+        return index
+    return None
+
+
+def current_index(owner) -> ISICIndex:
+    """Return an up-to-date index of ``owner``, waiting for or building one.
+
+    Args:
+        owner: An object with ``sections``, optionally using
+            :class:`ISICIndexMixin`.
+
+    Returns:
+        ISICIndex: The owner's index once it is built, or a new index of
+            ``owner.sections`` if the owner has no current index. Owners that
+            never started building an index keep the new one.
+    """
+    index = ready_index(owner)
+    if index is None:
+        wait_ready = getattr(owner, "wait_ready", None)
+        if wait_ready is not None:
+            wait_ready()
+        index = ready_index(owner)
+        if index is None:
+            index = ISICIndex(owner.sections)
+            if isinstance(owner, ISICIndexMixin) and owner._index_ready is None:
+                # The owner does not build an index itself (e.g. columnar
+                # storage): keep this one for later calls.
+                owner._index = index
+    return index
+
+
+class ISICIndexMixin:
+    """Mixin class building the search index of a classifier.
+
+    The index can be built in a background thread so that construction returns
+    as soon as the data is loaded. Until the index is ready, lookups and
+    searches fall back to walking ``sections``; once it is built it is
+    published with a single attribute assignment and used from then on.
+
+    Attributes:
+        index (ISICIndex | None): The search index, or None while it is
+            being built.
+    """
+
+    _index = None
+    _index_ready = None
+
+    def _start_indexing(self, background: bool = True) -> None:
+        """Build the search index for the loaded sections.
+
+        Args:
+            background (bool, optional): Build the index in a daemon thread
+                instead of blocking the caller. Defaults to True.
+        """
+        self._index = None
+        self._index_ready = threading.Event()
+        if background:
+            threading.Thread(
+                target=self._build_index, name="isic4kit-index", daemon=True
+            ).start()
+        else:
+            self._build_index()
+
+    def _build_index(self) -> None:
+        try:
+            self._index = ISICIndex(self.sections)
+        finally:
+            self._index_ready.set()
+
+    @property
+    def index(self) -> ISICIndex | None:
+        """ISICIndex | None: The search index, or None while it is being built."""
+        return self._index
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Block until the search index has been built.
+
+        Args:
+            timeout (float | None, optional): Maximum number of seconds to wait.
+                Defaults to None (wait indefinitely).
+
+        Returns:
+            bool: True if the index is ready, False if the timeout expired or
+                no index is being built.
+        """
+        if self._index_ready is None:
+            return False
+        return self._index_ready.wait(timeout) and self._index is not None
@@ -1,34 +1,105 @@
 from .base import BaseISIC4
 from .search import ISICSearchMixin
 from .loader import ISICLoaderMixin
+from .index import ISICIndexMixin
+from .semantic import ISICSemanticMixin
+from .aggregate import ISICAggregateMixin
+from .cache import open_search_cache
+from .fts import ISICFullTextMixin
+from .arrow import ISICArrowMixin
+from .synonyms import open_synonyms
+from .suggest import ISICSuggestMixin
 
+SEARCH_BACKENDS = ("scan", "fts")
 
-class ISIC4Classifier(BaseISIC4, ISICSearchMixin, ISICLoaderMixin):
+
+class ISIC4Classifier(
+    BaseISIC4,
+    ISICSearchMixin,
+    ISICLoaderMixin,
+    ISICIndexMixin,
+    ISICSemanticMixin,
+    ISICAggregateMixin,
+    ISICFullTextMixin,
+    ISICArrowMixin,
+    ISICSuggestMixin,
+):
     """ISIC4 Classification handler for economic activities.
 
-    This class combines functionality from BaseISIC4, ISICSearchMixin, and ISICLoaderMixin
-    to provide a complete interface for working with ISIC Revision 4 classifications.
+    This class combines functionality from BaseISIC4, ISICSearchMixin, ISICLoaderMixin,
+    ISICIndexMixin, ISICSemanticMixin, ISICAggregateMixin, ISICFullTextMixin,
+    ISICArrowMixin and ISICSuggestMixin to provide a complete interface for working
+    with ISIC Revision 4 classifications. The search index is built in a background
+    thread after the data is loaded; use `wait_ready()` to block until it is available.
 
     Attributes:
         language (str): The language code for classification descriptions (default: "en")
         sections (list): List of loaded ISIC4 sections
+        source: External data source, or None for the bundled data
+        data_version (str): Hash identifying the loaded data
 
     Raises:
         ValueError: If there is an error loading the ISIC4 classification data
     """
 
-    def __init__(self, language="en"):
+    def __init__(
+        self,
+        language="en",
+        source=None,
+        background_index=True,
+        storage="objects",
+        search_cache=None,
+        search_backend="scan",
+        synonyms=None,
+    ):
         """Initialize the ISIC4 classifier.
 
         Args:
             language (str, optional): Language code for classifications. Defaults to "en".
+            source (str | os.PathLike, optional): External JSON/CSV file or directory
+                to load instead of the bundled data. A source without sections extends
+                the bundled data of `language`. Defaults to None.
+            background_index (bool, optional): Build the search index in a background
+                thread instead of before returning. Defaults to True.
+            storage (str, optional): "objects" to load the data into model objects,
+                or "columnar" to keep it in a compact `ISICColumns` store that lookups
+                and searches run over directly. With columnar storage no search index
+                is built, and `sections` is materialised on first access.
+                Defaults to "objects".
+            search_cache (bool | str | os.PathLike | ISICSearchCache, optional):
+                Persistent search cache shared between processes: True for the
+                default database in the cache directory, a database path, or an
+                `ISICSearchCache`. Defaults to None (no persistent cache).
+            search_backend (str, optional): "scan" to search codes and descriptions
+                for the query as a substring, or "fts" to match the words of the
+                query as prefixes of words through an SQLite FTS5 index, built once
+                per data set and cached on disk (see `isic4kit.fts`).
+                Defaults to "scan".
+            synonyms (bool | str | os.PathLike | Mapping | ISICSynonyms, optional):
+                Expand search queries with synonyms: True for the bundled table of
+                `language`, a JSON file or mapping of extra synonyms added to the
+                bundled ones, or an `ISICSynonyms` (see `isic4kit.synonyms`).
+                Defaults to None (no expansion).
 
         Raises:
-            ValueError: If there is an error loading the ISIC4 classification data
+            ValueError: If there is an error loading the ISIC4 classification data,
+                if the search backend is unknown, or if the synonyms are invalid
         """
+        if search_backend not in SEARCH_BACKENDS:
+            raise ValueError(
+                f"Unknown search backend '{search_backend}'. "
+                f"Available backends: {', '.join(SEARCH_BACKENDS)}"
+            )
+        self.search_backend = search_backend
         self.language = language
+        self.source = source
+        self.storage = storage
+        self.search_cache = open_search_cache(search_cache)
+        self.synonyms = open_synonyms(synonyms, language)
         self.sections = []
         try:
             self._load_data()
         except ValueError as e:
             raise
+        if self.columns is None:
+            self._start_indexing(background=background_index)
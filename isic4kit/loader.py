@@ -1,6 +1,4 @@
-import json
 from pathlib import Path
-from .models import ISICSection, ISICDivision, ISICGroup, ISICClass
 
 
 class ISICLoaderMixin:
@@ -8,12 +6,20 @@ class ISICLoaderMixin:
 
     This mixin provides methods to load and parse ISIC4 classification data
     from JSON files in different languages. It handles the loading and parsing
-    of hierarchical ISIC4 classification data.
+    of hierarchical ISIC4 classification data, either from the bundled data
+    files or from an external source (see `isic4kit.sources`).
 
     Attributes:
         sections (list[ISICSection]): List of ISIC sections containing the complete
             hierarchical structure of classifications.
         language (str): The language code for loading classification data.
+        source (str | os.PathLike | None): Optional external JSON/CSV file or
+            directory to load instead of the bundled data.
+        data_version (str): Hash identifying the loaded data.
+        storage (str): 'objects' to build the model objects when loading, or
+            'columnar' to keep only an `ISICColumns` store and build ``sections``
+            the first time it is accessed.
+        columns (ISICColumns | None): The columnar store, with columnar storage.
 
     Example:
         >>> class ISICLoader(ISICLoaderMixin):
@@ -24,6 +30,26 @@ class ISICLoaderMixin:
         >>> sections = loader.sections
     """
 
+    source = None
+    storage = "objects"
+    columns = None
+    _sections = None
+
+    @property
+    def sections(self) -> list:
+        """list[ISICSection]: The loaded sections.
+
+        With columnar storage, the model objects are built from the columns on
+        first access.
+        """
+        if self._sections is None and self.columns is not None:
+            self._sections = self.columns.sections()
+        return self._sections
+
+    @sections.setter
+    def sections(self, value: list) -> None:
+        self._sections = value
+
     def _load_data(self):
         """Load and parse ISIC4 classification data from JSON file.
 
@@ -33,23 +59,37 @@ class ISICLoaderMixin:
         sections attribute of the instance.
 
         The JSON file should be located in the 'data' directory with the filename
-        format '{language}.json'.
+        format '{language}.json'. If the instance has a `source`, the data is
+        loaded, validated and compiled from that source instead.
 
         Raises:
             ValueError: If the specified language is not supported
                 (no corresponding JSON file exists in the data directory).
                 The error message includes a list of available languages.
+                Also raised if an external source cannot be loaded or fails
+                validation.
 
         Note:
             The loaded data structure follows the hierarchy:
             - Sections contain Divisions
             - Divisions contain Groups
             - Groups contain Classes
+            - Classes may contain national Subclasses (external sources only)
         """
+        import hashlib
+        import json
+
+        if self.source is not None:
+            from .sources import load_source
+
+            data, self.data_version = load_source(self.source, self.language)
+            self._store_data(data)
+            return
+
         data_path = Path(__file__).parent / "data" / f"{self.language}.json"
         try:
-            with open(data_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(data_path, "rb") as f:
+                raw = f.read()
         except FileNotFoundError:
             supported_languages = [
                 p.stem for p in (Path(__file__).parent / "data").glob("*.json")
@@ -59,9 +99,42 @@ class ISICLoaderMixin:
                 f"Available languages: {', '.join(sorted(supported_languages))}"
             )
 
-        self.sections = []
-        for section_data in data["sections"]:
-            section = ISICSection(
+        self.data_version = hashlib.sha256(raw).hexdigest()
+        self._store_data(json.loads(raw.decode("utf-8")))
+
+    def _store_data(self, data: dict) -> None:
+        """Keep loaded data as model objects or columns, depending on `storage`.
+
+        Raises:
+            ValueError: If `storage` is not 'objects' or 'columnar'.
+        """
+        if self.storage == "columnar":
+            from .columnar import ISICColumns
+
+            self.columns = ISICColumns.from_data(data)
+            self.sections = None
+        elif self.storage == "objects":
+            self.columns = None
+            self.sections = self._build_sections(data)
+        else:
+            raise ValueError(
+                f"Unknown storage '{self.storage}': expected 'objects' or 'columnar'"
+            )
+
+    @staticmethod
+    def _build_sections(data: dict) -> list:
+        """Construct the section models from data in the bundled JSON format.
+
+        Args:
+            data (dict): The hierarchy as ``{"sections": [...]}``.
+
+        Returns:
+            list[ISICSection]: The constructed sections.
+        """
+        from .models import ISICSection, ISICDivision, ISICGroup, ISICClass
+
+        return [
+            ISICSection(
                 code=section_data["section"],
                 description=section_data["description"],
                 divisions=[
@@ -76,6 +149,7 @@ class ISICLoaderMixin:
                                     ISICClass(
                                         code=class_data["class"],
                                         description=class_data["description"],
+                                        subclasses=_build_subclasses(class_data),
                                     )
                                     for class_data in group_data["classes"]
                                 ],
@@ -86,4 +160,22 @@ class ISICLoaderMixin:
                     for div_data in section_data["divisions"]
                 ],
             )
-            self.sections.append(section)
+            for section_data in data["sections"]
+        ]
+
+
+def _build_subclasses(node_data: dict) -> list:
+    subclasses = node_data.get("subclasses")
+    if not subclasses:
+        return []
+
+    from .models import ISICSubclass
+
+    return [
+        ISICSubclass(
+            code=subclass_data["subclass"],
+            description=subclass_data["description"],
+            subclasses=_build_subclasses(subclass_data),
+        )
+        for subclass_data in subclasses
+    ]
@@ -0,0 +1,164 @@
+"""Load test for the ISIC4Kit HTTP service.
+
+Start the service and point the load test at it:
+
+    python -m isic4kit serve --port 8000 &
+    python -m isic4kit.loadtest --url http://127.0.0.1:8000 --requests 20000
+
+Every worker thread keeps one HTTP/1.1 connection alive and cycles through a
+seeded mix of lookups, searches and batch requests. The summary (throughput
+and latency percentiles) is printed as JSON.
+"""
+
+import argparse
+import http.client
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+from .bench import QUERIES
+
+LOOKUP_CODES = {
+    "section": ["a", "b", "c", "g", "q"],
+    "division": ["01", "05", "10", "47", "62", "86"],
+    "group": ["011", "051", "107", "471", "620", "861"],
+    "class": ["0111", "0510", "1071", "4711", "6201", "8610", "0000"],
+}
+
+
+def build_workload(language: str, size: int, seed: int = 0) -> list:
+    """Build a seeded list of ``(method, path, body)`` requests.
+
+    Args:
+        language (str): Language used for searches and lookups.
+        size (int): Number of requests.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        list[tuple[str, str, bytes | None]]: The requests.
+    """
+    rng = random.Random(seed)
+    queries = QUERIES.get(language, QUERIES["en"])
+    levels = list(LOOKUP_CODES)
+    workload = []
+    for _ in range(size):
+        roll = rng.random()
+        if roll < 0.7:
+            level = rng.choice(levels)
+            code = rng.choice(LOOKUP_CODES[level])
+            workload.append(("GET", f"/{level}/{code}?lang={language}", None))
+        elif roll < 0.95:
+            query = quote(rng.choice(queries))
+            workload.append(("GET", f"/search?q={query}&lang={language}", None))
+        else:
+            requests = [
+                {"type": "class", "code": rng.choice(LOOKUP_CODES["class"])}
+                for _ in range(20)
+            ] + [{"type": "search", "query": rng.choice(queries)}]
+            body = json.dumps({"lang": language, "requests": requests}).encode()
+            workload.append(("POST", "/batch", body))
+    return workload
+
+
+def run(
+    url: str,
+    requests: int = 10000,
+    concurrency: int = 8,
+    language: str = "en",
+    seed: int = 0,
+) -> dict:
+    """Run the load test and return a summary.
+
+    Args:
+        url (str): Base URL of the service, e.g. ``http://127.0.0.1:8000``.
+        requests (int, optional): Total number of requests. Defaults to 10000.
+        concurrency (int, optional): Worker threads, one keep-alive connection
+            each. Defaults to 8.
+        language (str, optional): Language of the workload. Defaults to "en".
+        seed (int, optional): Random seed of the workload. Defaults to 0.
+
+    Returns:
+        dict: Request counts, errors, throughput and latency percentiles (ms).
+    """
+    target = urlsplit(url)
+    workload = build_workload(language, requests, seed)
+    chunks = [workload[i::concurrency] for i in range(concurrency)]
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+
+    def worker(i):
+        connection = http.client.HTTPConnection(target.hostname, target.port or 80)
+        try:
+            for method, path, body in chunks[i]:
+                headers = {"Content-Type": "application/json"} if body else {}
+                start = time.perf_counter()
+                try:
+                    connection.request(method, path, body=body, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                except (OSError, http.client.HTTPException):
+                    errors[i] += 1
+                    connection.close()
+                    continue
+                latencies[i].append(time.perf_counter() - start)
+                if response.status >= 500:
+                    errors[i] += 1
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    timings = sorted(t * 1000 for chunk in latencies for t in chunk)
+
+    def percentile(p):
+        if not timings:
+            return None
+        return timings[min(len(timings) - 1, int(p / 100 * len(timings)))]
+
+    return {
+        "url": url,
+        "requests": requests,
+        "completed": len(timings),
+        "errors": sum(errors),
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "requests_per_s": len(timings) / elapsed if elapsed else None,
+        "latency_ms": {
+            "mean": statistics.fmean(timings) if timings else None,
+            "p50": percentile(50),
+            "p90": percentile(90),
+            "p99": percentile(99),
+            "max": timings[-1] if timings else None,
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m isic4kit.loadtest",
+        description="Load test a running 'python -m isic4kit serve' instance.",
+    )
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="service URL")
+    parser.add_argument("--requests", type=int, default=10000, help="total requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="worker threads")
+    parser.add_argument("--language", default="en", help="workload language")
+    parser.add_argument("--seed", type=int, default=0, help="workload seed")
+    args = parser.parse_args(argv)
+
+    summary = run(args.url, args.requests, args.concurrency, args.language, args.seed)
+    print(json.dumps(summary, indent=2))
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
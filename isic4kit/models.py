@@ -1,7 +1,66 @@
-from pydantic import BaseModel
+import sys
+
+from pydantic import BaseModel, model_serializer
 from .tree import Tree
 
 
+def _omit_empty(model, data, fields):
+    """Drop fields that are empty or None from serialized data.
+
+    Keeps the serialized form of models without national subclasses, match
+    spans or scores identical to that of the models before these fields existed.
+    """
+    for field in fields:
+        if not getattr(model, field):
+            data.pop(field, None)
+    return data
+
+
+class ISICSubclass(BaseModel):
+    """A class representing a national ISIC Subclass.
+
+    National extensions of ISIC refine classes into 5- and 6-digit subclasses.
+    Subclasses are only present in data loaded from an external source and may
+    themselves contain finer subclasses.
+
+    Attributes:
+        code (str): The unique subclass code, prefixed by its parent's code.
+        description (str): The text description of the subclass.
+        subclasses (list[ISICSubclass]): Finer subclasses contained in this one.
+
+    Examples:
+        >>> subclass = ISICSubclass(code="011101", description="Growing of wheat")
+        >>> subclass.print_tree()
+        └── 011101: Growing of wheat
+    """
+    code: str
+    description: str
+    subclasses: list["ISICSubclass"] = []
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler):
+        return _omit_empty(self, handler(self), ("subclasses",))
+
+    def print_tree(self, indent: str = "", max_depth=None, levels=None, file=None) -> None:
+        """Display a tree representation of this ISIC Subclass.
+
+        Prints the ISIC subclass and its finer subclasses in a hierarchical tree format.
+
+        Args:
+            indent (str, optional): String prefix used for indentation. Defaults to "".
+            max_depth (int | None, optional): Number of levels to show below this node.
+                Defaults to None (no limit).
+            levels (Iterable[str] | None, optional): Only show nodes of these levels,
+                e.g. ``("division", "class")``. Defaults to None (all levels).
+            file (IO[str] | None, optional): The stream to write to. Defaults to
+                None (standard output).
+
+        Returns:
+            None
+        """
+        Tree.print(self, indent, max_depth=max_depth, levels=levels, file=file)
+
+
 class ISICClass(BaseModel):
     """A class representing an ISIC Class.
 
@@ -11,6 +70,7 @@ class ISICClass(BaseModel):
     Attributes:
         code (str): The unique ISIC code identifier.
         description (str): The text description of the class.
+        subclasses (list[ISICSubclass]): National subclasses of this class, if any.
 
     Examples:
         >>> isic_class = ISICClass(code="0111", description="Growing of cereals")
@@ -19,19 +79,30 @@ class ISICClass(BaseModel):
     """
     code: str
     description: str
+    subclasses: list[ISICSubclass] = []
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler):
+        return _omit_empty(self, handler(self), ("subclasses",))
 
-    def print_tree(self, indent: str = "") -> None:
+    def print_tree(self, indent: str = "", max_depth=None, levels=None, file=None) -> None:
         """Display a tree representation of this ISIC Class.
 
         Prints the ISIC class code and description in a tree-like format.
 
         Args:
             indent (str, optional): String prefix used for indentation. Defaults to "".
+            max_depth (int | None, optional): Number of levels to show below this node.
+                Defaults to None (no limit).
+            levels (Iterable[str] | None, optional): Only show nodes of these levels,
+                e.g. ``("division", "class")``. Defaults to None (all levels).
+            file (IO[str] | None, optional): The stream to write to. Defaults to
+                None (standard output).
 
         Returns:
             None
         """
-        Tree.print(self, indent)
+        Tree.print(self, indent, max_depth=max_depth, levels=levels, file=file)
 
 
 class ISICGroup(BaseModel):
@@ -54,18 +125,24 @@ class ISICGroup(BaseModel):
     description: str
     classes: list[ISICClass]
 
-    def print_tree(self, indent: str = "") -> None:
+    def print_tree(self, indent: str = "", max_depth=None, levels=None, file=None) -> None:
         """Display a tree representation of this ISIC Group.
 
         Prints the ISIC group and its classes in a hierarchical tree format.
 
         Args:
             indent (str, optional): String prefix used for indentation. Defaults to "".
+            max_depth (int | None, optional): Number of levels to show below this node.
+                Defaults to None (no limit).
+            levels (Iterable[str] | None, optional): Only show nodes of these levels,
+                e.g. ``("division", "class")``. Defaults to None (all levels).
+            file (IO[str] | None, optional): The stream to write to. Defaults to
+                None (standard output).
 
         Returns:
             None
         """
-        Tree.print(self, indent)
+        Tree.print(self, indent, max_depth=max_depth, levels=levels, file=file)
 
 
 class ISICDivision(BaseModel):
@@ -88,18 +165,24 @@ class ISICDivision(BaseModel):
     description: str
     groups: list[ISICGroup]
 
-    def print_tree(self, indent: str = "") -> None:
+    def print_tree(self, indent: str = "", max_depth=None, levels=None, file=None) -> None:
         """Display a tree representation of this ISIC Division.
 
         Prints the ISIC division and its groups in a hierarchical tree format.
 
         Args:
             indent (str, optional): String prefix used for indentation. Defaults to "".
+            max_depth (int | None, optional): Number of levels to show below this node.
+                Defaults to None (no limit).
+            levels (Iterable[str] | None, optional): Only show nodes of these levels,
+                e.g. ``("division", "class")``. Defaults to None (all levels).
+            file (IO[str] | None, optional): The stream to write to. Defaults to
+                None (standard output).
 
         Returns:
             None
         """
-        Tree.print(self, indent)
+        Tree.print(self, indent, max_depth=max_depth, levels=levels, file=file)
 
 
 class ISICSection(BaseModel):
@@ -122,18 +205,24 @@ class ISICSection(BaseModel):
     description: str
     divisions: list[ISICDivision]
 
-    def print_tree(self, indent: str = "") -> None:
+    def print_tree(self, indent: str = "", max_depth=None, levels=None, file=None) -> None:
         """Display a tree representation of this ISIC Section.
 
         Prints the ISIC section and its divisions in a hierarchical tree format.
 
         Args:
             indent (str, optional): String prefix used for indentation. Defaults to "".
+            max_depth (int | None, optional): Number of levels to show below this node.
+                Defaults to None (no limit).
+            levels (Iterable[str] | None, optional): Only show nodes of these levels,
+                e.g. ``("division", "class")``. Defaults to None (all levels).
+            file (IO[str] | None, optional): The stream to write to. Defaults to
+                None (standard output).
 
         Returns:
             None
         """
-        Tree.print(self, indent)
+        Tree.print(self, indent, max_depth=max_depth, levels=levels, file=file)
 
 
 class ISICHierarchy(BaseModel):
@@ -147,6 +236,8 @@ class ISICHierarchy(BaseModel):
         division (str | None): The division code, if applicable. Defaults to None.
         group (str | None): The group code, if applicable. Defaults to None.
         class_ (str | None): The class code, if applicable. Defaults to None.
+        subclass (str | None): The national subclass code, if applicable.
+            Defaults to None.
 
     Examples:
         >>> hierarchy = ISICHierarchy(section="A", division="01", group="011", class_="0111")
@@ -155,6 +246,87 @@ class ISICHierarchy(BaseModel):
     division: str | None = None
     group: str | None = None
     class_: str | None = None
+    subclass: str | None = None
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler):
+        return _omit_empty(self, handler(self), ("subclass",))
+
+
+class ISICConcordanceMatch(BaseModel):
+    """A class representing one target of a concordance translation.
+
+    Returned by `ISICConcordance.translate` for each ISIC4 node a source code
+    of another classification maps to.
+
+    Attributes:
+        source (str): The translated code of the source classification.
+        type (str): The level of the ISIC4 target (section/division/group/class/subclass).
+        code (str): The ISIC4 target code.
+        description (str): The text description of the target.
+        weight (float): Share of the source code assigned to this target.
+
+    Examples:
+        >>> match = ISICConcordanceMatch(
+        ...     source="0111", type="class", code="0111",
+        ...     description="Growing of cereals", weight=0.5
+        ... )
+    """
+    source: str
+    type: str
+    code: str
+    description: str
+    weight: float
+
+
+class ISICSuggestion(BaseModel):
+    """A class representing a valid code suggested for an invalid one.
+
+    Returned by `ISIC4Classifier.suggest`, ranked by decreasing score.
+
+    Attributes:
+        input (str): The code the suggestion was made for.
+        type (str): The level of the suggested node (section/division/group/class/subclass).
+        code (str): The suggested code.
+        description (str): The text description of the suggested node.
+        reason (str): Why the code is suggested: 'exact' (the input is valid),
+            'typo' (one character inserted, deleted, replaced or swapped),
+            'ancestor' (the nearest valid ancestor) or 'sibling' (a child of
+            the nearest valid ancestor).
+        score (float): Ranking score between 0 and 1.
+
+    Examples:
+        >>> suggestion = ISICSuggestion(
+        ...     input="0119x", type="class", code="0119",
+        ...     description="Growing of other non-perennial crops",
+        ...     reason="typo", score=0.9
+        ... )
+    """
+    input: str
+    type: str
+    code: str
+    description: str
+    reason: str
+    score: float
+
+
+class ISICMatchSpans(BaseModel):
+    """A class holding the positions of a search query in a search result.
+
+    Positions are character offsets into the original code and description, so
+    they can be used for highlighting directly, including in Arabic text whose
+    diacritics are ignored when matching.
+
+    Attributes:
+        code (list[tuple[int, int]]): (start, end) offsets of the matches in the code.
+        description (list[tuple[int, int]]): (start, end) offsets of the matches
+            in the description.
+
+    Examples:
+        >>> spans = ISICMatchSpans(code=[], description=[(0, 6)])
+    """
+    code: list[tuple[int, int]] = []
+    description: list[tuple[int, int]] = []
 
 
 class ISICSearchResult(BaseModel):
@@ -164,11 +336,15 @@ class ISICSearchResult(BaseModel):
     during a search operation, including its position in the ISIC hierarchy.
 
     Attributes:
-        type (str): The type of ISIC entity found (section/division/group/class).
+        type (str): The type of ISIC entity found (section/division/group/class/subclass).
         code (str): The ISIC code of the found entity.
         description (str): The text description of the found entity.
         hierarchy (ISICHierarchy): Object showing the position in the ISIC tree.
         path (str): String representation of the path to this entity.
+        spans (ISICMatchSpans | None): Positions of the query in the code and
+            description, if the search was asked for them.
+        score (float | None): Cosine similarity to the query, for semantic
+            search results.
 
     Examples:
         >>> result = ISICSearchResult(
@@ -184,19 +360,33 @@ class ISICSearchResult(BaseModel):
     description: str
     hierarchy: ISICHierarchy
     path: str
+    spans: ISICMatchSpans | None = None
+    score: float | None = None
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler):
+        return _omit_empty(self, handler(self), ("spans", "score"))
 
-    def print_tree(self, indent=""):
+    def print_tree(self, indent="", highlight=None, file=None, max_depth=None, levels=None):
         """Display a tree representation of this search result.
 
         Prints the search result in a tree format, showing its code and description.
 
         Args:
             indent (str, optional): String prefix used for indentation. Defaults to "".
+            highlight (tuple[str, str] | None, optional): Markers inserted before and
+                after every match span, e.g. `Tree.BOLD`. Defaults to None.
+            file (IO[str] | None, optional): The stream to write to. Defaults to
+                None (standard output).
+            max_depth (int | None, optional): Number of levels to show below this node.
+                Defaults to None (no limit).
+            levels (Iterable[str] | None, optional): Only show nodes of these levels,
+                e.g. ``("division", "class")``. Defaults to None (all levels).
 
         Returns:
             None
         """
-        Tree.print(self, indent)
+        Tree.write((self,), file or sys.stdout, indent, highlight, max_depth, levels)
 
 
 class ISICSearchResults(BaseModel):
@@ -217,15 +407,39 @@ class ISICSearchResults(BaseModel):
     """
     results: list[ISICSearchResult]
 
-    def print_tree(self, indent=""):
+    def grouped(self):
+        """Group the results by their position in the ISIC hierarchy.
+
+        Returns:
+            list[ISICResultGroup]: One group per section, nesting the groups of
+                divisions, groups, classes and subclasses. Every group holds its
+                search result, or None if only its descendants matched.
+
+        Example:
+            >>> sections = results.grouped()
+            >>> [group.code for group in sections[0].children]
+            ['05']
+        """
+        return Tree.group(self.results)
+
+    def print_tree(self, indent="", highlight=None, file=None, max_depth=None, levels=None):
         """Display a hierarchical tree representation of all search results.
 
-        Creates and displays a tree structure showing the hierarchical
-        relationship between all search results, organizing them by their
-        position in the ISIC classification system.
+        Groups the results by their position in the ISIC classification system
+        (see `grouped`) and displays them as a tree, starting at the sections.
+        Ancestors that are not results themselves are shown by code only.
 
         Args:
             indent (str, optional): String prefix used for indentation. Defaults to "".
+            highlight (tuple[str, str] | None, optional): Markers inserted before and
+                after every match span of results searched with ``spans=True``,
+                e.g. `Tree.BOLD`. Defaults to None.
+            file (IO[str] | None, optional): The stream to write to. Defaults to
+                None (standard output).
+            max_depth (int | None, optional): Number of levels to show below the
+                sections. Defaults to None (no limit).
+            levels (Iterable[str] | None, optional): Only show nodes of these levels,
+                e.g. ``("division", "class")``. Defaults to None (all levels).
 
         Returns:
             None
@@ -236,56 +450,22 @@ class ISICSearchResults(BaseModel):
                 └── 01: Crop and animal production
                     └── 011: Growing of non-perennial crops
         """
-        sections = {}
-        for result in self.results:
-            section = result.hierarchy.section
-            division = result.hierarchy.division
-            group = result.hierarchy.group
-            class_ = result.hierarchy.class_
-
-            if section not in sections:
-                sections[section] = {"item": None, "divisions": {}}
-
-            if division:
-                if division not in sections[section]["divisions"]:
-                    sections[section]["divisions"][division] = {
-                        "item": None,
-                        "groups": {},
-                    }
-                if result.type == "division":
-                    sections[section]["divisions"][division]["item"] = result
-
-                if group:
-                    if group not in sections[section]["divisions"][division]["groups"]:
-                        sections[section]["divisions"][division]["groups"][group] = {
-                            "item": None,
-                            "classes": {},
-                        }
-                    if result.type == "group":
-                        sections[section]["divisions"][division]["groups"][group][
-                            "item"
-                        ] = result
-
-                    if class_ and result.type == "class":
-                        sections[section]["divisions"][division]["groups"][group][
-                            "classes"
-                        ][class_] = result
-
-        for section, section_data in sections.items():
-            for division, division_data in section_data["divisions"].items():
-                if division_data["item"]:
-                    print(
-                        f"{indent}├── {division_data['item'].code}: {division_data['item'].description}"
-                    )
-
-                for group, group_data in division_data["groups"].items():
-                    if group_data["item"]:
-                        print(
-                            f"{indent}│   ├── {group_data['item'].code}: {group_data['item'].description}"
-                        )
-
-                    for class_, class_result in group_data["classes"].items():
-                        if class_result:
-                            print(
-                                f"{indent}│   │   ├── {class_result.code}: {class_result.description}"
-                            )
+        Tree.write(
+            self.grouped(), file or sys.stdout, indent, highlight, max_depth, levels
+        )
+
+
+class ISICSearchPage(ISICSearchResults):
+    """One page of search results.
+
+    Attributes:
+        results (list[ISICSearchResult]): The results of this page, in hierarchy order.
+        next_cursor (str | None): Opaque cursor of the next page, or None if this is
+            the last page.
+
+    Examples:
+        >>> page = isic.search_page("manufacture", limit=10)
+        >>> while page.next_cursor:
+        ...     page = isic.search_page("manufacture", limit=10, cursor=page.next_cursor)
+    """
+    next_cursor: str | None = None
@@ -0,0 +1,159 @@
+"""Preloading classifiers before forking worker processes.
+
+Prefork servers (gunicorn with ``preload_app = True``, uWSGI without
+``lazy-apps``) load the application once in a master process and fork the
+workers from it, so the workers share the master's memory pages copy-on-write.
+The sharing degrades over time: every Python object carries a reference count
+and a garbage-collector header, and merely reading an object, or a collection
+traversing it, writes to the page it lives on, which the kernel then copies
+into the worker.
+
+`preload` keeps the workers from copying what the master built:
+
+- everything otherwise built on first use (the search index, compiled
+  synonyms, the full-text index) is built before the fork, so the workers do
+  not each build a private copy;
+- the garbage collector moves all surviving objects to a permanent generation
+  with `gc.freeze`, so collections in the workers never visit them.
+
+The hierarchy is kept in model objects by default, so lookups such as
+`get_section` return prebuilt models in about a microsecond and allocate
+nothing in the workers; reading them still updates their reference counts, so
+the pages of the objects a worker uses are gradually copied. Columnar storage
+(``storage="columnar"``, see `isic4kit.columnar`) holds the hierarchy in a
+handful of arrays and two strings whose pages stay shared, at the price of
+building the returned models on every lookup (about a millisecond for a
+section, allocated in the worker). Use it when the memory of many workers
+matters more than lookup latency.
+
+Example (a gunicorn configuration or application module)::
+
+    from isic4kit.preload import preload
+
+    classifiers = preload(["en", "ar"])  # before the workers are forked
+    isic = classifiers["en"]
+
+`memory_usage` reports how much of a process' memory is shared, e.g. to check
+the workers of a deployment.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+from typing import TYPE_CHECKING, Iterable
+
+from .index import current_index
+
+if TYPE_CHECKING:
+    from .isic4 import ISIC4Classifier
+
+_MEMORY_FIELDS = (
+    "Rss",
+    "Pss",
+    "Shared_Clean",
+    "Shared_Dirty",
+    "Private_Clean",
+    "Private_Dirty",
+)
+
+
+def warm(classifier: ISIC4Classifier) -> ISIC4Classifier:
+    """Build the lazily built structures of a classifier.
+
+    Waits for (or builds) the search index of object storage, and compiles the
+    synonyms and opens the full-text index if the classifier uses them. With
+    columnar storage and no synonyms, no index is needed and none is built.
+
+    Args:
+        classifier (ISIC4Classifier): The classifier.
+
+    Returns:
+        ISIC4Classifier: The same classifier.
+    """
+    from . import models  # noqa: F401 (imported lazily otherwise, per worker)
+
+    synonyms = getattr(classifier, "synonyms", None)
+    if classifier.columns is None or synonyms is not None:
+        index = current_index(classifier)
+        if synonyms is not None:
+            synonyms.compile(index)
+    if getattr(classifier, "search_backend", "scan") == "fts":
+        classifier.full_text_index()
+    return classifier
+
+
+def freeze() -> None:
+    """Collect garbage and move all remaining objects to the permanent generation.
+
+    Call this in the master process right before forking. Frozen objects are
+    never traversed by the garbage collector of the workers, so their pages are
+    not copied by collections.
+    """
+    gc.collect()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+
+def preload(
+    languages: Iterable[str] = ("en",),
+    storage: str = "objects",
+    freeze_gc: bool = True,
+    **options,
+) -> dict[str, ISIC4Classifier]:
+    """Load and warm classifiers in a master process before forking workers.
+
+    Args:
+        languages (Iterable[str], optional): The languages to load. Defaults to
+            ("en",).
+        storage (str, optional): The storage of the classifiers: "objects" for
+            prebuilt models and fast lookups, or "columnar" for a few large
+            buffers that stay shared but build models on every lookup. Defaults
+            to "objects".
+        freeze_gc (bool, optional): Call `freeze` once everything is loaded.
+            Defaults to True.
+        **options: Further arguments of `ISIC4Classifier`, e.g. ``source``,
+            ``synonyms`` or ``search_backend``.
+
+    Returns:
+        dict[str, ISIC4Classifier]: The classifiers, keyed by language.
+
+    Raises:
+        ValueError: If a classifier cannot be loaded.
+    """
+    from .isic4 import ISIC4Classifier
+
+    options.setdefault("background_index", False)
+    classifiers = {
+        language: warm(ISIC4Classifier(language=language, storage=storage, **options))
+        for language in languages
+    }
+    if freeze_gc:
+        freeze()
+    return classifiers
+
+
+def memory_usage(pid: int | None = None) -> dict[str, int]:
+    """Return the shared and private memory of a process, in bytes.
+
+    Reads ``/proc/{pid}/smaps_rollup``, so it is only available on Linux.
+
+    Args:
+        pid (int | None, optional): The process. Defaults to None (the current
+            process).
+
+    Returns:
+        dict[str, int]: ``Rss``, ``Pss``, ``Shared_Clean``, ``Shared_Dirty``,
+            ``Private_Clean`` and ``Private_Dirty``.
+
+    Raises:
+        OSError: If the memory map of the process cannot be read.
+    """
+    path = f"/proc/{os.getpid() if pid is None else pid}/smaps_rollup"
+    usage = dict.fromkeys(_MEMORY_FIELDS, 0)
+    with open(path, encoding="ascii") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in usage:
+                usage[name] = int(value.split()[0]) * 1024
+    return usage
@@ -0,0 +1,206 @@
+"""Composable set-algebra queries over the ISIC4 hierarchy.
+
+Queries are built from three kinds of filters and combined with ``&`` (and),
+``|`` (or) and ``~`` (not):
+
+- `Term` matches nodes whose code or description contains a string, like
+  `ISIC4Classifier.search`.
+- `Level` matches nodes of one or more hierarchy levels.
+- `Within` matches the nodes below (and including) one or more codes.
+
+Every filter evaluates to a bitset over the node ids of an `ISICIndex`, so a
+composite query costs one memoised scan per distinct term plus a few integer
+operations, instead of one full search per condition followed by Python-side
+filtering.
+
+Example:
+    >>> from isic4kit.query import Level, Term, Within
+    >>> query = Level("class") & Within("C") & Term("food") & ~Term("beverage")
+    >>> isic.query(query).results[0].code
+    '1079'
+"""
+
+from __future__ import annotations
+
+
+class Query:
+    """Base class of composable hierarchy queries.
+
+    Subclasses implement `mask`, which returns the bitset of matching node ids
+    of an `ISICIndex` (see `ISICIndex.subtree_mask`).
+    """
+
+    __slots__ = ()
+
+    def mask(self, index) -> int:
+        """Evaluate the query.
+
+        Args:
+            index (ISICIndex): The index to evaluate the query against.
+
+        Returns:
+            int: The bitset of matching node ids.
+        """
+        raise NotImplementedError
+
+    def __and__(self, other: Query) -> Query:
+        if not isinstance(other, Query):
+            return NotImplemented
+        return And(self, other)
+
+    def __or__(self, other: Query) -> Query:
+        if not isinstance(other, Query):
+            return NotImplemented
+        return Or(self, other)
+
+    def __invert__(self) -> Query:
+        return Not(self)
+
+
+class Term(Query):
+    """Nodes whose code or description contains a string.
+
+    Matching is case-insensitive, ignores surrounding whitespace and Arabic
+    diacritics, as in `ISIC4Classifier.search`.
+
+    Attributes:
+        text (str): The normalised search term.
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        from .text import normalize_query
+
+        self.text = normalize_query(text)
+
+    def mask(self, index) -> int:
+        return index.term_mask(self.text)
+
+    def __repr__(self) -> str:
+        return f"Term({self.text!r})"
+
+
+class Level(Query):
+    """Nodes of one or more hierarchy levels.
+
+    Attributes:
+        levels (tuple[str, ...]): The levels ('section', 'division', 'group',
+            'class' or 'subclass').
+    """
+
+    __slots__ = ("levels",)
+
+    def __init__(self, *levels: str):
+        from .index import LEVELS
+
+        unknown = [level for level in levels if level not in LEVELS]
+        if unknown:
+            raise ValueError(
+                f"Unknown level(s): {', '.join(unknown)}. "
+                f"Available levels: {', '.join(LEVELS)}"
+            )
+        self.levels = levels
+
+    def mask(self, index) -> int:
+        mask = 0
+        for level in self.levels:
+            mask |= index.level_mask(level)
+        return mask
+
+    def __repr__(self) -> str:
+        return f"Level({', '.join(map(repr, self.levels))})"
+
+
+class Within(Query):
+    """Nodes in the subtrees of one or more codes, including the nodes themselves.
+
+    Codes of any level are accepted, so ``Within("C")`` scopes a query to a
+    section and ``Within("10", "11")`` to two divisions. Unknown codes match
+    nothing.
+
+    Attributes:
+        codes (tuple[str, ...]): The codes of the subtree roots.
+    """
+
+    __slots__ = ("codes",)
+
+    def __init__(self, *codes: str):
+        self.codes = codes
+
+    def mask(self, index) -> int:
+        mask = 0
+        for code in self.codes:
+            node = index.lookup(code)
+            if node is not None:
+                mask |= index.subtree_mask(node.id)
+        return mask
+
+    def __repr__(self) -> str:
+        return f"Within({', '.join(map(repr, self.codes))})"
+
+
+class And(Query):
+    """Nodes matching all of the given queries."""
+
+    __slots__ = ("queries",)
+
+    def __init__(self, *queries: Query):
+        self.queries = queries
+
+    def mask(self, index) -> int:
+        mask = index.all_mask
+        for query in self.queries:
+            mask &= query.mask(index)
+            if not mask:
+                break
+        return mask
+
+    def __and__(self, other: Query) -> Query:
+        if not isinstance(other, Query):
+            return NotImplemented
+        return And(*self.queries, other)
+
+    def __repr__(self) -> str:
+        return " & ".join(f"({query!r})" for query in self.queries)
+
+
+class Or(Query):
+    """Nodes matching any of the given queries."""
+
+    __slots__ = ("queries",)
+
+    def __init__(self, *queries: Query):
+        self.queries = queries
+
+    def mask(self, index) -> int:
+        mask = 0
+        for query in self.queries:
+            mask |= query.mask(index)
+        return mask
+
+    def __or__(self, other: Query) -> Query:
+        if not isinstance(other, Query):
+            return NotImplemented
+        return Or(*self.queries, other)
+
+    def __repr__(self) -> str:
+        return " | ".join(f"({query!r})" for query in self.queries)
+
+
+class Not(Query):
+    """Nodes not matching the given query."""
+
+    __slots__ = ("query",)
+
+    def __init__(self, query: Query):
+        self.query = query
+
+    def mask(self, index) -> int:
+        return index.all_mask & ~self.query.mask(index)
+
+    def __invert__(self) -> Query:
+        return self.query
+
+    def __repr__(self) -> str:
+        return f"~({self.query!r})"
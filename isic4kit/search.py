@@ -1,4 +1,14 @@
-from .models import ISICHierarchy, ISICSearchResult, ISICSearchResults
+from __future__ import annotations
+
+import zlib
+from typing import TYPE_CHECKING, Iterator
+
+from .index import current_index, ready_index
+from .text import match_spans, normalize, normalize_query
+
+if TYPE_CHECKING:
+    from .models import ISICSearchPage, ISICSearchResult, ISICSearchResults
+    from .query import Query
 
 
 class ISICSearchMixin:
@@ -9,31 +19,51 @@ class ISICSearchMixin:
     The search can be performed on both classification codes and descriptions.
 
     The mixin assumes the implementing class has a `sections` attribute containing
-    the ISIC classification hierarchy.
+    the ISIC classification hierarchy. When the class also builds an `ISICIndex`
+    (see `ISICIndexMixin`), searches use the index once it is ready and fall back
+    to walking `sections` until then. Classifiers with a columnar store
+    (`ISICColumns`) search its string buffer instead. With the 'fts'
+    `search_backend`, searches match words by prefix through an SQLite FTS5
+    index instead (see `isic4kit.fts`).
+
+    If the class has a `search_cache` (see `isic4kit.cache.ISICSearchCache`),
+    `search` and `search_json` results are stored in it, keyed by the
+    normalised query, `language` and `data_version`.
+
+    If the class has `synonyms` (see `isic4kit.synonyms.ISICSynonyms`), queries
+    with synonyms also match the nodes of their expansions, through bitsets
+    compiled into the search index. Those nodes are returned first, followed by
+    the other matches of the query.
     """
 
-    def search(self, query: str) -> ISICSearchResults:
+    def search(self, query: str, spans: bool = False) -> ISICSearchResults:
         """Search ISIC classifications for matching codes or descriptions.
 
         Performs a case-insensitive search across all levels of the ISIC hierarchy
-        (sections, divisions, groups, and classes) looking for matches in either
+        (sections, divisions, groups, classes and subclasses) looking for matches in either
         the code or description fields.
 
         The search is performed by checking if the query string is contained within
         either the code or description of any classification item. The search is
-        case-insensitive and ignores leading/trailing whitespace.
+        case-insensitive, ignores leading/trailing whitespace and ignores Arabic
+        diacritics and tatweel (see `isic4kit.text.normalize`).
 
         Args:
             query: A string to search for within ISIC codes and descriptions.
                   Can be a partial or complete code or description.
+            spans: Also return the positions of the query in the code and
+                  description of every result (``result.spans``), as offsets
+                  into the original strings. Defaults to False.
 
         Returns:
             ISICSearchResults: A container of search results. Each result includes:
-                - type: The hierarchy level ('section', 'division', 'group', or 'class')
+                - type: The hierarchy level ('section', 'division', 'group', 'class'
+                  or 'subclass')
                 - code: The classification code
                 - description: The classification description
                 - hierarchy: An ISICHierarchy object containing the full path information
                 - path: A string representation of the hierarchical path, joined by '/'
+                - spans: The match positions if `spans` is True, None otherwise
 
         Example:
             >>> isic = ISICClassification()
@@ -41,54 +71,354 @@ class ISICSearchMixin:
             >>> print(results.results[0].code)  # First matching result's code
             'A'
         """
-        query = query.lower().strip()
-        results = []
+        from .models import ISICSearchResults
 
-        def add_result(item_type, code, description, hierarchy):
-            results.append(
-                ISICSearchResult(
-                    type=item_type,
-                    code=code,
-                    description=description,
-                    hierarchy=ISICHierarchy(
-                        section=hierarchy[0] if len(hierarchy) > 0 else None,
-                        division=hierarchy[1] if len(hierarchy) > 1 else None,
-                        group=hierarchy[2] if len(hierarchy) > 2 else None,
-                        class_=hierarchy[3] if len(hierarchy) > 3 else None,
-                    ),
-                    path="/".join(hierarchy),
-                )
+        query = normalize_query(query)
+        cache = getattr(self, "search_cache", None)
+        if cache is None:
+            return self._search(query, spans)
+        key = self._search_cache_key(query, spans)
+        data = cache.get(key)
+        if data is not None:
+            return ISICSearchResults.model_validate_json(data)
+        results = self._search(query, spans)
+        cache.put(key, results.model_dump_json().encode())
+        return results
+
+    def _search(self, query: str, spans: bool) -> ISICSearchResults:
+        """Search with the best available backend, for a normalised query."""
+        from .models import ISICSearchResults
+
+        expanded = self._expand(query, spans)
+        if expanded is not None:
+            index, nodes, terms = expanded
+            return index.results(nodes, terms)
+        full_text = self._full_text()
+        if full_text is not None:
+            return full_text.search(query, spans=spans)
+        index = ready_index(self)
+        if index is not None:
+            return index.results(index.match(query), query if spans else None)
+        columns = getattr(self, "columns", None)
+        if columns is not None:
+            return columns.results(columns.match(query), query if spans else None)
+        return ISICSearchResults(
+            results=[result for _, result in self._walk_matches(query, spans)]
+        )
+
+    def _walk_matches(
+        self, query: str, spans: bool = False, start: int = 0
+    ) -> Iterator[tuple[int, ISICSearchResult]]:
+        """Walk `sections` and yield matching results lazily.
+
+        Args:
+            query: A normalised query (see `isic4kit.text.normalize_query`).
+            spans: Compute the match spans of every result.
+            start: Skip nodes before this position in depth-first order.
+
+        Yields:
+            tuple[int, ISICSearchResult]: The depth-first position of every
+                matching node (the same as its `ISICIndex` node id) and its result.
+        """
+        from .models import ISICHierarchy, ISICSearchResult
+
+        position = -1
+
+        def matches(node):
+            nonlocal position
+            position += 1
+            return position >= start and (
+                query in normalize(node.code) or query in normalize(node.description)
+            )
+
+        def result(item_type, node, hierarchy):
+            return position, ISICSearchResult(
+                spans=(
+                    match_spans(query, node.code, node.description) if spans else None
+                ),
+                type=item_type,
+                code=node.code,
+                description=node.description,
+                hierarchy=ISICHierarchy(
+                    section=hierarchy[0] if len(hierarchy) > 0 else None,
+                    division=hierarchy[1] if len(hierarchy) > 1 else None,
+                    group=hierarchy[2] if len(hierarchy) > 2 else None,
+                    class_=hierarchy[3] if len(hierarchy) > 3 else None,
+                    subclass=hierarchy[-1] if len(hierarchy) > 4 else None,
+                ),
+                path="/".join(hierarchy),
             )
 
+        def walk_subclasses(node, hierarchy):
+            for subclass in node.subclasses:
+                subclass_hierarchy = hierarchy + [subclass.code]
+                if matches(subclass):
+                    yield result("subclass", subclass, subclass_hierarchy)
+                yield from walk_subclasses(subclass, subclass_hierarchy)
+
         for section in self.sections:
-            if query in section.code.lower() or query in section.description.lower():
-                add_result("section", section.code, section.description, [section.code])
+            if matches(section):
+                yield result("section", section, [section.code])
 
             for division in section.divisions:
-                if query in division.code or query in division.description.lower():
-                    add_result(
-                        "division",
-                        division.code,
-                        division.description,
-                        [section.code, division.code],
-                    )
+                if matches(division):
+                    yield result("division", division, [section.code, division.code])
 
                 for group in division.groups:
-                    if query in group.code or query in group.description.lower():
-                        add_result(
-                            "group",
-                            group.code,
-                            group.description,
-                            [section.code, division.code, group.code],
+                    if matches(group):
+                        yield result(
+                            "group", group, [section.code, division.code, group.code]
                         )
 
                     for class_ in group.classes:
-                        if query in class_.code or query in class_.description.lower():
-                            add_result(
-                                "class",
-                                class_.code,
-                                class_.description,
-                                [section.code, division.code, group.code, class_.code],
-                            )
-
-        return ISICSearchResults(results=results)
+                        hierarchy = [
+                            section.code,
+                            division.code,
+                            group.code,
+                            class_.code,
+                        ]
+                        if matches(class_):
+                            yield result("class", class_, hierarchy)
+                        yield from walk_subclasses(class_, hierarchy)
+
+    def iter_search(
+        self, query: str, spans: bool = False, cursor: str | None = None
+    ) -> Iterator[ISICSearchResult]:
+        """Search lazily, yielding results one at a time in hierarchy order.
+
+        Results are produced while the hierarchy is scanned, so the first
+        results are available before the whole hierarchy has been searched and
+        stopping early skips the rest of the scan. The order is the same as in
+        `search`.
+
+        Args:
+            query: A string to search for within ISIC codes and descriptions.
+            spans: Include the match positions of every result. Defaults to False.
+            cursor: Resume after the results of a previous page (see
+                `search_page`). Defaults to None.
+
+        Yields:
+            ISICSearchResult: The matching results.
+
+        Raises:
+            ValueError: If the cursor is invalid or belongs to another query.
+        """
+        query = normalize_query(query)
+        start = _decode_cursor(cursor, query) if cursor is not None else 0
+        for _, result in self._iter_matches(query, spans, start):
+            yield result
+
+    def search_page(
+        self,
+        query: str,
+        limit: int = 20,
+        cursor: str | None = None,
+        spans: bool = False,
+    ) -> ISICSearchPage:
+        """Search and return one page of results.
+
+        Pages are cut from the same stable hierarchy order as `search`, and
+        only the nodes up to the first result of the next page are scanned.
+        Concatenating all pages of a query gives the results of `search`.
+
+        Args:
+            query: A string to search for within ISIC codes and descriptions.
+            limit: The maximum number of results of the page. Defaults to 20.
+            cursor: The `next_cursor` of the previous page, or None for the
+                first page. Defaults to None.
+            spans: Include the match positions of every result. Defaults to False.
+
+        Returns:
+            ISICSearchPage: The results of the page and the cursor of the next
+                page (None on the last page).
+
+        Raises:
+            ValueError: If the limit is not positive, or if the cursor is invalid
+                or belongs to another query.
+
+        Example:
+            >>> page = isic.search_page("manufacture", limit=10)
+            >>> next_page = isic.search_page(
+            ...     "manufacture", limit=10, cursor=page.next_cursor
+            ... )
+        """
+        from .models import ISICSearchPage
+
+        if limit < 1:
+            raise ValueError(f"limit must be positive, got {limit}")
+        query = normalize_query(query)
+        start = _decode_cursor(cursor, query) if cursor is not None else 0
+        results = []
+        next_cursor = None
+        for position, result in self._iter_matches(query, spans, start):
+            if len(results) == limit:
+                next_cursor = _encode_cursor(position, query)
+                break
+            results.append(result)
+        return ISICSearchPage(results=results, next_cursor=next_cursor)
+
+    def _iter_matches(
+        self, query: str, spans: bool, start: int
+    ) -> Iterator[tuple[int, ISICSearchResult]]:
+        """Yield ``(position, result)`` of matching nodes from the best backend."""
+        expanded = self._expand(query, spans)
+        if expanded is not None:
+            index, nodes, terms = expanded
+            # Not in hierarchy order, so positions count results instead
+            for position, node in enumerate(nodes[start:], start):
+                yield position, index.result(node.id, terms)
+            return
+        full_text = self._full_text()
+        if full_text is not None:
+            index = full_text.index
+            terms = full_text.terms(query) if spans else None
+            for node_id in full_text.match(query):
+                if node_id >= start:
+                    yield node_id, index.result(node_id, terms)
+            return
+        index = ready_index(self)
+        if index is not None:
+            span_query = query if spans else None
+            for node in index.iter_match(query, start):
+                yield node.id, index.result(node.id, span_query)
+            return
+        columns = getattr(self, "columns", None)
+        if columns is not None:
+            span_query = query if spans else None
+            for node_id in columns.iter_match(query, start):
+                yield node_id, columns.result(node_id, span_query)
+            return
+        yield from self._walk_matches(query, spans, start)
+
+    def search_json(self, query: str, spans: bool = False) -> bytes:
+        """Search and return the results serialized as JSON.
+
+        Once the search index is ready, the payload is assembled from JSON
+        fragments memoised per node, without building or validating any result
+        models. With a `search_cache`, the payload is read from and stored in
+        the cache.
+
+        Args:
+            query: A string to search for within ISIC codes and descriptions.
+            spans: Include the match positions of every result. Results with
+                spans are serialized from the models. Defaults to False.
+
+        Returns:
+            bytes: The same bytes as ``search(query, spans).model_dump_json()``.
+        """
+        query = normalize_query(query)
+        cache = getattr(self, "search_cache", None)
+        if cache is None:
+            return self._search_json(query, spans)
+        key = self._search_cache_key(query, spans)
+        data = cache.get(key)
+        if data is None:
+            data = self._search_json(query, spans)
+            cache.put(key, data)
+        return data
+
+    def _search_json(self, query: str, spans: bool) -> bytes:
+        if not spans:
+            expanded = self._expand(query, spans)
+            if expanded is not None:
+                index, nodes, _ = expanded
+                return index.results_json(nodes)
+            full_text = self._full_text()
+            if full_text is not None:
+                index = full_text.index
+                return index.results_json(
+                    index.nodes[i] for i in full_text.match(query)
+                )
+            index = ready_index(self)
+            if index is not None:
+                return index.results_json(index.match(query))
+        return self._search(query, spans).model_dump_json().encode()
+
+    def _full_text(self):
+        """Return the FTS5 index if the search backend is 'fts', else None."""
+        if getattr(self, "search_backend", "scan") != "fts":
+            return None
+        return self.full_text_index()
+
+    def _expand(self, query: str, spans: bool):
+        """Match a query with synonyms against the index.
+
+        Returns:
+            tuple | None: ``(index, nodes, terms)``, where the nodes match the
+                expansions of the query, followed by the other nodes matching
+                the query with the active backend, and the terms
+                locate the spans (None without spans), or None if the query
+                has no synonyms.
+        """
+        synonyms = getattr(self, "synonyms", None)
+        if synonyms is None or query not in synonyms:
+            return None
+        full_text = self._full_text()
+        if full_text is not None:
+            index = full_text.index
+            mask = 0
+            for node_id in full_text.match(query):
+                mask |= 1 << node_id
+            terms = full_text.terms(query)
+        else:
+            index = current_index(self)
+            mask = index.term_mask(query)
+            terms = (query,)
+        # Short terms such as "it" occur inside many words, so the nodes of the
+        # expansions come first and the remaining raw matches follow
+        expansion = synonyms.mask(index, query)
+        nodes = index.select(expansion) + index.select(mask & ~expansion)
+        if not spans:
+            return index, nodes, None
+        return index, nodes, terms + synonyms.terms(index, query)
+
+    def _search_cache_key(self, query: str, spans: bool) -> str:
+        synonyms = getattr(self, "synonyms", None)
+        # The suffix changes with the JSON of the results, so that entries
+        # written by older versions are not served
+        return self.search_cache.key(
+            "search:2",
+            self.language,
+            self.data_version,
+            getattr(self, "search_backend", "scan"),
+            "" if synonyms is None else synonyms.version,
+            int(spans),
+            query,
+        )
+
+    def query(self, query: Query) -> ISICSearchResults:
+        """Evaluate a composable query over the hierarchy.
+
+        Queries combine term, level and subtree filters with ``&``, ``|`` and
+        ``~`` (see `isic4kit.query`) and are evaluated as bitset operations over
+        the search index. If the index is still being built, this waits for it.
+
+        Args:
+            query (Query): The query to evaluate.
+
+        Returns:
+            ISICSearchResults: The matching nodes, in hierarchy order.
+
+        Example:
+            >>> from isic4kit.query import Level, Term, Within
+            >>> results = isic.query(
+            ...     Level("class") & Within("C") & Term("food") & ~Term("beverage")
+            ... )
+        """
+        index = current_index(self)
+        return index.results(index.select(query.mask(index)))
+
+
+def _encode_cursor(position: int, query: str) -> str:
+    return f"{position}.{zlib.crc32(query.encode('utf-8')):08x}"
+
+
+def _decode_cursor(cursor: str, query: str) -> int:
+    position = cursor.partition(".")[0]
+    if (
+        not position.isdigit()
+        or not position.isascii()
+        or _encode_cursor(int(position), query) != cursor
+    ):
+        raise ValueError(f"Invalid cursor for query {query!r}: {cursor!r}")
+    return int(position)
@@ -0,0 +1,383 @@
+"""Semantic (embedding) search over ISIC4 descriptions.
+
+Keyword search only finds descriptions containing the query text. Semantic
+search instead encodes every node description and every query as a vector and
+ranks nodes by cosine similarity, so a good encoder matches "car dealer" with
+"Sale of motor vehicles".
+
+Encoders are pluggable: any object with an ``encode(texts)`` method returning
+an array of shape ``(len(texts), dim)`` can be used, for example a
+``sentence_transformers.SentenceTransformer`` running on the CPU. Its ``name``
+attribute (if any) identifies cached embeddings. The default `HashingEncoder`
+needs nothing but NumPy and works offline, but only captures word and
+character n-gram overlap.
+
+Node embeddings are computed once per data set and encoder, normalised and
+stored as a ``.npy`` float32 matrix in the cache directory (see
+`isic4kit.sources.get_cache_dir`). Later runs memory-map the file instead of
+encoding again. Queries are answered with one matrix product and a partial
+sort, and many queries can be answered in a single batch.
+
+Semantic search requires NumPy (``pip install isic4kit[semantic]``).
+
+Example:
+    >>> isic = ISIC4Classifier()
+    >>> isic.semantic_search("car dealer", k=3).print_tree()
+    >>> isic.semantic_search_many(["car dealer", "bakery"], k=5)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import zlib
+from typing import TYPE_CHECKING
+
+from .index import current_index
+
+if TYPE_CHECKING:
+    from .index import ISICIndex, ISICNode
+    from .models import ISICSearchResults
+
+EMBEDDINGS_FORMAT = 1
+_WORD = re.compile(r"\w+")
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "Semantic search requires numpy: pip install isic4kit[semantic]"
+        ) from None
+    return numpy
+
+
+class HashingEncoder:
+    """Dependency-free text encoder based on feature hashing.
+
+    Every text is split into words; each word and each character n-gram of the
+    word (padded with ``<`` and ``>``) is hashed into one of ``dim`` signed
+    buckets. The resulting vectors are L2-normalised. Character n-grams make
+    the encoder robust to inflection and work for any script, but it does not
+    know about synonyms; plug in a trained encoder for that.
+
+    Attributes:
+        dim (int): Dimension of the embeddings.
+        ngram (int): Length of the character n-grams.
+        name (str): Identifier of the encoder configuration, used as part of
+            the embeddings cache key.
+    """
+
+    def __init__(self, dim: int = 512, ngram: int = 3):
+        """Initialize the encoder.
+
+        Args:
+            dim (int, optional): Dimension of the embeddings. Defaults to 512.
+            ngram (int, optional): Length of the character n-grams. Defaults to 3.
+        """
+        self.dim = dim
+        self.ngram = ngram
+        self.name = f"hashing-{dim}-{ngram}"
+
+    def _features(self, text: str) -> dict:
+        features = {}
+        n = self.ngram
+        for word in _WORD.findall(text.lower()):
+            features[f"w:{word}"] = features.get(f"w:{word}", 0.0) + 1.0
+            padded = f"<{word}>"
+            grams = [padded[i : i + n] for i in range(max(1, len(padded) - n + 1))]
+            weight = 1.0 / len(grams)
+            for gram in grams:
+                features[gram] = features.get(gram, 0.0) + weight
+        return features
+
+    def encode(self, texts: list[str]):
+        """Encode texts into normalised float32 vectors.
+
+        Args:
+            texts (list[str]): The texts to encode.
+
+        Returns:
+            numpy.ndarray: A ``(len(texts), dim)`` float32 matrix.
+        """
+        np = _numpy()
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text).items():
+                h = zlib.crc32(feature.encode("utf-8"))
+                matrix[row, h % self.dim] += weight if h & 0x80000000 else -weight
+        return _normalize(matrix)
+
+
+def _normalize(matrix):
+    np = _numpy()
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[np.newaxis, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _encoder_name(encoder) -> str | None:
+    """Return the ``name`` of an encoder, or None if it has none.
+
+    Unnamed encoders cannot be told apart from other instances of their class
+    (e.g. two models of different dimensions), so their embeddings are never
+    cached on disk.
+    """
+    name = getattr(encoder, "name", None)
+    if not isinstance(name, str) or not name:
+        return None
+    return name
+
+
+def _encoder_dim(encoder) -> int | None:
+    """Return the embedding dimension an encoder declares, if any."""
+    dim = getattr(encoder, "dim", None)
+    if dim is None:
+        get_dimension = getattr(encoder, "get_sentence_embedding_dimension", None)
+        if get_dimension is not None:
+            dim = get_dimension()
+    return dim if isinstance(dim, int) else None
+
+
+class ISICSemanticIndex:
+    """Cosine-similarity index over the node descriptions of an `ISICIndex`.
+
+    Row ``i`` of `matrix` is the normalised embedding of node ``i`` of the
+    index. The matrix is read-only and may be a memory-mapped file, so it is
+    shared between threads and, after a fork, between processes.
+
+    Attributes:
+        index (ISICIndex): The index whose nodes are embedded.
+        encoder: The encoder used for node descriptions and queries.
+        matrix (numpy.ndarray): The ``(len(index), dim)`` float32 embeddings.
+        path (Path | None): The cached embeddings file, or None if the
+            embeddings are only held in memory.
+    """
+
+    def __init__(self, index: ISICIndex, encoder=None, use_cache: bool = True):
+        """Embed the nodes of an index, or load their cached embeddings.
+
+        Args:
+            index (ISICIndex): The index to embed.
+            encoder (optional): The encoder. Defaults to a `HashingEncoder`.
+            use_cache (bool, optional): Read and write the embeddings in the
+                cache directory. Encoders without a ``name`` are never cached
+                on disk. Defaults to True.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If the encoder returns a matrix of the wrong shape.
+        """
+        from .sources import get_cache_dir
+
+        np = _numpy()
+        self.index = index
+        self.encoder = encoder if encoder is not None else HashingEncoder()
+        texts = [node.description for node in index.nodes]
+
+        name = _encoder_name(self.encoder)
+        use_cache = use_cache and name is not None
+        self.path = None
+        matrix = None
+        if use_cache:
+            dim = _encoder_dim(self.encoder)
+            digest = hashlib.sha256(f"{EMBEDDINGS_FORMAT}:{name}:{dim}:".encode())
+            digest.update("\x00".join(texts).encode("utf-8"))
+            self.path = get_cache_dir() / "embeddings" / f"{digest.hexdigest()}.npy"
+            try:
+                matrix = np.load(self.path, mmap_mode="r")
+            except (OSError, ValueError):
+                matrix = None
+            if matrix is not None and (
+                matrix.ndim != 2
+                or matrix.shape[0] != len(texts)
+                or (dim is not None and matrix.shape[1] != dim)
+                or matrix.dtype != np.float32
+            ):
+                matrix = None
+
+        if matrix is None:
+            matrix = _normalize(self.encoder.encode(texts))
+            if matrix.shape[0] != len(texts):
+                raise ValueError(
+                    f"Encoder returned {matrix.shape[0]} embeddings "
+                    f"for {len(texts)} texts"
+                )
+            stored = self._store(matrix) if use_cache else None
+            if stored is None:
+                self.path = None
+                matrix.flags.writeable = False
+            else:
+                matrix = stored
+        self.matrix = matrix
+
+    def _store(self, matrix):
+        np = _numpy()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.stem}.{os.getpid()}.tmp.npy")
+            np.save(tmp_path, matrix)
+            os.replace(tmp_path, self.path)
+            return np.load(self.path, mmap_mode="r")
+        except OSError:
+            return None
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def top_k(self, queries: list[str], k: int = 10):
+        """Rank nodes for a batch of queries.
+
+        Args:
+            queries (list[str]): The queries.
+            k (int, optional): Number of nodes per query. Defaults to 10.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: Node ids and cosine similarities,
+                both of shape ``(len(queries), min(k, len(index)))``, sorted by
+                decreasing similarity.
+        """
+        np = _numpy()
+        k = max(0, min(k, len(self)))
+        if not queries or k == 0:
+            return (
+                np.empty((len(queries), 0), dtype=np.intp),
+                np.empty((len(queries), 0), dtype=np.float32),
+            )
+        vectors = _normalize(self.encoder.encode(list(queries)))
+        if vectors.shape[1] != self.matrix.shape[1]:
+            raise ValueError(
+                f"Encoder returned {vectors.shape[1]}-dimensional query embeddings "
+                f"for a {self.matrix.shape[1]}-dimensional index"
+            )
+        scores = vectors @ self.matrix.T
+        if k < scores.shape[1]:
+            ids = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            ids = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        top = np.take_along_axis(scores, ids, axis=1)
+        order = np.argsort(-top, axis=1, kind="stable")
+        return (
+            np.take_along_axis(ids, order, axis=1),
+            np.take_along_axis(top, order, axis=1),
+        )
+
+    def search(self, query: str, k: int = 10) -> list[tuple[ISICNode, float]]:
+        """Rank nodes for one query.
+
+        Args:
+            query (str): The query.
+            k (int, optional): Number of nodes. Defaults to 10.
+
+        Returns:
+            list[tuple[ISICNode, float]]: Nodes and cosine similarities, most
+                similar first.
+        """
+        return self.search_many([query], k)[0]
+
+    def search_many(
+        self, queries: list[str], k: int = 10
+    ) -> list[list[tuple[ISICNode, float]]]:
+        """Rank nodes for a batch of queries with a single matrix product.
+
+        Args:
+            queries (list[str]): The queries.
+            k (int, optional): Number of nodes per query. Defaults to 10.
+
+        Returns:
+            list[list[tuple[ISICNode, float]]]: For every query, nodes and cosine
+                similarities, most similar first.
+        """
+        ids, scores = self.top_k(queries, k)
+        nodes = self.index.nodes
+        return [
+            [(nodes[i], float(s)) for i, s in zip(row_ids.tolist(), row_scores)]
+            for row_ids, row_scores in zip(ids, scores)
+        ]
+
+
+class ISICSemanticMixin:
+    """Mixin class providing semantic search over a classifier's index.
+
+    Semantic indexes are created on first use, one per encoder, and rebuilt
+    when the classifier's index changes.
+    """
+
+    _semantic_indexes = None
+
+    def semantic_index(self, encoder=None) -> ISICSemanticIndex:
+        """Return the semantic index for an encoder, building it on first use.
+
+        Args:
+            encoder (optional): The encoder. Defaults to a `HashingEncoder`.
+
+        Returns:
+            ISICSemanticIndex: The semantic index of the current data.
+        """
+        index = current_index(self)
+        # Unnamed encoders are keyed by identity; the cached semantic index
+        # holds a reference to the encoder, so its id is not reused meanwhile
+        key = None
+        if encoder is not None:
+            key = _encoder_name(encoder) or ("id", id(encoder))
+        if self._semantic_indexes is None:
+            self._semantic_indexes = {}
+        semantic = self._semantic_indexes.get(key)
+        if semantic is None or semantic.index is not index:
+            semantic = ISICSemanticIndex(index, encoder)
+            self._semantic_indexes[key] = semantic
+        return semantic
+
+    def semantic_search(
+        self, query: str, k: int = 10, encoder=None
+    ) -> ISICSearchResults:
+        """Find the nodes whose descriptions are most similar to a query.
+
+        Args:
+            query (str): The query.
+            k (int, optional): Number of results. Defaults to 10.
+            encoder (optional): The encoder. Defaults to a `HashingEncoder`.
+
+        Returns:
+            ISICSearchResults: The most similar nodes, most similar first. Every
+                result carries its cosine similarity as `score`.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        return self.semantic_search_many([query], k, encoder)[0]
+
+    def semantic_search_many(
+        self, queries: list[str], k: int = 10, encoder=None
+    ) -> list[ISICSearchResults]:
+        """Answer a batch of semantic queries with a single matrix product.
+
+        Args:
+            queries (list[str]): The queries.
+            k (int, optional): Number of results per query. Defaults to 10.
+            encoder (optional): The encoder. Defaults to a `HashingEncoder`.
+
+        Returns:
+            list[ISICSearchResults]: The results of every query, in order. Every
+                result carries its cosine similarity as `score`, e.g. to drop
+                results below a threshold.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        semantic = self.semantic_index(encoder)
+        ids, scores = semantic.top_k(list(queries), k)
+        index = semantic.index
+        nodes = index.nodes
+        batch = []
+        for row_ids, row_scores in zip(ids, scores):
+            results = index.results(nodes[i] for i in row_ids.tolist())
+            for result, score in zip(results.results, row_scores.tolist()):
+                result.score = score
+            batch.append(results)
+        return batch
@@ -0,0 +1,282 @@
+"""Local HTTP service for ISIC4 lookups and search.
+
+Start the service with ``python -m isic4kit serve`` and query it from any
+language:
+
+    GET  /health
+    GET  /section/{code}?lang=en      (also /division, /group, /class, /subclass)
+    GET  /search?q=mining&lang=en     (add &spans=1 for match positions)
+    POST /batch?lang=en               {"requests": [{"type": "class", "code": "0111"},
+                                                    {"type": "search", "query": "mining"}]}
+
+Connections are kept alive (HTTP/1.1), and serialized responses for lookups
+and searches are cached so hot codes are answered without serializing again.
+Batch responses are assembled from the same cached fragments.
+"""
+
+import json
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+LEVELS = ("section", "division", "group", "class", "subclass")
+NOT_FOUND = b"null"
+
+
+class ISICService:
+    """Serializes lookups and searches for one or more languages.
+
+    Serialized responses are kept in LRU caches, so repeated requests for the
+    same code or query return the cached bytes.
+
+    Attributes:
+        classifiers (dict[str, ISIC4Classifier]): Classifiers keyed by language.
+        default_language (str): Language used when a request does not name one.
+    """
+
+    def __init__(self, classifiers: dict, cache_size: int = 4096):
+        """Initialize the service.
+
+        Args:
+            classifiers (dict[str, ISIC4Classifier]): Classifiers keyed by
+                language. The first one is the default language.
+            cache_size (int, optional): Maximum number of cached lookup and
+                search responses each. Defaults to 4096.
+        """
+        if not classifiers:
+            raise ValueError("At least one classifier is required")
+        self.classifiers = dict(classifiers)
+        self.default_language = next(iter(self.classifiers))
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+        self.search = lru_cache(maxsize=cache_size)(self._search)
+
+    def classifier(self, language: str | None):
+        """Return the classifier for a language.
+
+        Raises:
+            KeyError: If the language is not served.
+        """
+        return self.classifiers[language or self.default_language]
+
+    def _lookup(self, language: str, level: str, code: str) -> bytes:
+        return self.classifier(language).get_json(level, code) or NOT_FOUND
+
+    def _search(self, language: str, query: str, spans: bool = False) -> bytes:
+        return self.classifier(language).search_json(query, spans)
+
+    def batch(self, language: str, requests: list) -> bytes:
+        """Answer a batch of lookups and searches.
+
+        Args:
+            language (str): Language of the batch.
+            requests (list[dict]): Requests of the form
+                ``{"type": <level>, "code": ...}`` or
+                ``{"type": "search", "query": ..., "spans": false}``.
+
+        Returns:
+            bytes: ``{"responses": [...]}`` with one response per request, in
+                order. Lookups of unknown codes produce ``null``.
+
+        Raises:
+            ValueError: If a request is malformed.
+        """
+        parts = []
+        for i, request in enumerate(requests):
+            if not isinstance(request, dict):
+                raise ValueError(f"requests[{i}] must be an object")
+            kind = request.get("type")
+            if kind == "search":
+                query = request.get("query")
+                if not isinstance(query, str):
+                    raise ValueError(f"requests[{i}] needs a string 'query'")
+                parts.append(self.search(language, query, bool(request.get("spans"))))
+            elif kind in LEVELS:
+                code = request.get("code")
+                if not isinstance(code, str):
+                    raise ValueError(f"requests[{i}] needs a string 'code'")
+                parts.append(self.lookup(language, kind, code))
+            else:
+                raise ValueError(f"requests[{i}] has unknown type {kind!r}")
+        return b'{"responses":[' + b",".join(parts) + b"]}"
+
+    def health(self) -> bytes:
+        return json.dumps(
+            {
+                "status": "ok",
+                "languages": list(self.classifiers),
+                "data_version": {
+                    language: getattr(classifier, "data_version", None)
+                    for language, classifier in self.classifiers.items()
+                },
+            }
+        ).encode()
+
+
+class ISICRequestHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 request handler answering from an `ISICService`."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "isic4kit"
+    # Buffer headers and body into a single write and send it immediately, so
+    # keep-alive clients are not delayed by Nagle's algorithm.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    max_body_size = 8 * 1024 * 1024
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        language = params.get("lang", [None])[0]
+        parts = [unquote(p) for p in url.path.strip("/").split("/")]
+        service = self.server.service
+
+        try:
+            if parts == ["health"]:
+                return self._send(HTTPStatus.OK, service.health())
+            if parts == ["search"]:
+                query = params.get("q", [None])[0]
+                if query is None:
+                    return self._error(HTTPStatus.BAD_REQUEST, "missing 'q' parameter")
+                spans = params.get("spans", ["0"])[0].lower() in ("1", "true", "yes")
+                return self._send(HTTPStatus.OK, service.search(language, query, spans))
+            if len(parts) == 2 and parts[0] in LEVELS:
+                body = service.lookup(language, parts[0], parts[1])
+                if body == NOT_FOUND:
+                    return self._error(
+                        HTTPStatus.NOT_FOUND, f"{parts[0]} '{parts[1]}' not found"
+                    )
+                return self._send(HTTPStatus.OK, body)
+        except KeyError:
+            return self._error(
+                HTTPStatus.BAD_REQUEST, f"language {language!r} not served"
+            )
+        return self._error(HTTPStatus.NOT_FOUND, f"unknown path '{url.path}'")
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path.rstrip("/") != "/batch":
+            self._discard_body()
+            return self._error(HTTPStatus.NOT_FOUND, f"unknown path '{url.path}'")
+
+        try:
+            length = self._content_length()
+        except ValueError:
+            # The end of the body is unknown, so the connection cannot be reused
+            self.close_connection = True
+            return self._error(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+        if length is None:
+            self.close_connection = True
+            return self._error(HTTPStatus.LENGTH_REQUIRED, "missing Content-Length")
+        if length > self.max_body_size:
+            self.close_connection = True
+            return self._error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "body too large")
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._error(HTTPStatus.BAD_REQUEST, "invalid JSON body")
+        if isinstance(payload, list):
+            payload = {"requests": payload}
+        if not isinstance(payload, dict) or not isinstance(
+            payload.get("requests"), list
+        ):
+            return self._error(HTTPStatus.BAD_REQUEST, "expected a 'requests' list")
+
+        language = payload.get("lang") or parse_qs(url.query).get("lang", [None])[0]
+        try:
+            body = self.server.service.batch(language, payload["requests"])
+        except KeyError:
+            return self._error(
+                HTTPStatus.BAD_REQUEST, f"language {language!r} not served"
+            )
+        except ValueError as e:
+            return self._error(HTTPStatus.BAD_REQUEST, str(e))
+        self._send(HTTPStatus.OK, body)
+
+    def _content_length(self) -> int | None:
+        """Return the Content-Length of the request, or None if it is missing.
+
+        Raises:
+            ValueError: If the header is not a non-negative integer.
+        """
+        value = self.headers.get("Content-Length")
+        if value is None:
+            return None
+        value = value.strip()
+        if not value.isdigit() or not value.isascii():
+            raise ValueError(f"invalid Content-Length {value!r}")
+        return int(value)
+
+    def _discard_body(self):
+        try:
+            length = self._content_length()
+        except ValueError:
+            length = None
+        if length is None or length > self.max_body_size:
+            self.close_connection = True
+        elif length:
+            self.rfile.read(length)
+
+    def _send(self, status: HTTPStatus, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: HTTPStatus, message: str):
+        self._send(status, json.dumps({"error": message}).encode())
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ISICServer(ThreadingHTTPServer):
+    """Threaded HTTP server exposing an `ISICService`.
+
+    Attributes:
+        service (ISICService): The service answering requests.
+        verbose (bool): Log every request to stderr.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, service: ISICService, verbose: bool = False):
+        super().__init__(address, ISICRequestHandler)
+        self.service = service
+        self.verbose = verbose
+
+
+def create_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    languages: list[str] | None = None,
+    source=None,
+    cache_size: int = 4096,
+    verbose: bool = False,
+) -> ISICServer:
+    """Load classifiers and create a server bound to ``host:port``.
+
+    Args:
+        host (str, optional): Interface to bind. Defaults to "127.0.0.1".
+        port (int, optional): Port to bind; 0 picks a free port. Defaults to 8000.
+        languages (list[str] | None, optional): Languages to serve; the first is
+            the default. Defaults to ["en"].
+        source (str | os.PathLike, optional): External data source passed to
+            every classifier. Defaults to None.
+        cache_size (int, optional): Cached responses per kind. Defaults to 4096.
+        verbose (bool, optional): Log every request. Defaults to False.
+
+    Returns:
+        ISICServer: The server, ready for ``serve_forever()``.
+    """
+    from .isic4 import ISIC4Classifier
+
+    classifiers = {
+        language: ISIC4Classifier(language=language, source=source)
+        for language in languages or ["en"]
+    }
+    for classifier in classifiers.values():
+        classifier.wait_ready()
+    return ISICServer((host, port), ISICService(classifiers, cache_size), verbose)
@@ -0,0 +1,373 @@
+"""Custom and extended ISIC data sources.
+
+This module reads ISIC hierarchies from external JSON or CSV files, validates
+them once and compiles them into the nested structure used by the bundled
+``data/{language}.json`` files. Compiled hierarchies are cached on disk, keyed
+by the hash of the input files, so later startups skip parsing and validation.
+
+Supported inputs:
+
+- Nested JSON in the bundled format (``{"sections": [...]}``). Classes may
+  carry ``"subclasses"`` entries (``{"subclass": ..., "description": ...}``),
+  which may nest further.
+- Flat JSON, either a list of records or ``{"records": [...]}``, where each
+  record has ``code``, ``description`` and an optional ``parent``.
+- CSV with a header row containing ``code``, ``description`` and an optional
+  ``parent`` column.
+- A directory containing ``{language}.json`` or ``{language}.csv``.
+
+The level of every record follows from its code: a letter is a section, two
+digits a division, three a group, four a class and five or more digits a
+national sub-class. Divisions without an explicit parent belong to the
+preceding section. Groups, classes and sub-classes are attached to the longest
+existing prefix of their code. A source that contains no sections extends the
+bundled hierarchy of the requested language.
+"""
+
+import csv
+import hashlib
+import json
+import marshal
+import os
+from pathlib import Path
+
+COMPILED_FORMAT = 1
+BUNDLED_DATA_DIR = Path(__file__).parent / "data"
+SOURCE_SUFFIXES = (".json", ".csv")
+CHILDREN = {
+    "section": "divisions",
+    "division": "groups",
+    "group": "classes",
+    "class": "subclasses",
+    "subclass": "subclasses",
+}
+
+
+def get_cache_dir() -> Path:
+    """Return the directory used for on-disk caches.
+
+    The location is taken from the ``ISIC4KIT_CACHE_DIR`` environment variable,
+    then ``$XDG_CACHE_HOME/isic4kit``, then ``~/.cache/isic4kit``.
+
+    Returns:
+        Path: The cache directory. It is not created by this function.
+    """
+    cache_dir = os.environ.get("ISIC4KIT_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "isic4kit"
+
+
+def level_of(code: str) -> str | None:
+    """Return the hierarchy level implied by a code.
+
+    Args:
+        code (str): An ISIC code.
+
+    Returns:
+        str | None: 'section', 'division', 'group', 'class' or 'subclass', or
+            None if the code does not follow the ISIC code format.
+    """
+    if len(code) == 1 and code.isalpha():
+        return "section"
+    if not code.isdigit() or len(code) < 2:
+        return None
+    return {2: "division", 3: "group", 4: "class"}.get(len(code), "subclass")
+
+
+def resolve_source(source, language: str) -> Path:
+    """Resolve a file or directory source to the file to load.
+
+    Args:
+        source (str | os.PathLike): A JSON/CSV file, or a directory containing
+            ``{language}.json`` or ``{language}.csv``.
+        language (str): The language used to pick a file from a directory.
+
+    Returns:
+        Path: The data file.
+
+    Raises:
+        ValueError: If the source does not exist, has an unsupported file type
+            or the directory has no file for the language.
+    """
+    path = Path(source)
+    if path.is_dir():
+        for suffix in SOURCE_SUFFIXES:
+            candidate = path / f"{language}{suffix}"
+            if candidate.is_file():
+                return candidate
+        available = sorted(
+            {p.stem for p in path.iterdir() if p.suffix.lower() in SOURCE_SUFFIXES}
+        )
+        raise ValueError(
+            f"Language '{language}' is not available in '{path}'. "
+            f"Available languages: {', '.join(available)}"
+        )
+    if not path.is_file():
+        raise ValueError(f"Data source '{path}' does not exist")
+    if path.suffix.lower() not in SOURCE_SUFFIXES:
+        raise ValueError(
+            f"Unsupported data source '{path}': expected a .json or .csv file"
+        )
+    return path
+
+
+def flatten(data: dict, origin: str = "<data>") -> list[tuple]:
+    """Flatten a nested hierarchy into ``(code, description, parent, where)`` records.
+
+    Args:
+        data (dict): A hierarchy in the bundled nested format.
+        origin (str, optional): Name used in error messages. Defaults to "<data>".
+
+    Returns:
+        list[tuple]: Records in depth-first order with explicit parents.
+
+    Raises:
+        ValueError: If a node is missing its code or description.
+    """
+    records = []
+
+    def add(node, key, parent, where):
+        if not isinstance(node, dict) or key not in node or "description" not in node:
+            raise ValueError(
+                f"{where}: expected an object with '{key}' and 'description'"
+            )
+        records.append((node[key], node["description"], parent, where))
+        return node[key]
+
+    for i, section in enumerate(data.get("sections", [])):
+        where = f"{origin}: sections[{i}]"
+        section_code = add(section, "section", None, where)
+        for j, division in enumerate(section.get("divisions", [])):
+            where_division = f"{where}.divisions[{j}]"
+            division_code = add(division, "division", section_code, where_division)
+            for k, group in enumerate(division.get("groups", [])):
+                where_group = f"{where_division}.groups[{k}]"
+                group_code = add(group, "group", division_code, where_group)
+                for m, class_ in enumerate(group.get("classes", [])):
+                    where_class = f"{where_group}.classes[{m}]"
+                    class_code = add(class_, "class", group_code, where_class)
+                    _flatten_subclasses(class_, class_code, where_class, add)
+    return records
+
+
+def _flatten_subclasses(node, parent, where, add):
+    for i, subclass in enumerate(node.get("subclasses", [])):
+        where_subclass = f"{where}.subclasses[{i}]"
+        code = add(subclass, "subclass", parent, where_subclass)
+        _flatten_subclasses(subclass, code, where_subclass, add)
+
+
+def read_records(path: Path) -> list[tuple]:
+    """Read the records of a JSON or CSV data file.
+
+    Args:
+        path (Path): The data file.
+
+    Returns:
+        list[tuple]: ``(code, description, parent, where)`` records in file order.
+
+    Raises:
+        ValueError: If the file cannot be parsed or lacks required fields.
+    """
+    if path.suffix.lower() == ".csv":
+        return _read_csv(path)
+
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{path}: invalid JSON: {e}") from e
+
+    if isinstance(data, dict) and "sections" in data:
+        return flatten(data, str(path))
+    if isinstance(data, dict) and "records" in data:
+        data = data["records"]
+    if not isinstance(data, list):
+        raise ValueError(
+            f"{path}: expected a 'sections' hierarchy or a list of records"
+        )
+
+    records = []
+    for i, record in enumerate(data):
+        where = f"{path}: records[{i}]"
+        if not isinstance(record, dict) or "code" not in record:
+            raise ValueError(
+                f"{where}: expected an object with 'code' and 'description'"
+            )
+        records.append(
+            (record["code"], record.get("description"), record.get("parent"), where)
+        )
+    return records
+
+
+def _read_csv(path: Path) -> list[tuple]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        fields = {name.strip().lower(): name for name in reader.fieldnames or []}
+        missing = [name for name in ("code", "description") if name not in fields]
+        if missing:
+            raise ValueError(f"{path}: missing CSV column(s): {', '.join(missing)}")
+        code_key, description_key = fields["code"], fields["description"]
+        parent_key = fields.get("parent")
+
+        records = []
+        for row in reader:
+            parent = row.get(parent_key) if parent_key else None
+            records.append(
+                (
+                    (row[code_key] or "").strip(),
+                    (row[description_key] or "").strip(),
+                    (parent.strip() or None) if parent else None,
+                    f"{path}:{reader.line_num}",
+                )
+            )
+    return records
+
+
+def compile_records(records: list[tuple]) -> dict:
+    """Validate flat records and compile them into the nested bundled format.
+
+    Args:
+        records (list[tuple]): ``(code, description, parent, where)`` records.
+
+    Returns:
+        dict: The hierarchy as ``{"sections": [...]}``, with sub-classes under
+            ``"subclasses"`` keys of classes and other sub-classes.
+
+    Raises:
+        ValueError: If a code is malformed or duplicated, a description is
+            missing, or a node has no valid parent.
+    """
+    nodes = {}
+    levels = {}
+    parents = {}
+    current_section = None
+
+    for code, description, parent, where in records:
+        if not isinstance(code, str) or not code:
+            raise ValueError(f"{where}: missing code")
+        if not isinstance(description, str) or not description:
+            raise ValueError(f"{where}: missing description for code '{code}'")
+        level = level_of(code)
+        if level is None:
+            raise ValueError(f"{where}: invalid ISIC code '{code}'")
+        key = _key(code)
+        if key in nodes:
+            raise ValueError(f"{where}: duplicate code '{code}'")
+
+        if level == "section":
+            current_section = code
+        elif level == "division" and not parent:
+            parent = current_section
+
+        nodes[key] = {level: code, "description": description, CHILDREN[level]: []}
+        levels[key] = level
+        parents[key] = parent
+
+    sections = []
+    for code, _, _, where in records:
+        key = _key(code)
+        level = levels[key]
+        if level == "section":
+            sections.append(nodes[key])
+            continue
+        parent_key = _parent_key(code, level, parents[key], levels, where)
+        nodes[parent_key][CHILDREN[levels[parent_key]]].append(nodes[key])
+
+    return {"sections": sections}
+
+
+def _key(code: str) -> str:
+    return code.lower() if len(code) == 1 else code
+
+
+def _parent_key(code, level, parent, levels, where):
+    expected_level = {
+        "division": ("section",),
+        "group": ("division",),
+        "class": ("group",),
+        "subclass": ("class", "subclass"),
+    }[level]
+
+    if parent:
+        parent_key = _key(parent)
+        if parent_key not in levels:
+            raise ValueError(f"{where}: parent '{parent}' of '{code}' does not exist")
+        if level != "division" and not code.startswith(parent):
+            raise ValueError(
+                f"{where}: code '{code}' does not start with parent '{parent}'"
+            )
+    elif level == "division":
+        raise ValueError(f"{where}: division '{code}' has no section")
+    else:
+        lengths = (
+            range(len(code) - 1, 3, -1) if level == "subclass" else (len(code) - 1,)
+        )
+        parent_key = next((code[:n] for n in lengths if code[:n] in levels), None)
+        if parent_key is None:
+            raise ValueError(f"{where}: no parent found for code '{code}'")
+
+    if levels[parent_key] not in expected_level:
+        raise ValueError(
+            f"{where}: '{code}' cannot be placed under {levels[parent_key]} '{parent_key}'"
+        )
+    return parent_key
+
+
+def load_source(source, language: str, use_cache: bool = True) -> tuple[dict, str]:
+    """Load, validate and compile an external data source.
+
+    Args:
+        source (str | os.PathLike): A JSON/CSV file or a directory of them.
+        language (str): The language of the data. Picks the file from a
+            directory, and the bundled hierarchy extended by sources that
+            contain no sections.
+        use_cache (bool, optional): Read and write compiled hierarchies in the
+            cache directory. Defaults to True.
+
+    Returns:
+        tuple[dict, str]: The compiled hierarchy in the bundled nested format,
+            and a data version derived from the hash of the input files.
+
+    Raises:
+        ValueError: If the source cannot be resolved, parsed or validated.
+    """
+    path = resolve_source(source, language)
+    bundled_path = BUNDLED_DATA_DIR / f"{language}.json"
+
+    digest = hashlib.sha256(f"{COMPILED_FORMAT}:{marshal.version}:".encode())
+    digest.update(path.read_bytes())
+    if bundled_path.is_file():
+        digest.update(b"\x00")
+        digest.update(bundled_path.read_bytes())
+    version = digest.hexdigest()
+
+    cache_path = get_cache_dir() / "compiled" / f"{version}.marshal"
+    if use_cache:
+        try:
+            return marshal.loads(cache_path.read_bytes()), version
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+    records = read_records(path)
+    if not any(level_of(str(record[0])) == "section" for record in records):
+        if not bundled_path.is_file():
+            raise ValueError(
+                f"{path}: contains no sections and there is no bundled "
+                f"'{language}' hierarchy to extend"
+            )
+        with open(bundled_path, "r", encoding="utf-8") as f:
+            records = flatten(json.load(f), str(bundled_path)) + records
+    data = compile_records(records)
+
+    if use_cache:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(marshal.dumps(data))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    return data, version
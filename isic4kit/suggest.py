@@ -0,0 +1,278 @@
+"""Suggestions of valid codes for invalid or obsolete ones.
+
+Data cleansing regularly meets codes that do not exist: typos such as
+"0119x" or "0191", or codes of an older revision such as "0120". `suggest`
+ranks valid alternatives from three precomputed neighbourhoods:
+
+- ``typo``: codes one edit away (a character inserted, deleted, replaced or
+  two adjacent characters swapped), found through a deletion index: every
+  code is stored under each of its one-character deletions, so the candidates
+  of an input are a handful of dictionary lookups instead of a comparison with
+  every code;
+- ``ancestor``: the longest valid prefix of the input, e.g. group "012" for
+  "0120";
+- ``sibling``: the children of that ancestor, which share the longest valid
+  prefix with the input.
+
+Candidates sharing a longer prefix with the input rank first within each
+neighbourhood, typos of the same length as the input rank above other typos,
+and typos rank above ancestors and siblings with the same prefix.
+
+Example:
+    >>> isic = ISIC4Classifier()
+    >>> [s.code for s in isic.suggest("0119x")]
+    ['0119']
+    >>> [(s.code, s.reason) for s in isic.suggest("0120", limit=3)]
+    [('0121', 'typo'), ('0122', 'typo'), ('0123', 'typo')]
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from .index import LEVELS, current_index
+
+if TYPE_CHECKING:
+    from .index import ISICIndex
+    from .models import ISICSuggestion
+
+CACHE_SIZE = 65536
+_SEPARATORS = str.maketrans("", "", " .-_/")
+
+
+def normalize_code(code: str) -> str:
+    """Normalise a code for suggestions.
+
+    Removes whitespace, dots, dashes, underscores and slashes and lower-cases
+    letters, so ``" 01.19 "`` becomes ``"0119"`` and ``"A"`` becomes ``"a"``.
+
+    Args:
+        code (str): The code.
+
+    Returns:
+        str: The normalised code.
+    """
+    return code.translate(_SEPARATORS).lower()
+
+
+def _common_prefix(a: str, b: str) -> int:
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+class ISICSuggestIndex:
+    """Code neighbourhoods of an `ISICIndex`, precomputed for suggestions.
+
+    The index is read-only once built and can be shared between threads.
+
+    Attributes:
+        index (ISICIndex): The hierarchy.
+        codes (tuple[str, ...]): The normalised code of every node.
+        keys (dict[str, int]): Node ids keyed by normalised code.
+        deletions (dict[str, tuple[tuple[int, int], ...]]): ``(node id,
+            position)`` pairs keyed by every one-character deletion of the
+            normalised codes, where position is that of the deleted character.
+    """
+
+    def __init__(self, index: ISICIndex):
+        """Build the neighbourhoods of a hierarchy.
+
+        Args:
+            index (ISICIndex): The hierarchy.
+        """
+        self.index = index
+        self.codes = tuple(normalize_code(node.code) for node in index.nodes)
+        keys = {}
+        deletions = {}
+        for node_id, key in enumerate(self.codes):
+            keys.setdefault(key, node_id)
+            for position in range(len(key)):
+                deletion = key[:position] + key[position + 1 :]
+                deletions.setdefault(deletion, []).append((node_id, position))
+        self.keys = keys
+        self.deletions = {key: tuple(pairs) for key, pairs in deletions.items()}
+
+    def suggest(
+        self, code: str, limit: int = 5, item_type: str | None = None
+    ) -> list[tuple[int, str, float]]:
+        """Rank valid codes for a code.
+
+        Args:
+            code (str): The code.
+            limit (int, optional): The maximum number of suggestions. Defaults
+                to 5.
+            item_type (str | None, optional): Only suggest codes of this level.
+                Defaults to None (any level).
+
+        Returns:
+            list[tuple[int, str, float]]: ``(node id, reason, score)`` triples,
+                best first. A valid code is its own single suggestion, with
+                reason 'exact'.
+
+        Raises:
+            ValueError: If the level is unknown or the limit is negative.
+        """
+        if limit < 0:
+            raise ValueError(f"limit must not be negative, got {limit}")
+        if item_type is not None and item_type not in LEVELS:
+            raise ValueError(
+                f"Unknown level '{item_type}'. Available levels: {', '.join(LEVELS)}"
+            )
+        key = normalize_code(code)
+        if not key or not limit:
+            return []
+        nodes = self.index.nodes
+        codes = self.codes
+        keys = self.keys
+        node_id = keys.get(key)
+        if node_id is not None and item_type in (None, nodes[node_id].type):
+            return [(node_id, "exact", 1.0)]
+
+        scores = {}
+
+        def add(node_id, reason, score):
+            if item_type is not None and nodes[node_id].type != item_type:
+                return
+            if score > scores.get(node_id, (None, -1.0))[1]:
+                scores[node_id] = (reason, score)
+
+        def prefix(node_id):
+            other = codes[node_id]
+            return _common_prefix(key, other) / max(len(key), len(other))
+
+        # Typos, found without comparing strings: a code equal to a deletion
+        # of the input has one character less, a code with the input as a
+        # deletion one character more, and a code sharing the deletion of the
+        # same position differs by one character (or by a swap of adjacent
+        # characters if the deleted positions are neighbours).
+        def typo(node_id):
+            same_length = len(codes[node_id]) == len(key)
+            add(node_id, "typo", 0.5 + 0.45 * prefix(node_id) + 0.05 * same_length)
+
+        deletions = self.deletions
+        for node_id, _ in deletions.get(key, ()):
+            typo(node_id)
+        for i in range(len(key)):
+            deletion = key[:i] + key[i + 1 :]
+            node_id = keys.get(deletion)
+            if node_id is not None:
+                typo(node_id)
+            for node_id, j in deletions.get(deletion, ()):
+                if j == i or (j - i in (-1, 1) and codes[node_id][j] == key[i]):
+                    if codes[node_id] != key:
+                        typo(node_id)
+
+        # The nearest valid ancestor and its children
+        for end in range(len(key) - 1, 0, -1):
+            ancestor = keys.get(key[:end])
+            if ancestor is not None:
+                add(ancestor, "ancestor", 0.5 * prefix(ancestor))
+                for child in self.index.children[ancestor]:
+                    add(child, "sibling", 0.1 + 0.4 * prefix(child))
+                break
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1][1], item[0]))
+        return [(node_id, reason, score) for node_id, (reason, score) in ranked][:limit]
+
+
+class ISICSuggestMixin:
+    """Mixin class suggesting valid codes for invalid ones.
+
+    The neighbourhoods are built from the search index on first use, and
+    rebuilt when the classifier's index changes.
+    """
+
+    _suggest_index = None
+
+    def suggest_index(self) -> ISICSuggestIndex:
+        """Return the suggestion neighbourhoods of the current data.
+
+        Returns:
+            ISICSuggestIndex: The neighbourhoods.
+        """
+        index = current_index(self)
+        suggest_index = self._suggest_index
+        if suggest_index is None or suggest_index.index is not index:
+            suggest_index = ISICSuggestIndex(index)
+            self._suggest_index = suggest_index
+        return suggest_index
+
+    def suggest(
+        self, code: str, limit: int = 5, item_type: str | None = None
+    ) -> list[ISICSuggestion]:
+        """Suggest valid codes for a mistyped or obsolete code.
+
+        Args:
+            code (str): The code, e.g. "0119x" or "0120".
+            limit (int, optional): The maximum number of suggestions. Defaults
+                to 5.
+            item_type (str | None, optional): Only suggest codes of this level.
+                Defaults to None (any level).
+
+        Returns:
+            list[ISICSuggestion]: The suggestions, best first; empty if there
+                is no close code. A valid code returns itself with reason
+                'exact'.
+
+        Raises:
+            ValueError: If the level is unknown or the limit is negative.
+
+        Example:
+            >>> isic.suggest("0120", limit=3)
+        """
+        from .models import ISICSuggestion
+
+        suggest_index = self.suggest_index()
+        nodes = suggest_index.index.nodes
+        return [
+            ISICSuggestion(
+                input=code,
+                type=nodes[node_id].type,
+                code=nodes[node_id].code,
+                description=nodes[node_id].description,
+                reason=reason,
+                score=score,
+            )
+            for node_id, reason, score in suggest_index.suggest(code, limit, item_type)
+        ]
+
+    def suggest_many(
+        self, codes: Iterable[str], limit: int = 5, item_type: str | None = None
+    ) -> Iterator[tuple[str, tuple[str, ...]]]:
+        """Suggest valid codes for a stream of codes in one pass.
+
+        Codes are processed lazily, and the suggestions of repeated codes are
+        computed once (up to `CACHE_SIZE` distinct codes are remembered).
+
+        Args:
+            codes (Iterable[str]): The codes, e.g. a column of a data set.
+            limit (int, optional): The maximum number of suggestions per code.
+                Defaults to 5.
+            item_type (str | None, optional): Only suggest codes of this level.
+                Defaults to None (any level).
+
+        Yields:
+            tuple[str, tuple[str, ...]]: Every input code and its suggested
+                codes, best first.
+
+        Raises:
+            ValueError: If the level is unknown or the limit is negative.
+        """
+        suggest_index = self.suggest_index()
+        nodes = suggest_index.index.nodes
+        seen = {}
+        for code in codes:
+            suggestions = seen.get(code)
+            if suggestions is None:
+                suggestions = tuple(
+                    nodes[node_id].code
+                    for node_id, _, _ in suggest_index.suggest(code, limit, item_type)
+                )
+                if len(seen) >= CACHE_SIZE:
+                    seen.clear()
+                seen[code] = suggestions
+            yield code, suggestions
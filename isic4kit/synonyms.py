@@ -0,0 +1,244 @@
+"""Synonym and keyword expansion of search queries.
+
+ISIC4 descriptions are terse and formal, while users search with everyday
+terms: "IT", "restaurant" or "trucking" rather than "Computer programming,
+consultancy and related activities". A synonym table maps such terms to
+expansions, each of which is either a code of the hierarchy (the node and its
+whole subtree match) or a search term (matched like `ISIC4Classifier.search`).
+
+Tables are JSON objects mapping a term to a list of expansions:
+
+.. code-block:: json
+
+    {"trucking": ["freight transport by road", "4923"]}
+
+Bundled tables for ``en`` and ``ar`` live in ``data/synonyms/{language}.json``
+and can be extended with a user file or mapping. Terms are matched against the
+whole normalised query (see `isic4kit.text.normalize_query`). The nodes of the
+expansions are returned ahead of the other nodes containing the query, so a
+short term like "it", which occurs inside many words, still lists its
+expansions first.
+
+The table is compiled against an `ISICIndex` on first use: the expansions of
+every term are combined into one bitset of node ids, so an expanded query costs
+one dictionary lookup and one memoised term scan, instead of one search per
+expansion.
+
+Example:
+    >>> isic = ISIC4Classifier(synonyms=True)
+    >>> [result.code for result in isic.search("trucking").results]
+    ['4923']
+    >>> isic = ISIC4Classifier(synonyms="my-synonyms.json")  # bundled + file
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Mapping
+
+from .text import normalize_query
+
+if TYPE_CHECKING:
+    from .index import ISICIndex
+
+SYNONYMS_DIR = Path(__file__).parent / "data" / "synonyms"
+
+
+def read_synonyms(path: str | os.PathLike) -> dict[str, list[str]]:
+    """Read a synonym table from a JSON file.
+
+    Args:
+        path (str | os.PathLike): The file, a JSON object mapping terms to a
+            list of expansions (or a single expansion).
+
+    Returns:
+        dict[str, list[str]]: The table.
+
+    Raises:
+        ValueError: If the file cannot be read or is not a valid table.
+    """
+    import json
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read synonyms '{path}': {e}") from None
+    return _validate(data, str(path))
+
+
+def _validate(data, origin: str) -> dict[str, list[str]]:
+    if not isinstance(data, Mapping):
+        raise ValueError(f"Invalid synonyms in {origin}: expected a JSON object")
+    table = {}
+    for term, expansions in data.items():
+        if isinstance(expansions, str):
+            expansions = [expansions]
+        if (
+            not isinstance(term, str)
+            or not isinstance(expansions, (list, tuple))
+            or not all(isinstance(expansion, str) for expansion in expansions)
+        ):
+            raise ValueError(
+                f"Invalid synonyms for {term!r} in {origin}: "
+                "expected a list of strings"
+            )
+        table[term] = list(expansions)
+    return table
+
+
+class ISICSynonyms:
+    """Synonym table compiled into bitsets over an `ISICIndex`.
+
+    Instances are immutable once created, apart from the compiled bitsets,
+    which are replaced whenever the table is used with another index.
+
+    Attributes:
+        table (dict[str, tuple[str, ...]]): Expansions keyed by normalised term.
+        version (str): Hash of the table, part of search cache keys.
+    """
+
+    def __init__(self, table: Mapping[str, Iterable[str]] | None = None):
+        """Initialize the synonyms.
+
+        Args:
+            table (Mapping[str, Iterable[str]] | None, optional): Expansions
+                keyed by term. Terms are normalised; the expansions of terms
+                that normalise to the same key are merged. Defaults to None.
+        """
+        import json
+
+        merged = {}
+        for term, expansions in (table or {}).items():
+            key = normalize_query(term)
+            if not key:
+                continue
+            values = merged.setdefault(key, [])
+            for expansion in expansions:
+                expansion = expansion.strip()
+                if expansion and expansion not in values:
+                    values.append(expansion)
+        self.table = {key: tuple(values) for key, values in merged.items()}
+        self.version = hashlib.sha256(
+            json.dumps(self.table, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+        self._compiled = (None, {})
+
+    @classmethod
+    def load(cls, language: str, extra=None) -> ISICSynonyms:
+        """Load the bundled synonyms of a language, extended by a user table.
+
+        Args:
+            language (str): The language. Languages without a bundled table
+                start from an empty one.
+            extra (str | os.PathLike | Mapping | None, optional): A JSON file or
+                mapping whose expansions are added to the bundled ones.
+                Defaults to None.
+
+        Returns:
+            ISICSynonyms: The synonyms.
+
+        Raises:
+            ValueError: If a table is invalid.
+        """
+        tables = []
+        bundled = SYNONYMS_DIR / f"{language}.json"
+        if bundled.is_file():
+            tables.append(read_synonyms(bundled))
+        if isinstance(extra, Mapping):
+            tables.append(_validate(extra, "<mapping>"))
+        elif extra is not None:
+            tables.append(read_synonyms(extra))
+        merged = {}
+        for table in tables:
+            for term, expansions in table.items():
+                merged.setdefault(term, []).extend(expansions)
+        return cls(merged)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __contains__(self, query: str) -> bool:
+        return query in self.table
+
+    def get(self, query: str) -> tuple[str, ...]:
+        """Return the expansions of a normalised query (empty if unknown)."""
+        return self.table.get(query, ())
+
+    def compile(self, index: ISICIndex) -> dict[str, int]:
+        """Compile every term into the bitset of the nodes its expansions match.
+
+        Expansions that are codes of the index add the subtree of the code;
+        other expansions add the nodes containing them, like `ISICIndex.match`.
+
+        Args:
+            index (ISICIndex): The index.
+
+        Returns:
+            dict[str, int]: Bitsets keyed by normalised term.
+        """
+        compiled_index, masks = self._compiled
+        if compiled_index is index:
+            return masks
+        masks = {}
+        for term, expansions in self.table.items():
+            mask = 0
+            for expansion in expansions:
+                node = index.lookup(expansion)
+                if node is not None:
+                    mask |= index.subtree_mask(node.id)
+                else:
+                    mask |= index.term_mask(normalize_query(expansion))
+            masks[term] = mask
+        self._compiled = (index, masks)
+        return masks
+
+    def mask(self, index: ISICIndex, query: str) -> int:
+        """Return the bitset of the nodes matching the expansions of a query.
+
+        Args:
+            index (ISICIndex): The index.
+            query (str): A normalised query.
+
+        Returns:
+            int: The bitset, 0 if the query has no synonyms.
+        """
+        return self.compile(index).get(query, 0)
+
+    def terms(self, index: ISICIndex, query: str) -> tuple[str, ...]:
+        """Return the normalised search terms among the expansions of a query.
+
+        Used to locate the spans of expanded results; code expansions have no
+        spans.
+        """
+        return tuple(
+            normalize_query(expansion)
+            for expansion in self.get(query)
+            if index.lookup(expansion) is None
+        )
+
+
+def open_synonyms(synonyms, language: str) -> ISICSynonyms | None:
+    """Resolve the ``synonyms`` argument of `ISIC4Classifier`.
+
+    Args:
+        synonyms: None or False for no expansion, True for the bundled table of
+            the language, a JSON file or mapping extending the bundled table,
+            or an `ISICSynonyms`.
+        language (str): The language of the classifier.
+
+    Returns:
+        ISICSynonyms | None: The synonyms, or None.
+
+    Raises:
+        ValueError: If a table is invalid.
+    """
+    if synonyms is None or synonyms is False:
+        return None
+    if synonyms is True:
+        return ISICSynonyms.load(language)
+    if isinstance(synonyms, ISICSynonyms):
+        return synonyms
+    return ISICSynonyms.load(language, synonyms)
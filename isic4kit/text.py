@@ -0,0 +1,138 @@
+"""Text normalisation for search, with offsets back to the original text.
+
+Codes, descriptions and queries are compared in a normalised form: lower-cased,
+with Arabic diacritics (harakat, tanwin, shadda, sukun, superscript alef) and
+tatweel removed, so "زراعة" also matches "زِراعة". Because normalisation can
+shorten (or, for a few characters, lengthen) a string, match positions found
+in normalised text are mapped back to the original text with an offset map.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+_IGNORED = dict.fromkeys([*range(0x064B, 0x0660), 0x0670, 0x0640])
+
+
+def normalize(text: str) -> str:
+    """Normalise text for matching.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        str: The lower-cased text without Arabic diacritics and tatweel.
+    """
+    return text.lower().translate(_IGNORED)
+
+
+def normalize_query(query: str) -> str:
+    """Normalise a search query: strip surrounding whitespace, then `normalize`."""
+    return normalize(query.strip())
+
+
+def offset_map(text: str) -> array | None:
+    """Map positions in ``normalize(text)`` to positions in ``text``.
+
+    Args:
+        text (str): The original text.
+
+    Returns:
+        array | None: ``offsets[i]`` is the position in ``text`` of normalised
+            character ``i``, and ``offsets[len(normalized)]`` is ``len(text)``.
+            None if normalisation keeps every position unchanged.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text) and len(lowered.translate(_IGNORED)) == len(text):
+        return None
+    offsets = array("I")
+    for i, char in enumerate(text):
+        for lowered_char in char.lower():
+            if ord(lowered_char) not in _IGNORED:
+                offsets.append(i)
+    offsets.append(len(text))
+    return offsets
+
+
+def find_spans(needle: str, haystack: str) -> list[tuple[int, int]]:
+    """Find the non-overlapping occurrences of a string.
+
+    Args:
+        needle (str): The string to find. An empty needle has no spans.
+        haystack (str): The string to search.
+
+    Returns:
+        list[tuple[int, int]]: ``(start, end)`` of every occurrence.
+    """
+    spans = []
+    if not needle:
+        return spans
+    size = len(needle)
+    start = haystack.find(needle)
+    while start >= 0:
+        spans.append((start, start + size))
+        start = haystack.find(needle, start + size)
+    return spans
+
+
+def find_term_spans(terms, haystack: str) -> list[tuple[int, int]]:
+    """Find the occurrences of several strings, merging overlapping spans.
+
+    Args:
+        terms (Iterable[str]): The strings to find.
+        haystack (str): The string to search.
+
+    Returns:
+        list[tuple[int, int]]: Sorted, non-overlapping ``(start, end)`` spans.
+    """
+    spans = sorted(span for term in terms for span in find_spans(term, haystack))
+    merged = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def map_spans(spans: list[tuple[int, int]], offsets: array | None) -> list:
+    """Convert spans in normalised text to spans in the original text.
+
+    A span ends where the next kept character starts, so diacritics attached
+    to the last matched letter are included. Spans never end inside a character
+    whose lower case is longer than one character.
+
+    Args:
+        spans (list[tuple[int, int]]): Spans in the normalised text.
+        offsets (array | None): The offset map from `offset_map`.
+
+    Returns:
+        list[tuple[int, int]]: Spans in the original text.
+    """
+    if offsets is None:
+        return spans
+    return [
+        (offsets[start], max(offsets[end], offsets[end - 1] + 1))
+        for start, end in spans
+    ]
+
+
+def match_spans(query: str, code: str, description: str) -> dict:
+    """Compute the match spans of a normalised query in a code and description.
+
+    Args:
+        query (str): A normalised query (see `normalize_query`).
+        code (str): The original code.
+        description (str): The original description.
+
+    Returns:
+        dict: ``{"code": [...], "description": [...]}`` with ``(start, end)``
+            spans in the original strings.
+    """
+    return {
+        "code": map_spans(find_spans(query, normalize(code)), offset_map(code)),
+        "description": map_spans(
+            find_spans(query, normalize(description)), offset_map(description)
+        ),
+    }
@@ -1,9 +1,30 @@
+from __future__ import annotations
+
+import sys
+from typing import IO, Iterable, Iterator
+
+from .index import LEVELS
+
+CHILD_ATTRIBUTES = ("divisions", "groups", "classes", "subclasses", "children")
+
+_MODEL_LEVELS = {
+    "ISICSection": "section",
+    "ISICDivision": "division",
+    "ISICGroup": "group",
+    "ISICClass": "class",
+    "ISICSubclass": "subclass",
+}
+_CHILD_ATTRIBUTES = {}
+_MISSING = object()
+
+
 class Tree:
     """Handles hierarchical tree visualization of ISIC4 nodes.
 
     This class provides methods to display and format hierarchical relationships
-    between ISIC4 nodes (Sections, Divisions, Groups, and Classes) using ASCII
-    branch lines for visual clarity.
+    between ISIC4 nodes (Sections, Divisions, Groups, Classes and Subclasses) using ASCII
+    branch lines for visual clarity. Besides the models, any node exposing `code`,
+    `description` and `children` can be printed, such as the views of `ISICColumns`.
 
     Attributes:
         None
@@ -11,6 +32,9 @@ class Tree:
     Methods:
         print(node, prefix="", is_last=True): Displays a hierarchical tree visualization
             of ISIC4 nodes.
+        group(results): Groups search results into a forest by hierarchy path.
+        lines(nodes, prefix=""): Renders a forest of nodes line by line.
+        write(nodes, stream, prefix=""): Writes a forest of nodes to a stream.
 
     Example:
         >>> section = Section("A", "Agriculture")
@@ -20,8 +44,255 @@ class Tree:
                 └── 011: Growing of non-perennial crops
     """
 
+    BOLD = ("\033[1m", "\033[0m")
+
+    @staticmethod
+    def mark(text: str, spans, highlight: tuple[str, str]) -> str:
+        """Insert highlight markers around spans of a text.
+
+        Args:
+            text: The text to highlight.
+            spans: Sorted, non-overlapping (start, end) offsets into `text`.
+            highlight: The markers inserted before and after every span.
+
+        Returns:
+            str: The highlighted text.
+        """
+        before, after = highlight
+        parts = []
+        last = 0
+        for start, end in spans:
+            parts.extend((text[last:start], before, text[start:end], after))
+            last = end
+        parts.append(text[last:])
+        return "".join(parts)
+
+    @staticmethod
+    def label(node, highlight: tuple[str, str] | None = None) -> str:
+        """Format the "code: description" label of a node.
+
+        Args:
+            node: An ISIC4 node or search result. Nodes with a `total`, such as
+                `ISICTotalNode`, are labelled with it.
+            highlight: Markers placed around the match spans of a search result
+                (see `ISICSearchResult.spans`). Defaults to None (no highlighting).
+
+        Returns:
+            str: The label.
+        """
+        code, description = node.code, node.description
+        spans = getattr(node, "spans", None)
+        if highlight and spans is not None:
+            code = Tree.mark(code, spans.code, highlight)
+            description = Tree.mark(description, spans.description, highlight)
+        label = code if description is None else f"{code}: {description}"
+        total = getattr(node, "total", None)
+        if total is not None:
+            label = f"{label} ({total:,})"
+        return label
+
+    @staticmethod
+    def group(results: Iterable) -> list[ISICResultGroup]:
+        """Group search results into a forest following their hierarchy paths.
+
+        Every result is attached to the group of its path in one pass, using a
+        table of the groups created so far, so grouping is linear in the number
+        of results. Ancestors that are not results themselves (e.g. the section
+        of a matching class) get a group without a result. Groups keep the
+        order in which their paths first appear.
+
+        Args:
+            results: Search results (`ISICSearchResult`).
+
+        Returns:
+            list[ISICResultGroup]: The section-level groups.
+        """
+        roots = []
+        groups = {}
+
+        def group_of(path):
+            group = groups.get(path)
+            if group is None:
+                parent, _, code = path.rpartition("/")
+                group = ISICResultGroup(code, LEVELS[min(path.count("/"), 4)])
+                groups[path] = group
+                siblings = group_of(parent).children if parent else roots
+                siblings.append(group)
+            return group
+
+        for result in results:
+            group_of(result.path).result = result
+        return roots
+
+    @staticmethod
+    def children(node):
+        """Return the children of a node.
+
+        The attribute holding the children ('divisions', 'groups', 'classes',
+        'subclasses' or 'children') is looked up once per node type.
+
+        Args:
+            node: An ISIC4 node.
+
+        Returns:
+            Sequence: The child nodes.
+        """
+        attribute = _CHILD_ATTRIBUTES.get(type(node), _MISSING)
+        if attribute is _MISSING:
+            attribute = next(
+                (name for name in CHILD_ATTRIBUTES if hasattr(node, name)), None
+            )
+            _CHILD_ATTRIBUTES[type(node)] = attribute
+        return () if attribute is None else getattr(node, attribute)
+
     @staticmethod
-    def print(node, prefix: str = "", is_last: bool = True) -> None:
+    def level(node) -> str | None:
+        """Return the hierarchy level of a node, or None if it is unknown.
+
+        Args:
+            node: An ISIC4 node, search result or view with a `type`.
+
+        Returns:
+            str | None: 'section', 'division', 'group', 'class' or 'subclass'.
+        """
+        level = _MODEL_LEVELS.get(type(node).__name__)
+        return level if level is not None else getattr(node, "type", None)
+
+    @staticmethod
+    def lines(
+        nodes,
+        prefix: str = "",
+        highlight: tuple[str, str] | None = None,
+        max_depth: int | None = None,
+        levels=None,
+        is_last: bool = True,
+    ) -> Iterator[str]:
+        """Render a forest of nodes line by line.
+
+        The forest is traversed depth-first with an explicit stack, so deep
+        hierarchies do not recurse, and the prefix of every level is built once
+        and shared by all the children of a node.
+
+        Args:
+            nodes: The root nodes.
+            prefix: String prefix of every line. Defaults to "".
+            highlight: Markers placed around the match spans of search results,
+                e.g. `Tree.BOLD`. Defaults to None (no highlighting).
+            max_depth: The deepest level of shown nodes to render, counting the
+                roots as depth 0. Defaults to None (no limit).
+            levels: Only show nodes of these levels. The shown descendants of a
+                hidden node take its place. Nodes of unknown level are always
+                shown. Defaults to None (all levels).
+            is_last: Whether the last root is drawn as the last node of its
+                level. Defaults to True.
+
+        Yields:
+            str: The lines, each ending with a newline.
+
+        Raises:
+            ValueError: If a level is unknown or max_depth is negative.
+        """
+        if levels is not None:
+            levels = frozenset(levels)
+            unknown = levels.difference(LEVELS)
+            if unknown:
+                raise ValueError(
+                    f"Unknown level(s): {', '.join(sorted(unknown))}. "
+                    f"Available levels: {', '.join(LEVELS)}"
+                )
+        if max_depth is not None and max_depth < 0:
+            raise ValueError(f"max_depth must not be negative, got {max_depth}")
+
+        def shown(nodes):
+            if levels is None:
+                return nodes
+            result = []
+            pending = list(reversed(nodes))
+            while pending:
+                node = pending.pop()
+                level = Tree.level(node)
+                if level is None or level in levels:
+                    result.append(node)
+                else:
+                    pending.extend(reversed(Tree.children(node)))
+            return result
+
+        label = Tree.label
+        children_of = Tree.children
+        roots = shown(nodes)
+        last = len(roots) - 1
+        stack = [
+            (roots[i], prefix, is_last and i == last, 0) for i in range(last, -1, -1)
+        ]
+        while stack:
+            node, node_prefix, node_is_last, depth = stack.pop()
+            branch = "└── " if node_is_last else "├── "
+            yield f"{node_prefix}{branch}{label(node, highlight)}\n"
+            if max_depth is not None and depth >= max_depth:
+                continue
+            children = shown(children_of(node))
+            if children:
+                child_prefix = node_prefix + ("    " if node_is_last else "│   ")
+                last = len(children) - 1
+                depth += 1
+                stack.extend(
+                    (children[i], child_prefix, i == last, depth)
+                    for i in range(last, -1, -1)
+                )
+
+    @staticmethod
+    def write(
+        nodes,
+        stream: IO[str],
+        prefix: str = "",
+        highlight: tuple[str, str] | None = None,
+        max_depth: int | None = None,
+        levels=None,
+        is_last: bool = True,
+    ) -> None:
+        """Write a forest of nodes to a text stream.
+
+        Nodes are rendered by `Tree.lines` and written in batches, so large
+        forests render in time linear in their size.
+
+        Args:
+            nodes: The root nodes. Besides the models, any node exposing `code`,
+                `description` and `children` can be written, such as
+                `ISICResultGroup`.
+            stream: The text stream to write to.
+            prefix: String prefix of every line. Defaults to "".
+            highlight: Markers placed around the match spans of search results,
+                e.g. `Tree.BOLD`. Defaults to None (no highlighting).
+            max_depth: The deepest level of nodes to render, counting the roots
+                as depth 0. Defaults to None (no limit).
+            levels: Only show nodes of these levels. Defaults to None (all levels).
+            is_last: Whether the last root is drawn as the last node of its
+                level. Defaults to True.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If a level is unknown or max_depth is negative.
+        """
+        batch = []
+        for line in Tree.lines(nodes, prefix, highlight, max_depth, levels, is_last):
+            batch.append(line)
+            if len(batch) >= 1024:
+                stream.write("".join(batch))
+                batch.clear()
+        stream.write("".join(batch))
+
+    @staticmethod
+    def print(
+        node,
+        prefix: str = "",
+        is_last: bool = True,
+        highlight: tuple[str, str] | None = None,
+        max_depth: int | None = None,
+        levels=None,
+        file: IO[str] | None = None,
+    ) -> None:
         """Display a hierarchical tree visualization of ISIC4 nodes.
 
         Prints a tree structure showing the hierarchical relationship between
@@ -36,29 +307,74 @@ class Tree:
                 Defaults to an empty string.
             is_last: Indicates if the current node is the last child in its level.
                 Affects the branch line style. Defaults to True.
+            highlight: Markers placed around the match spans of search results,
+                e.g. `Tree.BOLD`. Defaults to None (no highlighting).
+            max_depth: The number of levels to show below the node. Defaults to
+                None (no limit).
+            levels: Only show nodes of these levels, e.g. ``("division", "class")``.
+                Defaults to None (all levels).
+            file: The stream to write to. Defaults to None (standard output).
 
         Returns:
             None
 
+        Raises:
+            ValueError: If a level is unknown or max_depth is negative.
+
         Example:
             >>> division = Division("01", "Crop and animal production")
             >>> Tree.print(division)
             └── 01: Crop and animal production
                 └── 011: Growing of non-perennial crops
+            >>> Tree.print(section, levels=("section", "division"))
         """
-        branch = "└── " if is_last else "├── "
-        print(f"{prefix}{branch}{node.code}: {node.description}")
-
-        child_prefix = prefix + ("    " if is_last else "│   ")
-
-        children = []
-        if hasattr(node, "divisions"):
-            children = node.divisions
-        elif hasattr(node, "groups"):
-            children = node.groups
-        elif hasattr(node, "classes"):
-            children = node.classes
-
-        for i, child in enumerate(children):
-            is_last_child = i == len(children) - 1
-            Tree.print(child, child_prefix, is_last_child)
+        Tree.write(
+            (node,),
+            file or sys.stdout,
+            prefix,
+            highlight,
+            max_depth,
+            levels,
+            is_last,
+        )
+
+
+class ISICResultGroup:
+    """A node of the forest built by `Tree.group` from search results.
+
+    Attributes:
+        code (str): The code of the node.
+        type (str): The hierarchy level of the node.
+        result (ISICSearchResult | None): The search result of the node, or None
+            if the node is only an ancestor of results.
+        children (list[ISICResultGroup]): The child groups.
+    """
+
+    __slots__ = ("code", "type", "result", "children")
+
+    def __init__(self, code: str, type: str):
+        self.code = code
+        self.type = type
+        self.result = None
+        self.children = []
+
+    @property
+    def description(self) -> str | None:
+        """The description of the node, if it is a search result."""
+        return None if self.result is None else self.result.description
+
+    @property
+    def spans(self):
+        """The match spans of the node's search result, if any."""
+        return None if self.result is None else self.result.spans
+
+    def __iter__(self):
+        """Iterate over the group and its descendants in depth-first order."""
+        stack = [self]
+        while stack:
+            group = stack.pop()
+            yield group
+            stack.extend(reversed(group.children))
+
+    def __repr__(self) -> str:
+        return f"ISICResultGroup({self.code!r}, children={len(self.children)})"
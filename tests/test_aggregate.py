@@ -0,0 +1,87 @@
+import io
+
+import pytest
+
+from isic4kit import ISIC4Classifier
+from isic4kit.aggregate import aggregate
+
+
+@pytest.fixture(scope="module")
+def isic():
+    return ISIC4Classifier(background_index=False)
+
+
+def test_counts_roll_up_through_all_levels(isic):
+    codes = ["0111", "0111", "0520", "2824", "05", " 0520 ", "9999"]
+    totals = isic.aggregate(codes)
+    assert totals["0111"] == 2
+    assert totals["011"] == totals["01"] == totals["A"] == 2
+    assert totals["0520"] == 2
+    assert totals["05"] == totals["B"] == 3
+    assert totals["C"] == 1
+    assert totals["0112"] == 0
+    assert totals.total == 6
+    assert totals.unmatched == {"9999": 1}
+    assert totals.get("9999") is None
+    with pytest.raises(KeyError):
+        totals["9999"]
+    assert totals.level("division") == {"01": 2, "05": 3, "28": 1}
+    assert len(totals.level("section", zeros=True)) == len(isic.sections)
+    with pytest.raises(ValueError):
+        totals.level("sector")
+
+
+def test_totals_match_naive_accumulation(isic):
+    index = isic.index
+    codes = [node.code for node in index.nodes if node.type == "class"]
+    weights = [float(i % 7) for i in range(len(codes))]
+    totals = aggregate(index, codes, weights)
+    for node in index.nodes:
+        expected = sum(
+            weight
+            for code, weight in zip(codes, weights)
+            if index.lookup(code).path.startswith(node.path + "/")
+            or index.lookup(code).path == node.path
+        )
+        assert totals.totals[node.id] == pytest.approx(expected)
+
+
+def test_weights_must_match_codes(isic):
+    assert isic.aggregate(["0111", "0520"], weights=[1.5, 2])["A"] == 1.5
+    with pytest.raises(ValueError):
+        isic.aggregate(["0111", "0520"], weights=[1])
+    with pytest.raises(ValueError):
+        isic.aggregate(["0111"], weights=[1, 2])
+
+
+def test_numpy_codes(isic):
+    np = pytest.importorskip("numpy")
+    totals = isic.aggregate(np.array(["0111", "0520", "0111"]), np.array([1, 2, 3]))
+    assert totals.level("section") == {"a": 4.0, "b": 2.0}
+
+
+def test_print_tree_renders_totals(isic):
+    output = io.StringIO()
+    isic.aggregate(["0520", "0520", "0510"]).print_tree(file=output)
+    assert output.getvalue().splitlines() == [
+        "└── b: Mining and quarrying (3)",
+        "    └── 05: Mining of coal and lignite (3)",
+        "        ├── 051: Mining of hard coal (1)",
+        "        │   └── 0510: Mining of hard coal (anthracite) (1)",
+        "        └── 052: Mining of lignite (2)",
+        "            └── 0520: Mining of lignite (2)",
+    ]
+
+
+def test_tree_keeps_ancestors_of_signed_totals(isic):
+    totals = isic.aggregate(["0111", "0112"], weights=[1, -1])
+    assert totals["011"] == totals["A"] == 0
+    (section,) = totals.tree()
+    (division,) = section.children
+    (group,) = division.children
+    assert (section.code, division.code, group.code) == ("a", "01", "011")
+    assert [(c.code, c.total) for c in group.children] == [
+        ("0111", 1.0),
+        ("0112", -1.0),
+    ]
+    totals.print_tree(file=io.StringIO())
@@ -0,0 +1,75 @@
+import pytest
+
+from isic4kit import ISIC4Classifier
+from isic4kit.arrow import HIERARCHY_COLUMNS, hierarchy_table, join
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ISIC4KIT_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture(scope="module")
+def isic():
+    return ISIC4Classifier(background_index=False)
+
+
+def test_table_flattens_the_hierarchy(isic):
+    table = hierarchy_table(isic.index)
+    assert table.column_names == list(HIERARCHY_COLUMNS)
+    assert table.num_rows == len(isic.index)
+    rows = table.to_pylist()
+    for node, row in zip(isic.index.nodes, rows):
+        assert row["id"] == node.id
+        assert row["code"] == node.code
+        assert row["type"] == node.type
+        assert row["path"] == node.path
+        assert row["parent"] == (None if node.parent < 0 else node.parent)
+    assert rows[isic.index.lookup("0111").id]["division"] == "01"
+    assert rows[isic.index.lookup("01").id]["class"] is None
+
+
+def test_table_is_cached_and_memory_mapped(isic, cache_dir):
+    table = isic.to_arrow()
+    assert isic.to_arrow() is table
+    [path] = (cache_dir / "arrow").iterdir()
+    restarted = ISIC4Classifier(background_index=False)
+    cached = restarted.to_arrow()
+    assert cached.equals(table)
+    assert path.stat().st_size > 0
+    assert ISIC4Classifier("ar", background_index=False).to_arrow() != table
+    assert len(list((cache_dir / "arrow").iterdir())) == 2
+
+
+def test_join_enriches_codes(isic):
+    firms = pa.table(
+        {"firm": [1, 2, 3, 4, 5], "isic": ["0111", " 2824", "9999", "A", None]}
+    )
+    joined = isic.join_arrow(firms, column="isic")
+    assert joined["firm"].to_pylist() == [1, 2, 3, 4, 5]
+    assert joined["isic_division"].to_pylist() == ["01", "28", None, None, None]
+    assert joined["isic_type"].to_pylist() == [
+        "class",
+        "class",
+        None,
+        "section",
+        None,
+    ]
+    assert joined["isic_section"].to_pylist()[:2] == ["a", "C"]
+
+
+def test_join_options(isic):
+    codes = pa.table({"code": pa.array([111, 1], pa.int64()), "raw": ["0111", "01"]})
+    joined = join(
+        codes, isic.to_arrow(), column="raw", columns=["description"], prefix=""
+    )
+    assert joined.column_names == ["code", "raw", "description"]
+    by_level = isic.join_arrow(codes, column="raw", columns=["path"], level="class")
+    assert by_level["isic_path"].to_pylist() == ["a/01/011/0111", None]
+    with pytest.raises(ValueError):
+        isic.join_arrow(codes, column="raw", level="sector")
+    with pytest.raises(KeyError):
+        isic.join_arrow(codes, column="missing")
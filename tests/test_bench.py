@@ -0,0 +1,74 @@
+import json
+import threading
+
+import pytest
+
+from isic4kit import bench
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ISIC4KIT_CACHE_DIR", str(tmp_path))
+
+
+def test_run_report_structure():
+    report = bench.run(languages=["en", "ar"], repeat=2, number=1)
+
+    assert report["schema"] == bench.SCHEMA_VERSION
+    assert set(report["languages"]) == {"en", "ar"}
+    for data in report["languages"].values():
+        for name in (
+            "load",
+            "lookup_mix",
+            "search_mix",
+            "print_tree_section",
+            "print_tree_search",
+        ):
+            stats = data["benchmarks"][name]
+            assert stats["rounds"] == 2
+            assert stats["min_us"] <= stats["median_us"] <= stats["max_us"]
+        assert data["benchmarks"]["lookup_mix"]["ops_per_call"] > 700
+        assert data["memory"]["peak_bytes"] >= data["memory"]["retained_bytes"] > 0
+
+    json.loads(json.dumps(report))
+
+
+def test_run_starts_no_background_threads(monkeypatch):
+    started = []
+    monkeypatch.setattr(
+        threading.Thread, "start", lambda self: started.append(self.name)
+    )
+    monkeypatch.setattr(bench, "THREADS", 0)
+    bench.run(languages=["en"], repeat=1, number=1)
+    assert started == []
+
+
+def test_compare_reports():
+    report = bench.run(languages=["en"], repeat=1, number=1)
+    rows = bench.compare(report, report)
+
+    assert {row["benchmark"] for row in rows} >= {"search_mix", "memory.peak_bytes"}
+    assert all(row["ratio"] == 1.0 for row in rows)
+
+
+def test_main_writes_json(tmp_path, capsys):
+    output = tmp_path / "bench.json"
+    assert (
+        bench.main(
+            [
+                "--languages",
+                "en",
+                "--repeat",
+                "1",
+                "--number",
+                "1",
+                "--output",
+                str(output),
+            ]
+        )
+        == 0
+    )
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert "en" in report["languages"]
+    assert "search_mix" in capsys.readouterr().out
@@ -0,0 +1,90 @@
+import multiprocessing
+import sqlite3
+
+import pytest
+
+from isic4kit import ISIC4Classifier
+from isic4kit.cache import ISICSearchCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "search.sqlite3"
+
+
+def test_search_results_are_cached(cache_path):
+    isic = ISIC4Classifier(background_index=False, search_cache=cache_path)
+    expected = ISIC4Classifier(background_index=False).search("mining")
+    assert isic.search("mining") == expected
+    assert len(isic.search_cache) == 1
+    # A new classifier, e.g. in a restarted process, reads the stored results
+    restarted = ISIC4Classifier(background_index=False, search_cache=cache_path)
+    restarted._index = None
+    restarted.sections = []
+    assert restarted.search(" MINING ") == expected
+    assert restarted.search_json("mining") == expected.model_dump_json().encode()
+    assert restarted.search("mining", spans=True).results == []
+    assert len(restarted.search_cache) == 2
+
+
+def test_keys_include_language_and_data_version(cache_path):
+    en = ISIC4Classifier(background_index=False, search_cache=cache_path)
+    ar = ISIC4Classifier("ar", background_index=False, search_cache=cache_path)
+    assert en.search("05") != ar.search("05")
+    assert len(en.search_cache) == 2
+    en.data_version = "other"
+    en.search("05")
+    assert len(en.search_cache) == 3
+
+
+def test_size_based_eviction(cache_path):
+    cache = ISICSearchCache(cache_path, max_bytes=1000, touch_interval=0)
+    for i in range(10):
+        assert cache.put(f"key{i}", bytes(100))
+    assert cache.size() == 1000
+    cache.get("key0")  # key0 is now the most recently used entry
+    assert cache.put("key10", bytes(100))
+    assert cache.size() <= 900
+    assert cache.get("key0") is not None
+    assert cache.get("key1") is None
+    assert cache.get("key10") is not None
+    assert not cache.put("huge", bytes(1001))
+    # Replacing a key does not count its old value
+    cache.clear()
+    cache.put("key", bytes(300))
+    cache.put("key", bytes(200))
+    assert cache.size() == 200
+
+
+def test_errors_are_misses(tmp_path):
+    cache = ISICSearchCache(tmp_path / "file" / "search.sqlite3")
+    (tmp_path / "file").write_text("not a directory")
+    assert cache.get("key") is None
+    assert not cache.put("key", b"value")
+    isic = ISIC4Classifier(background_index=False, search_cache=cache)
+    assert isic.search("mining").results
+
+
+def _write_entries(path, worker):
+    cache = ISICSearchCache(path)
+    for i in range(50):
+        cache.put(f"{worker}:{i}", f"{worker}:{i}".encode())
+        assert cache.get(f"{worker}:{i}") == f"{worker}:{i}".encode()
+
+
+def test_concurrent_processes(cache_path):
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_write_entries, args=(cache_path, worker))
+        for worker in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert [worker.exitcode for worker in workers] == [0] * 4
+    cache = ISICSearchCache(cache_path)
+    assert len(cache) == 200
+    assert cache.get("3:49") == b"3:49"
+    journal_mode = sqlite3.connect(cache_path).execute("PRAGMA journal_mode")
+    assert journal_mode.fetchone()[0] == "wal"
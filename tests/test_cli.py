@@ -0,0 +1,141 @@
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from isic4kit.cli import main
+
+
+def _run(capsys, monkeypatch, argv, stdin=""):
+    monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+    status = main(argv)
+    return status, capsys.readouterr().out
+
+
+def test_lookup_reads_stdin_and_writes_tsv(capsys, monkeypatch):
+    status, out = _run(capsys, monkeypatch, ["lookup"], "0111\nzz\n0111\r\nA\n")
+    assert status == 0
+    rows = [line.split("\t") for line in out.splitlines()]
+    assert rows[0] == [
+        "0111",
+        "class",
+        "0111",
+        "Growing of cereals (except rice), leguminous crops and oil seeds",
+        "a/01/011/0111",
+    ]
+    assert rows[1] == ["zz", "", "", "", ""]
+    assert rows[2] == rows[0]
+    assert rows[3][:3] == ["A", "section", "a"]
+
+
+def test_lookup_jsonl_and_level(capsys, monkeypatch):
+    _, out = _run(
+        capsys,
+        monkeypatch,
+        ["lookup", "0111", "01", "--level", "class", "--format", "jsonl"],
+    )
+    first, second = map(json.loads, out.splitlines())
+    assert first["input"] == "0111"
+    assert first["result"]["path"] == "a/01/011/0111"
+    assert second == {"input": "01", "result": None}
+
+
+def test_search_tsv_and_jsonl(capsys, monkeypatch):
+    status, out = _run(capsys, monkeypatch, ["search"], "hard coal\n\nzzz\n")
+    assert status == 0
+    assert [line.split("\t")[:3] for line in out.splitlines()] == [
+        ["hard coal", "group", "051"],
+        ["hard coal", "class", "0510"],
+    ]
+    _, out = _run(
+        capsys, monkeypatch, ["search", "coal", "--limit", "1", "--format", "jsonl"]
+    )
+    line = json.loads(out)
+    assert line["query"] == "coal"
+    assert [result["code"] for result in line["results"]] == ["05"]
+
+
+def test_tree_text_and_jsonl(capsys, monkeypatch):
+    _, out = _run(capsys, monkeypatch, ["tree", "051", "zz"])
+    assert out == (
+        "└── 051: Mining of hard coal\n"
+        "    └── 0510: Mining of hard coal (anthracite)\n"
+    )
+    _, out = _run(capsys, monkeypatch, ["tree", "051", "zz", "--format", "jsonl"])
+    first, second = map(json.loads, out.splitlines())
+    assert first["node"]["classes"][0]["code"] == "0510"
+    assert second["node"] is None
+
+
+def test_validate_exit_status(capsys, monkeypatch):
+    status, out = _run(capsys, monkeypatch, ["validate"], "0111\n0111\n")
+    assert status == 0
+    assert out == "0111\tvalid\tclass\n" * 2
+    status, out = _run(
+        capsys,
+        monkeypatch,
+        ["validate", "--level", "division", "--format", "jsonl"],
+        "01\n0111\n",
+    )
+    assert status == 1
+    assert [json.loads(line) for line in out.splitlines()] == [
+        {"input": "01", "valid": True, "type": "division"},
+        {"input": "0111", "valid": False, "type": None},
+    ]
+
+
+def test_validate_suggestions(capsys, monkeypatch):
+    status, out = _run(
+        capsys, monkeypatch, ["validate", "--suggest", "3"], "0111\n0120\n0119x\n"
+    )
+    assert status == 1
+    assert out.splitlines() == [
+        "0111\tvalid\tclass\t",
+        "0120\tinvalid\t\t0121,0122,0123",
+        "0119x\tinvalid\t\t0119",
+    ]
+    _, out = _run(
+        capsys,
+        monkeypatch,
+        ["validate", "0120", "--suggest", "2", "--level", "group", "--format", "jsonl"],
+    )
+    assert json.loads(out)["suggestions"] == ["012", "120"]
+
+
+def test_arabic_output(capsys, monkeypatch):
+    _, out = _run(capsys, monkeypatch, ["search", "--language", "ar"], "تعدين\n")
+    assert out
+    assert all(line.split("\t")[0] == "تعدين" for line in out.splitlines())
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["search", "--limit", "-1"],
+        ["tree", "--max-depth", "-2"],
+        ["validate", "--suggest", "x"],
+    ],
+)
+def test_negative_counts_are_rejected(capsys, monkeypatch, argv):
+    with pytest.raises(SystemExit) as e:
+        _run(capsys, monkeypatch, argv)
+    assert e.value.code == 2
+    assert "non-negative integer" in capsys.readouterr().err
+
+
+def test_closed_output_stops_quietly(tmp_path):
+    queries = tmp_path / "queries.txt"
+    queries.write_text("mining\n" * 20000)
+    with open(queries, "rb") as stdin:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "isic4kit", "search"],
+            stdin=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    assert process.stdout.readline().startswith(b"mining\t")
+    process.stdout.close()
+    assert process.wait(timeout=60) == 141
+    assert process.stderr.read() == b""
@@ -0,0 +1,122 @@
+import contextlib
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from isic4kit import ISIC4Classifier
+from isic4kit.columnar import ISICColumns
+from isic4kit.query import Level, Term
+
+DATA_DIR = Path(__file__).parent.parent / "isic4kit" / "data"
+QUERIES = ["mining", "05", "", "C", "retail sale", "nonexistent", "x\x00", "تعدين"]
+
+
+@pytest.fixture(scope="module", params=["en", "ar"])
+def pair(request):
+    return (
+        ISIC4Classifier(language=request.param, background_index=False),
+        ISIC4Classifier(language=request.param, storage="columnar"),
+    )
+
+
+def test_columns_from_data_and_sections_agree(pair):
+    objects, columnar = pair
+    columns = columnar.columns
+    from_sections = ISICColumns.from_sections(objects.sections)
+    assert len(columns) == len(objects.index)
+    for name in ("levels", "parents", "ends", "offsets", "starts"):
+        assert getattr(columns, name) == getattr(from_sections, name)
+    assert columns.buffer == from_sections.buffer
+    assert len(columns.buffer) < sum(
+        len(n.code) + len(n.description) for n in objects.index.nodes
+    )
+
+
+def test_columns_match_index(pair):
+    objects, columnar = pair
+    index = objects.index
+    columns = columnar.columns
+    for node in index.nodes:
+        assert columns.type(node.id) == node.type
+        assert columns.code(node.id) == node.code
+        assert columns.description(node.id) == node.description
+        assert columns.hierarchy(node.id) == node.hierarchy
+        assert columns.children(node.id) == list(index.children[node.id])
+        assert columns.ends[node.id] == index.ends[node.id]
+
+
+def test_lookups_and_search(pair):
+    objects, columnar = pair
+    assert columnar._index is None
+    for level, code in [
+        ("section", "a"),
+        ("section", "C"),
+        ("division", "01"),
+        ("group", "011"),
+        ("class", "0111"),
+        ("class", "0000"),
+        ("group", "0111"),
+    ]:
+        getter = f"get_{level}"
+        assert getattr(columnar, getter)(code) == getattr(objects, getter)(code)
+    for query in QUERIES:
+        assert columnar.search(query) == objects.search(query)
+        assert columnar.search_json(query) == objects.search_json(query)
+    assert columnar.get_json("division", "01") == objects.get_json("division", "01")
+
+
+def test_sections_materialised_on_demand():
+    classifier = ISIC4Classifier(storage="columnar")
+    assert classifier._sections is None
+    sections = classifier.sections
+    assert sections == ISIC4Classifier(background_index=False).sections
+    assert classifier.sections is sections
+
+
+def test_index_features_build_index_once():
+    classifier = ISIC4Classifier(storage="columnar")
+    results = classifier.query(Level("class") & Term("wheat"))
+    index = classifier.index
+    assert index is not None and index.sections is classifier.sections
+    classifier.query(Level("group"))
+    assert classifier.index is index
+    assert results == ISIC4Classifier(background_index=False).query(
+        Level("class") & Term("wheat")
+    )
+
+
+def test_tree_over_column_views():
+    objects = ISIC4Classifier(background_index=False)
+    columnar = ISIC4Classifier(storage="columnar")
+    columns = columnar.columns
+    expected, actual = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(expected):
+        objects.get_division("01").print_tree()
+    node = columns.node(columns.lookup("01"))
+    with contextlib.redirect_stdout(actual):
+        node.print_tree()
+    assert actual.getvalue() == expected.getvalue()
+    assert node.model() == objects.get_division("01")
+
+
+def test_subclasses_from_source(tmp_path, monkeypatch):
+    monkeypatch.setenv("ISIC4KIT_CACHE_DIR", str(tmp_path / "cache"))
+    source = tmp_path / "ext.csv"
+    source.write_text(
+        "code,description\n01111,Wheat\n011111,Durum wheat\n", encoding="utf-8"
+    )
+    objects = ISIC4Classifier(source=source, background_index=False)
+    columnar = ISIC4Classifier(source=source, storage="columnar")
+    assert columnar.get_subclass("011111") == objects.get_subclass("011111")
+    assert columnar.get_class("0111") == objects.get_class("0111")
+    assert columnar.search("durum") == objects.search("durum")
+
+
+def test_columns_are_read_only_and_storage_is_validated():
+    columns = ISICColumns.from_data(json.loads((DATA_DIR / "en.json").read_text()))
+    with pytest.raises(AttributeError):
+        columns.buffer = ""
+    with pytest.raises(ValueError):
+        ISIC4Classifier(storage="rows")
@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from isic4kit import ISIC4Classifier, ISICConcordance
+
+TABLE = """source,target,weight
+01.11,0111,0.6
+01.11,0112,0.4
+0112,0113,
+0112,0113,
+0120,0121,
+0120,0122,
+"""
+
+
+@pytest.fixture(scope="module")
+def isic():
+    return ISIC4Classifier(background_index=False)
+
+
+@pytest.fixture
+def concordance(isic, tmp_path):
+    path = tmp_path / "isic31.csv"
+    path.write_text(TABLE, encoding="utf-8")
+    return ISICConcordance.load(path, isic)
+
+
+def test_translate_weighted_split(concordance):
+    assert concordance.name == "isic31"
+    assert concordance.translate_codes("0111") == (("0111", 0.6), ("0112", 0.4))
+    assert concordance.translate_codes(" 01.11 ") == (("0111", 0.6), ("0112", 0.4))
+
+    matches = concordance.translate("0111")
+    assert [(m.code, m.type, m.weight) for m in matches] == [
+        ("0111", "class", 0.6),
+        ("0112", "class", 0.4),
+    ]
+    assert matches[0].description.startswith("Growing of cereals")
+
+
+def test_unweighted_targets_share_equally(concordance):
+    assert concordance.translate_codes("0112") == (("0113", 1.0),)
+    assert concordance.translate_codes("0120") == (("0121", 0.5), ("0122", 0.5))
+
+
+def test_translate_many(concordance):
+    codes = ["0111", "9999", "0120"] * 1000
+    translated = list(concordance.translate_many(iter(codes)))
+
+    assert len(translated) == len(codes)
+    assert translated[1] == ("9999", ())
+    assert dict(translated)["0120"] == (("0121", 0.5), ("0122", 0.5))
+    assert "0111" in concordance and "9999" not in concordance
+    assert len(concordance) == 3
+
+
+def test_reverse(concordance):
+    assert concordance.reverse("0112") == (("0111", 0.4),)
+    assert concordance.reverse("0113") == (("0112", 1.0),)
+
+
+def test_json_table_and_strict_mode(isic, tmp_path):
+    path = tmp_path / "naics.json"
+    path.write_text(
+        json.dumps(
+            [
+                {"source": "111110", "target": "0111"},
+                {"source": "999999", "target": "0000"},
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="'0000'"):
+        ISICConcordance.load(path, isic)
+
+    concordance = ISICConcordance.load(path, isic, strict=False)
+    assert concordance.translate_codes("111110") == (("0111", 1.0),)
+    assert concordance.translate_codes("999999") == ()
+
+
+@pytest.mark.parametrize(
+    "pairs, message",
+    [
+        ([("1", "0111", "-1")], "invalid weight"),
+        ([("1", "0111", "x")], "invalid weight"),
+        ([("1", "0111", "nan")], "invalid weight"),
+        ([("1", "0111", "inf")], "invalid weight"),
+        ([("1", "0111", "0.5"), ("1", "0112", None)], "mixes weighted"),
+    ],
+)
+def test_invalid_weights(isic, pairs, message):
+    with pytest.raises(ValueError, match=message):
+        ISICConcordance(isic, pairs)
+
+
+@pytest.mark.parametrize(
+    "pairs",
+    [[(None, "0111")], [(" ", "0111")], [("1", "")], [("1", None, "0.5")]],
+)
+def test_invalid_codes(isic, pairs):
+    with pytest.raises(ValueError, match="invalid row"):
+        ISICConcordance(isic, pairs, strict=False)
+
+
+def test_short_csv_row(isic, tmp_path):
+    path = tmp_path / "short.csv"
+    path.write_text("source,target\n111110,0111\n111120\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="invalid row \\('111120', None"):
+        ISICConcordance.load(path, isic)
+
+
+def test_missing_table(isic):
+    with pytest.raises(ValueError, match="not found"):
+        ISICConcordance.load("no_such_table", isic)
@@ -0,0 +1,146 @@
+import io
+import json
+
+import pytest
+
+from isic4kit import ISIC4Classifier
+from isic4kit.cli import main
+from isic4kit.diff import ISICChange, diff, format_change, write_report
+
+OLD_CSV = """code,description
+A,Agriculture
+01,Crop production
+011,Non-perennial crops
+0111,Growing of cereals
+0112,Growing of rice
+012,Perennial crops
+0121,Growing of grapes
+"""
+
+NEW_CSV = """code,description,parent
+a,Agriculture,
+01,Crop and animal production,
+011,Non-perennial crops,
+0111,Growing of cereals,
+012,Perennial crops,
+0121,Growing of grapes,
+0113,Growing of vegetables,011
+B,Mining,
+05,Mining of coal,
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ISIC4KIT_CACHE_DIR", str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def sources(tmp_path):
+    old = tmp_path / "old.csv"
+    new = tmp_path / "new.csv"
+    old.write_text(OLD_CSV, encoding="utf-8")
+    new.write_text(NEW_CSV, encoding="utf-8")
+    return old, new
+
+
+def test_identical_data_has_no_changes():
+    isic = ISIC4Classifier(background_index=False)
+    assert list(diff(isic, ISIC4Classifier(background_index=True))) == []
+
+
+def test_languages_have_the_same_coverage():
+    en = ISIC4Classifier(language="en", background_index=False)
+    ar = ISIC4Classifier(language="ar", background_index=False)
+    assert list(diff(en, ar, descriptions=False)) == []
+    changes = list(diff(en, ar))
+    assert len(changes) == len(en.index)
+    assert {change.kind for change in changes} == {"changed"}
+
+
+def test_added_removed_changed(sources):
+    old = ISIC4Classifier(source=sources[0], background_index=False)
+    new = ISIC4Classifier(source=sources[1], background_index=False)
+    changes = {(c.kind, c.code): c for c in diff(old, new)}
+
+    assert set(changes) == {
+        ("changed", "01"),
+        ("removed", "0112"),
+        ("added", "0113"),
+        ("added", "B"),
+        ("added", "05"),
+    }
+    assert changes["changed", "01"].new_description == "Crop and animal production"
+    assert changes["removed", "0112"].old_parent == "011"
+    assert changes["added", "05"].new_parent == "B"
+    assert list(diff(old.index, new.index)) == list(diff(old, new))
+
+
+def test_moved_nodes(tmp_path):
+    old = tmp_path / "old.json"
+    new = tmp_path / "new.json"
+    old.write_text(
+        json.dumps(
+            [
+                {"code": "A", "description": "Agriculture"},
+                {"code": "01", "description": "Crops"},
+                {"code": "B", "description": "Mining"},
+            ]
+        ),
+        encoding="utf-8",
+    )
+    new.write_text(
+        json.dumps(
+            [
+                {"code": "A", "description": "Agriculture"},
+                {"code": "B", "description": "Mining"},
+                {"code": "01", "description": "Crops"},
+            ]
+        ),
+        encoding="utf-8",
+    )
+    changes = list(
+        diff(
+            ISIC4Classifier(source=old, background_index=False),
+            ISIC4Classifier(source=new, background_index=False),
+        )
+    )
+    assert changes == [
+        ISICChange("moved", "division", "01", "Crops", "Crops", "A", "B")
+    ]
+    assert format_change(changes[0]) == "> division 01: moved from A to B"
+
+
+def test_write_report_streams(sources):
+    old = ISIC4Classifier(source=sources[0], background_index=False)
+    new = ISIC4Classifier(source=sources[1], background_index=False)
+
+    text = io.StringIO()
+    counts = write_report(diff(old, new), text)
+    assert counts == {"added": 3, "removed": 1, "changed": 1, "moved": 0}
+    lines = text.getvalue().splitlines()
+    assert "- class 0112: Growing of rice" in lines
+    assert lines[-1] == "3 added, 1 removed, 1 changed, 0 moved"
+
+    jsonl = io.StringIO()
+    write_report(diff(old, new), jsonl, format="jsonl")
+    records = [json.loads(line) for line in jsonl.getvalue().splitlines()]
+    assert len(records) == 5
+    assert {"kind", "type", "code", "old_parent"} <= set(records[0])
+
+    with pytest.raises(ValueError):
+        write_report([], io.StringIO(), format="xml")
+
+
+def test_cli_diff(sources, capsys):
+    assert main(["diff"]) == 0
+    assert main(["diff", "--new-language", "ar", "--ignore-descriptions"]) == 0
+    capsys.readouterr()
+
+    old, new = map(str, sources)
+    status = main(
+        ["diff", "--old-source", old, "--new-source", new, "--format", "jsonl"]
+    )
+    assert status == 1
+    out = capsys.readouterr().out
+    assert len(out.splitlines()) == 5
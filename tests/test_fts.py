@@ -0,0 +1,112 @@
+import sqlite3
+
+import pytest
+
+from isic4kit import ISIC4Classifier
+from isic4kit.fts import ISICFullTextIndex, fts5_available
+
+pytestmark = pytest.mark.skipif(not fts5_available(), reason="SQLite without FTS5")
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ISIC4KIT_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _codes(results):
+    return [result.code for result in results.results]
+
+
+def test_prefix_search_in_hierarchy_order(cache_dir):
+    isic = ISIC4Classifier(background_index=False, search_backend="fts")
+    results = isic.search("manuf food")
+    assert _codes(results) == ["10", "107", "1079", "2825"]
+    assert (cache_dir / "fts").is_dir()
+    # Every word of the query starts a word of each result
+    scan = ISIC4Classifier(background_index=False)
+    for result in results.results:
+        words = result.description.lower().split()
+        assert any(word.startswith("manuf") for word in words)
+        assert any(word.startswith("food") for word in words)
+        assert result in scan.search("manuf").results
+    assert isic.search_json("manuf food") == results.model_dump_json().encode()
+
+
+def test_phrase_query_and_ranking():
+    isic = ISIC4Classifier(background_index=False)
+    assert _codes(isic.full_text_search("mining of coal", mode="phrase")) == ["05"]
+    ranked = isic.full_text_search("dairy OR bakery", mode="query")
+    assert sorted(_codes(ranked)) == ["105", "1050", "1071"]
+    assert _codes(isic.full_text_search("code: 011*", mode="query", ranked=False)) == [
+        "011",
+        "0111",
+        "0112",
+        "0113",
+        "0114",
+        "0115",
+        "0116",
+        "0119",
+    ]
+    assert len(isic.full_text_search("manufacture", limit=3).results) == 3
+    with pytest.raises(ValueError):
+        isic.full_text_search('"unbalanced', mode="query")
+    with pytest.raises(ValueError):
+        isic.full_text_search("mining", mode="fuzzy")
+
+
+def test_arabic_diacritics_and_spans():
+    isic = ISIC4Classifier("ar", background_index=False, search_backend="fts")
+    plain = isic.search("زراعة")
+    assert plain.results
+    assert isic.search("زِراعة") == plain
+    result = isic.search("زراعة", spans=True).results[0]
+    start, end = result.spans.description[0]
+    assert result.description[start:end].replace("ِ", "") == "زراعة"
+
+
+def test_index_is_built_once(cache_dir):
+    isic = ISIC4Classifier(background_index=False)
+    full_text = ISICFullTextIndex(isic.index)
+    mtime = full_text.path.stat().st_mtime_ns
+    again = ISICFullTextIndex(isic.index)
+    assert again.path == full_text.path
+    assert again.path.stat().st_mtime_ns == mtime
+    assert again.match("coal") == full_text.match("coal")
+
+
+@pytest.mark.parametrize(
+    "damage",
+    [
+        lambda path: path.write_bytes(path.read_bytes()[:4096]),
+        lambda path: path.write_bytes(b"not a database"),
+        lambda path: _set_user_version(path, 0),
+    ],
+    ids=["truncated", "corrupt", "old-format"],
+)
+def test_invalid_cached_index_is_rebuilt(damage):
+    isic = ISIC4Classifier(background_index=False)
+    expected = ISICFullTextIndex(isic.index).match("coal")
+    path = ISICFullTextIndex(isic.index).path
+    damage(path)
+    rebuilt = ISICFullTextIndex(isic.index)
+    assert rebuilt.match("coal") == expected
+    assert not list(path.parent.glob("*.tmp"))
+
+
+def _set_user_version(path, version):
+    connection = sqlite3.connect(path)
+    try:
+        connection.execute(f"PRAGMA user_version = {version}")
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def test_pagination_and_unknown_backend():
+    isic = ISIC4Classifier(background_index=False, search_backend="fts")
+    page = isic.search_page("manuf food", limit=2)
+    rest = isic.search_page("manuf food", cursor=page.next_cursor)
+    assert page.results + rest.results == isic.search("manuf food").results
+    with pytest.raises(ValueError):
+        ISIC4Classifier(search_backend="elastic")
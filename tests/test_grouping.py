@@ -0,0 +1,58 @@
+import contextlib
+import io
+
+from isic4kit import ISIC4Classifier, Tree
+
+
+def _render(results, **kwargs):
+    output = io.StringIO()
+    results.print_tree(file=output, **kwargs)
+    return output.getvalue()
+
+
+def test_grouped_results_follow_the_hierarchy():
+    isic = ISIC4Classifier(background_index=False)
+    results = isic.search("mining")
+    sections = results.grouped()
+    assert [group.code.upper() for group in sections] == ["B", "C"]
+    # Every result appears exactly once, in search order
+    grouped = [group.result for root in sections for group in root]
+    assert [result for result in grouped if result is not None] == results.results
+    # Ancestors of results that did not match have no result
+    manufacturing = sections[1]
+    assert manufacturing.result is None
+    assert manufacturing.description is None
+    assert [group.code for group in manufacturing] == ["C", "28", "282", "2824"]
+
+
+def test_print_tree_includes_sections_and_ancestors():
+    isic = ISIC4Classifier(background_index=False)
+    output = _render(isic.search("mining"))
+    lines = output.splitlines()
+    assert lines[0] == "├── b: Mining and quarrying"
+    assert lines[1] == "│   ├── 05: Mining of coal and lignite"
+    assert lines[-4:] == [
+        "└── C",
+        "    └── 28",
+        "        └── 282",
+        "            └── 2824: Manufacture of machinery for mining, "
+        "quarrying and construction",
+    ]
+    # Standard output is the default stream
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        isic.search("mining").print_tree()
+    assert stdout.getvalue() == output
+    assert _render(isic.search("nonexistent")) == ""
+
+
+def test_print_tree_matches_section_trees():
+    isic = ISIC4Classifier(background_index=False)
+    results = isic.search("")
+    expected = io.StringIO()
+    with contextlib.redirect_stdout(expected):
+        for section in isic.sections[:-1]:
+            Tree.print(section, is_last=False)
+        Tree.print(isic.sections[-1])
+    assert _render(results) == expected.getvalue()
+    assert _render(results, indent="  ").startswith("  ├── ")
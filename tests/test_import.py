@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+import pytest
+
+import isic4kit
+
+IMPORT_TIME_BUDGET_US = 50_000
+
+
+def _import_times(statement):
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "statement", ["import isic4kit", "from isic4kit import ISIC4Classifier"]
+)
+def test_import_does_not_load_heavy_modules(statement):
+    times = _import_times(statement)
+
+    assert "pydantic" not in times
+    assert "json" not in times
+    assert "isic4kit.models" not in times
+
+
+def test_import_time_budget():
+    times = _import_times("import isic4kit")
+    assert times["isic4kit"] < IMPORT_TIME_BUDGET_US
+
+
+def test_lazy_attributes():
+    from isic4kit.models import ISICSection
+    from isic4kit.isic4 import ISIC4Classifier
+
+    assert isic4kit.ISICSection is ISICSection
+    assert isic4kit.ISIC4Classifier is ISIC4Classifier
+    assert set(isic4kit.__all__) <= set(dir(isic4kit))
+
+    with pytest.raises(AttributeError):
+        isic4kit.NotAClassifier
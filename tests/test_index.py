@@ -0,0 +1,148 @@
+import threading
+
+import pytest
+
+from isic4kit import ISIC4Classifier
+from isic4kit.index import ISICIndex
+
+
+def linear_search(isic, query):
+    index = isic._index
+    isic._index = None
+    try:
+        return isic.search(query)
+    finally:
+        isic._index = index
+
+
+def test_wait_ready():
+    isic = ISIC4Classifier()
+    assert isic.wait_ready(timeout=5)
+    assert isinstance(isic.index, ISICIndex)
+    assert isic.index.sections is isic.sections
+
+
+def test_foreground_index():
+    isic = ISIC4Classifier(background_index=False)
+    assert isic.index is not None
+    assert isic.wait_ready(timeout=0)
+
+
+@pytest.mark.parametrize(
+    "language, query",
+    [("en", "mining"), ("en", "05"), ("en", "A"), ("en", ""), ("ar", "تعدين")],
+)
+def test_index_search_matches_linear_scan(language, query):
+    isic = ISIC4Classifier(language=language, background_index=False)
+    assert isic.search(query) == linear_search(isic, query)
+
+
+def test_index_lookups_match_linear_scan():
+    isic = ISIC4Classifier(background_index=False)
+    index = isic.index
+
+    for section in isic.sections:
+        assert index.get("section", section.code.upper()) is section
+        for division in section.divisions:
+            assert isic.get_division(division.code) is division
+            for group in division.groups:
+                assert isic.get_group(group.code) is group
+                for class_ in group.classes:
+                    assert isic.get_class(class_.code) is class_
+
+    assert isic.get_class("0000") is None
+    assert isic.get_section("z") is None
+
+
+def test_search_falls_back_until_ready():
+    release = threading.Event()
+
+    class SlowIndexClassifier(ISIC4Classifier):
+        def _build_index(self):
+            release.wait(5)
+            super()._build_index()
+
+    isic = SlowIndexClassifier()
+    assert isic.index is None
+    assert not isic.wait_ready(timeout=0)
+    before = isic.search("mining")
+    assert isic.get_class("0111").code == "0111"
+
+    release.set()
+    assert isic.wait_ready(timeout=5)
+    assert isic.search("mining") == before
+
+
+def test_replaced_sections_bypass_stale_index():
+    isic = ISIC4Classifier(background_index=False)
+    isic.sections = isic.sections[:1]
+    assert isic.get_section("b") is None
+    assert all(r.hierarchy.section == "a" for r in isic.search("o").results)
+
+
+def test_index_is_read_only():
+    isic = ISIC4Classifier(background_index=False)
+    index = isic.index
+
+    with pytest.raises(AttributeError):
+        index.nodes = ()
+    with pytest.raises(TypeError):
+        index.codes["class"]["9999"] = 0
+    with pytest.raises(AttributeError):
+        index.nodes[0].code = "z"
+    assert isinstance(index.nodes, tuple)
+
+
+def test_index_find_and_lookup():
+    isic = ISIC4Classifier(background_index=False)
+    index = isic.index
+
+    nodes = index.find("  Hard Coal ")
+    assert [(n.type, n.code) for n in nodes] == [("group", "051"), ("class", "0510")]
+    assert nodes[1].parent == nodes[0].id
+    assert index.nodes[nodes[0].parent].code == "05"
+    assert [r.code for r in isic.search("hard coal").results] == ["051", "0510"]
+
+    assert index.lookup("0111").path == "a/01/011/0111"
+    assert index.lookup("A").type == "section"
+    assert index.lookup("01", "group") is None
+    assert index.lookup("9999") is None
+    assert len(index) == len(index.nodes)
+
+
+def test_concurrent_readers():
+    isic = ISIC4Classifier(background_index=False)
+    queries = ["mining", "manufacture", "05", "retail", "food", "nonexistent"]
+    codes = [node.code for node in isic.index.nodes if node.type == "class"]
+    expected_search = {q: isic.search(q) for q in queries}
+    expected_find = {q: isic.index.find(q) for q in queries}
+    expected_class = {code: isic.get_class(code) for code in codes}
+
+    threads = 8
+    iterations = 200
+    barrier = threading.Barrier(threads)
+    errors = []
+    operations = [0] * threads
+
+    def reader(worker):
+        try:
+            barrier.wait()
+            for i in range(iterations):
+                query = queries[(worker + i) % len(queries)]
+                assert isic.index.find(query) == expected_find[query]
+                if i % 10 == 0:
+                    assert isic.search(query) == expected_search[query]
+                code = codes[(worker * iterations + i) % len(codes)]
+                assert isic.get_class(code) is expected_class[code]
+                operations[worker] += 2 + (i % 10 == 0)
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=reader, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert not errors
+    assert sum(operations) == threads * iterations * 2 + threads * iterations // 10
@@ -0,0 +1,93 @@
+import pytest
+
+from isic4kit import ISIC4Classifier
+
+QUERIES = {
+    "en": ["manufacture", "of", "C", "05", "", "nonexistent"],
+    "ar": ["صناعة", "زراعة", "05", "ة", ""],
+}
+
+
+@pytest.fixture(scope="module", params=["en", "ar"])
+def classifiers(request):
+    language = request.param
+    objects = ISIC4Classifier(language=language, background_index=False)
+    linear = ISIC4Classifier(language=language, background_index=False)
+    linear._index = None
+    columnar = ISIC4Classifier(language=language, storage="columnar")
+    return language, objects, linear, columnar
+
+
+def _all_pages(isic, query, limit, spans=False):
+    results = []
+    cursor = None
+    while True:
+        page = isic.search_page(query, limit=limit, cursor=cursor, spans=spans)
+        assert len(page.results) <= limit
+        results.extend(page.results)
+        cursor = page.next_cursor
+        if cursor is None:
+            return results
+        assert len(page.results) == limit
+
+
+def test_pages_concatenate_to_search(classifiers):
+    language, *isics = classifiers
+    for query in QUERIES[language]:
+        expected = isics[0].search(query).results
+        for isic in isics:
+            for limit in (1, 7, 1000):
+                assert _all_pages(isic, query, limit) == expected
+
+
+def test_pages_with_spans(classifiers):
+    language, *isics = classifiers
+    query = QUERIES[language][0]
+    expected = isics[0].search(query, spans=True).results
+    for isic in isics:
+        assert _all_pages(isic, query, 5, spans=True) == expected
+
+
+def test_iter_search_is_lazy_and_ordered(classifiers):
+    language, *isics = classifiers
+    query = QUERIES[language][0]
+    expected = isics[0].search(query).results
+    for isic in isics:
+        results = isic.iter_search(query)
+        assert next(results) == expected[0]
+        assert [expected[0], *results] == expected
+
+
+def test_iter_search_resumes_from_cursor(classifiers):
+    language, objects, *_ = classifiers
+    query = QUERIES[language][0]
+    page = objects.search_page(query, limit=3)
+    rest = list(objects.iter_search(query, cursor=page.next_cursor))
+    assert page.results + rest == objects.search(query).results
+
+
+def test_cursors_are_shared_between_storages(classifiers):
+    language, objects, linear, columnar = classifiers
+    query = QUERIES[language][0]
+    cursor = objects.search_page(query, limit=4).next_cursor
+    assert (
+        objects.search_page(query, cursor=cursor)
+        == linear.search_page(query, cursor=cursor)
+        == columnar.search_page(query, cursor=cursor)
+    )
+
+
+def test_invalid_cursors_and_limits():
+    isic = ISIC4Classifier(background_index=False)
+    cursor = isic.search_page("manufacture", limit=2).next_cursor
+    # Whitespace and case do not change the query
+    assert isic.search_page(" MANUFACTURE ", limit=2, cursor=cursor).results
+    for bad in ("", "abc", "-1.0", cursor + "0", cursor.split(".")[0]):
+        with pytest.raises(ValueError):
+            isic.search_page("manufacture", cursor=bad)
+    with pytest.raises(ValueError):
+        isic.search_page("mining", cursor=cursor)
+    with pytest.raises(ValueError):
+        list(isic.iter_search("mining", cursor=cursor))
+    with pytest.raises(ValueError):
+        isic.search_page("manufacture", limit=0)
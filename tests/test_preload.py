@@ -0,0 +1,114 @@
+import gc
+import json
+import os
+
+import pytest
+
+from isic4kit import ISIC4Classifier
+from isic4kit.preload import freeze, memory_usage, preload, warm
+
+fork = pytest.mark.skipif(
+    not hasattr(os, "fork") or not os.path.exists("/proc/self/smaps_rollup"),
+    reason="requires fork and /proc/self/smaps_rollup",
+)
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ISIC4KIT_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def unfreeze():
+    yield
+    if hasattr(gc, "unfreeze"):
+        gc.unfreeze()
+
+
+def _child_memory(work) -> tuple[dict, dict]:
+    """Run ``work`` in a forked child and return its memory before and after."""
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            before = memory_usage()
+            work()
+            after = memory_usage()
+            os.write(write, json.dumps([before, after]).encode())
+        finally:
+            os._exit(0)
+    os.close(write)
+    os.waitpid(pid, 0)
+    with os.fdopen(read, "rb") as f:
+        before, after = json.loads(f.read())
+    return before, after
+
+
+def _child_private_growth(work) -> int:
+    """Run ``work`` in a forked child and return its growth of private memory."""
+    before, after = _child_memory(work)
+    return after["Private_Dirty"] - before["Private_Dirty"]
+
+
+def test_preload_builds_warm_classifiers(unfreeze):
+    classifiers = preload(["en", "ar"], synonyms=True)
+    assert list(classifiers) == ["en", "ar"]
+    for language, isic in classifiers.items():
+        assert isic.language == language
+        assert isic.columns is None
+        assert isic.index is not None
+        assert isic.synonyms._compiled[0] is isic.index
+    assert classifiers["en"].get_class("0111").code == "0111"
+    assert [r.code for r in classifiers["en"].search("trucking").results] == ["4923"]
+
+
+def test_preload_columnar(unfreeze):
+    isic = preload(["en"], storage="columnar")["en"]
+    assert isic.columns is not None
+    assert isic.get_section("a").code == "a"
+
+
+def test_warm_builds_lazy_structures():
+    isic = ISIC4Classifier(storage="columnar", background_index=False)
+    assert warm(isic) is isic
+    assert isic.index is None
+    objects = warm(ISIC4Classifier())
+    assert objects.index is not None
+
+
+def test_memory_usage():
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        with pytest.raises(OSError):
+            memory_usage()
+        return
+    usage = memory_usage()
+    assert usage["Rss"] > 0
+    assert usage["Rss"] >= usage["Private_Dirty"]
+
+
+@fork
+@pytest.mark.parametrize("storage", ["objects", "columnar"])
+def test_frozen_data_stays_shared_after_fork(unfreeze, storage):
+    classifiers = preload(["en", "ar"], storage=storage, freeze_gc=False)
+    # Without freezing, a collection in the worker touches every object header
+    unfrozen = _child_private_growth(gc.collect)
+    freeze()
+    frozen = _child_private_growth(gc.collect)
+    assert frozen < unfrozen / 10
+    assert frozen < 1 << 20
+
+    def work():
+        for isic in classifiers.values():
+            for code in ("0111", "2824", "01", "A") * 50:
+                isic.get_class(code)
+                isic.get_division(code)
+            isic.search_json("mining")
+        gc.collect()
+
+    before, after = _child_memory(work)
+    assert after["Private_Dirty"] - before["Private_Dirty"] < unfrozen
+    # The preloaded data is still shared with the master after the work
+    shared = after["Shared_Clean"] + after["Shared_Dirty"]
+    assert shared > 3 * after["Rss"] // 4
+    assert shared > 4 * after["Private_Dirty"]
@@ -0,0 +1,80 @@
+import pytest
+
+from isic4kit import ISIC4Classifier
+from isic4kit.index import ISICIndex
+from isic4kit.query import And, Level, Not, Or, Term, Within
+
+
+@pytest.fixture(scope="module", params=["en", "ar"])
+def isic(request):
+    return ISIC4Classifier(language=request.param, background_index=False)
+
+
+def codes(results):
+    return [result.code for result in results.results]
+
+
+def test_term_matches_search(isic):
+    for term in ["food", "01", " Mining ", "", "nonexistent"]:
+        assert codes(isic.query(Term(term))) == codes(isic.search(term))
+
+
+def test_composite_query_matches_post_filtering():
+    isic = ISIC4Classifier(background_index=False)
+    query = Level("class") & Within("C") & Term("food") & ~Term("beverage")
+    expected = [
+        result.code
+        for result in isic.search("food").results
+        if result.type == "class"
+        and result.hierarchy.section.lower() == "c"
+        and "beverage" not in result.description.lower()
+    ]
+    assert codes(isic.query(query)) == expected == ["1079"]
+
+
+def test_or_and_not():
+    isic = ISIC4Classifier(background_index=False)
+    either = codes(isic.query(Level("class") & (Term("wheat") | Term("rice"))))
+    assert set(either) == {
+        r.code
+        for q in ("wheat", "rice")
+        for r in isic.search(q).results
+        if r.type == "class"
+    }
+    everything = isic.query(Term("") | ~Term(""))
+    assert len(everything.results) == len(isic.index)
+    assert isic.query(Term("mining") & ~Term("mining")).results == []
+    assert isinstance(~~Term("x"), Term)
+
+
+def test_level_and_within():
+    isic = ISIC4Classifier(background_index=False)
+    index = isic.index
+    divisions = isic.query(Level("division") & Within("a"))
+    assert codes(divisions) == [d.code for d in isic.get_section("A").divisions]
+    subtree = isic.query(Within("011"))
+    assert codes(subtree)[0] == "011"
+    assert all(r.hierarchy.group == "011" for r in subtree.results)
+    assert isic.query(Within("0000")).results == []
+    assert len(isic.query(Level("section", "division")).results) == len(
+        index.codes["section"]
+    ) + len(index.codes["division"])
+    with pytest.raises(ValueError):
+        Level("chapter")
+
+
+def test_subtree_masks_are_contiguous():
+    index = ISICIndex(ISIC4Classifier(background_index=False).sections)
+    for node in index.nodes:
+        ids = [n.id for n in index.select(index.subtree_mask(node.id))]
+        assert ids == list(range(node.id, index.ends[node.id]))
+        for child in index.children[node.id]:
+            assert index.subtree_mask(child) & ~index.subtree_mask(node.id) == 0
+
+
+def test_query_before_index_is_ready():
+    isic = ISIC4Classifier(background_index=True)
+    query = Or(And(Level("group"), Within("B")), Not(Term("a")))
+    assert codes(isic.query(query)) == codes(
+        ISIC4Classifier(background_index=False).query(query)
+    )
@@ -0,0 +1,165 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from isic4kit import ISIC4Classifier
+from isic4kit.semantic import HashingEncoder, ISICSemanticIndex
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ISIC4KIT_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture(scope="module")
+def isic():
+    return ISIC4Classifier(background_index=False)
+
+
+class KeywordEncoder:
+    """Toy encoder mapping a few synonyms onto shared dimensions."""
+
+    name = "keyword-test"
+    vocabulary = {"car": 0, "motor": 0, "vehicles": 0, "dealer": 1, "sale": 1}
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts):
+        self.calls += 1
+        matrix = np.zeros((len(texts), 3), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                matrix[row, self.vocabulary.get(word, 2)] += 1
+        return matrix
+
+
+def test_hashing_encoder_is_normalised_and_deterministic():
+    encoder = HashingEncoder(dim=64)
+    matrix = encoder.encode(["Mining of coal", "", "تعدين الفحم"])
+    assert matrix.shape == (3, 64) and matrix.dtype == np.float32
+    assert np.allclose(np.linalg.norm(matrix[[0, 2]], axis=1), 1.0)
+    assert not matrix[1].any()
+    assert np.array_equal(matrix, encoder.encode(["Mining of coal", "", "تعدين الفحم"]))
+
+
+def test_semantic_search_ranks_exact_description_first(isic):
+    results = isic.semantic_search("Mining of hard coal", k=3)
+    assert len(results.results) == 3
+    assert results.results[0].description == "Mining of hard coal"
+    assert results.results[0].hierarchy.division == "05"
+
+
+def test_semantic_search_ar():
+    isic_ar = ISIC4Classifier(language="ar", background_index=False)
+    results = isic_ar.semantic_search("تعدين الفحم", k=5)
+    assert "05" in [result.code for result in results.results]
+
+
+def test_batch_matches_single_queries(isic):
+    queries = ["bakery products", "software publishing", "retail sale of fuel"]
+    batch = isic.semantic_search_many(queries, k=4)
+    singles = [isic.semantic_search(q, k=4) for q in queries]
+    # Scores of a batched matrix product may differ in the last bits
+    assert [
+        r.model_dump(exclude={"results": {"__all__": {"score"}}}) for r in batch
+    ] == [r.model_dump(exclude={"results": {"__all__": {"score"}}}) for r in singles]
+    for results, single in zip(batch, singles):
+        assert [r.score for r in results.results] == pytest.approx(
+            [r.score for r in single.results]
+        )
+
+
+def test_results_carry_scores(isic):
+    (results,) = isic.semantic_search_many(["Mining of hard coal"], k=3)
+    scores = [result.score for result in results.results]
+    assert scores == sorted(scores, reverse=True)
+    assert scores[0] == pytest.approx(1.0, abs=1e-5)
+    expected = isic.semantic_index().search("Mining of hard coal", k=3)
+    assert scores == pytest.approx([score for _, score in expected])
+    assert '"score":' in results.model_dump_json()
+    assert "score" not in isic.search("coal").results[0].model_dump()
+
+
+def test_top_k_is_sorted_and_bounded(isic):
+    semantic = isic.semantic_index()
+    ids, scores = semantic.top_k(["growing of cereals", "zzz"], k=10)
+    assert ids.shape == scores.shape == (2, 10)
+    assert np.all(np.diff(scores, axis=1) <= 1e-6)
+    ids, scores = semantic.top_k(["food"], k=10**6)
+    assert ids.shape == (1, len(isic.index))
+    assert sorted(ids[0].tolist()) == list(range(len(isic.index)))
+    assert semantic.top_k([], k=5)[0].shape == (0, 0)
+    assert semantic.search("food", k=0) == []
+
+
+def test_embeddings_are_cached_memory_mapped(isic, cache_dir):
+    encoder = KeywordEncoder()
+    semantic = ISICSemanticIndex(isic.index, encoder)
+    assert encoder.calls == 1
+    assert semantic.path.parent == cache_dir / "embeddings"
+    assert semantic.path.is_file()
+
+    reloaded = ISICSemanticIndex(isic.index, encoder)
+    assert encoder.calls == 1
+    assert isinstance(reloaded.matrix, np.memmap)
+    assert np.array_equal(reloaded.matrix, semantic.matrix)
+
+    uncached = ISICSemanticIndex(isic.index, encoder, use_cache=False)
+    assert encoder.calls == 2 and uncached.path is None
+
+
+def test_pluggable_encoder_finds_synonyms(isic):
+    results = isic.semantic_search("car dealer", k=5, encoder=KeywordEncoder())
+    assert "Sale of motor vehicles" in [r.description for r in results.results]
+
+
+def test_semantic_index_is_reused(isic):
+    assert isic.semantic_index() is isic.semantic_index()
+    encoder = KeywordEncoder()
+    assert isic.semantic_index(encoder) is not isic.semantic_index()
+
+
+def test_encoder_shape_is_checked(isic):
+    class Broken:
+        name = "broken"
+
+        def encode(self, texts):
+            return np.zeros((1, 4), dtype=np.float32)
+
+    with pytest.raises(ValueError):
+        ISICSemanticIndex(isic.index, Broken())
+
+
+def test_unnamed_encoders_are_not_confused(isic, cache_dir):
+    class Unnamed:
+        def __init__(self, dim):
+            self.dim = dim
+
+        def encode(self, texts):
+            return HashingEncoder(self.dim).encode(texts)
+
+    small, large = Unnamed(8), Unnamed(16)
+    assert isic.semantic_index(small).matrix.shape[1] == 8
+    assert isic.semantic_index(large).matrix.shape[1] == 16
+    assert isic.semantic_index(small) is isic.semantic_index(small)
+    # Unnamed encoders are not cached on disk, so a new classifier re-encodes
+    fresh = ISIC4Classifier(background_index=False)
+    assert fresh.semantic_index(Unnamed(16)).path is None
+    assert not (cache_dir / "embeddings").exists()
+    assert fresh.semantic_search("mining", k=3, encoder=Unnamed(16)).results
+
+
+def test_cached_embeddings_dimension_is_checked(isic):
+    class Named:
+        name = "resizable"
+
+        def __init__(self, dim):
+            self.dim = dim
+
+        def encode(self, texts):
+            return HashingEncoder(self.dim).encode(texts)
+
+    assert ISICSemanticIndex(isic.index, Named(8)).matrix.shape[1] == 8
+    assert ISICSemanticIndex(isic.index, Named(16)).matrix.shape[1] == 16
@@ -0,0 +1,116 @@
+import pytest
+
+from isic4kit import ISIC4Classifier
+from isic4kit.models import ISICClass, ISICGroup
+
+LEVELS = ("section", "division", "group", "class")
+
+
+@pytest.fixture(scope="module", params=["en", "ar"])
+def isic(request):
+    return ISIC4Classifier(language=request.param, background_index=False)
+
+
+def test_node_json_matches_models(isic):
+    index = isic.index
+    for node in index.nodes:
+        expected = index.get(node.type, node.code).model_dump_json().encode()
+        assert index.node_json(node.id) == expected
+
+
+def test_result_json_matches_models(isic):
+    index = isic.index
+    nodes = index.nodes
+    assert index.results_json(nodes) == index.results(nodes).model_dump_json().encode()
+
+
+@pytest.mark.parametrize("query", ["mining", "05", "", "nonexistent", "تعدين"])
+def test_search_json(isic, query):
+    expected = isic.search(query).model_dump_json().encode()
+    assert isic.search_json(query) == expected
+
+    index = isic._index
+    isic._index = None
+    try:
+        assert isic.search_json(query) == expected
+    finally:
+        isic._index = index
+
+
+def test_get_json(isic):
+    for level, code in [("section", "A"), ("division", "01"), ("class", "0111")]:
+        expected = getattr(isic, f"get_{level}")(code).model_dump_json().encode()
+        assert isic.get_json(level, code) == expected
+        assert isic.get_json(level, code) is isic.get_json(level, code)
+    assert isic.get_json("class", "0000") is None
+
+
+def test_empty_new_fields_are_not_serialized(isic):
+    # Models without subclasses or spans serialize as before these fields existed
+    class_ = isic.get_class("0111")
+    assert set(class_.model_dump()) == {"code", "description"}
+    result = isic.search("0111").results[0]
+    assert set(result.model_dump()) == {
+        "type",
+        "code",
+        "description",
+        "hierarchy",
+        "path",
+    }
+    assert set(result.model_dump()["hierarchy"]) == {
+        "section",
+        "division",
+        "group",
+        "class_",
+    }
+    assert "spans" in isic.search("0111", spans=True).results[0].model_dump()
+
+
+def test_subclasses_are_serialized(tmp_path, monkeypatch):
+    monkeypatch.setenv("ISIC4KIT_CACHE_DIR", str(tmp_path))
+    source = tmp_path / "ext.csv"
+    source.write_text(
+        "code,description\n011101,Growing of wheat\n",
+        encoding="utf-8",
+    )
+    isic = ISIC4Classifier(source=source, background_index=False)
+    data = isic.get_class("0111").model_dump()
+    assert data["subclasses"] == [{"code": "011101", "description": "Growing of wheat"}]
+    (result,) = isic.search("011101").results
+    assert result.model_dump()["hierarchy"]["subclass"] == "011101"
+    index = isic.index
+    for node in index.nodes:
+        expected = index.get(node.type, node.code).model_dump_json().encode()
+        assert index.node_json(node.id) == expected
+    assert index.results_json(index.nodes) == (
+        index.results(index.nodes).model_dump_json().encode()
+    )
+
+
+def test_json_escaping_matches_pydantic():
+    from isic4kit.index import ISICIndex
+    from isic4kit.models import ISICDivision, ISICSection
+
+    description = 'Quotes " back\\slash \n\t\x01 \x7f   é ع'
+    section = ISICSection(
+        code="x",
+        description=description,
+        divisions=[
+            ISICDivision(
+                code="99",
+                description=description,
+                groups=[
+                    ISICGroup(
+                        code="999",
+                        description=description,
+                        classes=[ISICClass(code="9999", description=description)],
+                    )
+                ],
+            )
+        ],
+    )
+    index = ISICIndex([section])
+    assert index.node_json(0) == section.model_dump_json().encode()
+    assert index.results_json(index.nodes) == (
+        index.results(index.nodes).model_dump_json().encode()
+    )
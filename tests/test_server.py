@@ -0,0 +1,149 @@
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+from isic4kit import ISIC4Classifier, loadtest
+from isic4kit.server import ISICServer, ISICService
+
+
+@pytest.fixture(scope="module")
+def server():
+    classifiers = {
+        "en": ISIC4Classifier(language="en", background_index=False),
+        "ar": ISIC4Classifier(language="ar", background_index=False),
+    }
+    server = ISICServer(("127.0.0.1", 0), ISICService(classifiers, cache_size=64))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def connection(server):
+    connection = http.client.HTTPConnection(*server.server_address[:2])
+    yield connection
+    connection.close()
+
+
+def request(connection, method, path, body=None):
+    connection.request(method, path, body=body)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_lookups_over_one_connection(connection):
+    status, section = request(connection, "GET", "/section/A")
+    assert status == 200
+    assert section["code"] == "a"
+    assert section["divisions"][0]["code"] == "01"
+    sock = connection.sock
+
+    status, class_ = request(connection, "GET", "/class/0111?lang=ar")
+    assert status == 200
+    assert class_["code"] == "0111"
+    assert class_["description"] == ISIC4Classifier("ar").get_class("0111").description
+    assert connection.sock is sock
+
+    status, error = request(connection, "GET", "/class/0000")
+    assert status == 404
+    assert "0000" in error["error"]
+
+
+def test_search(connection):
+    status, results = request(connection, "GET", "/search?q=hard%20coal")
+    assert status == 200
+    assert [r["code"] for r in results["results"]] == ["051", "0510"]
+    assert "spans" not in results["results"][0]
+
+    status, results = request(connection, "GET", "/search?q=hard%20coal&spans=1")
+    assert status == 200
+    assert results["results"][0]["spans"] == {"code": [], "description": [[10, 19]]}
+
+
+def test_batch(connection):
+    body = json.dumps(
+        {
+            "lang": "en",
+            "requests": [
+                {"type": "class", "code": "0111"},
+                {"type": "division", "code": "00"},
+                {"type": "search", "query": "hard coal"},
+            ],
+        }
+    )
+    status, payload = request(connection, "POST", "/batch", body)
+    assert status == 200
+    first, missing, search = payload["responses"]
+    assert first["code"] == "0111"
+    assert missing is None
+    assert len(search["results"]) == 2
+
+
+@pytest.mark.parametrize(
+    "method, path, body, status",
+    [
+        ("GET", "/nowhere", None, 404),
+        ("GET", "/search", None, 400),
+        ("GET", "/class/0111?lang=fr", None, 400),
+        ("POST", "/batch", "not json", 400),
+        ("POST", "/batch", json.dumps({"requests": [{"type": "x"}]}), 400),
+        ("POST", "/nowhere", "{}", 404),
+    ],
+)
+def test_errors(connection, method, path, body, status):
+    assert request(connection, method, path, body)[0] == status
+    assert request(connection, "GET", "/health")[0] == 200
+
+
+def raw_request(server, head: bytes) -> tuple[int, bytes]:
+    """Send raw request bytes and read until the server closes the connection."""
+    with socket.create_connection(server.server_address[:2], timeout=5) as sock:
+        sock.sendall(head)
+        data = b""
+        while chunk := sock.recv(65536):
+            data += chunk
+    status = int(data.split(b" ", 2)[1])
+    return status, data.partition(b"\r\n\r\n")[2]
+
+
+@pytest.mark.parametrize(
+    "headers, status",
+    [
+        (b"Content-Length: abc\r\n", 400),
+        (b"Content-Length: -1\r\n", 400),
+        (b"Content-Length: +5\r\n", 400),
+        (b"", 411),
+    ],
+)
+def test_invalid_content_length(server, headers, status):
+    # Keep-alive requests: the server must answer and close instead of blocking
+    head = b"POST /batch HTTP/1.1\r\nHost: x\r\n" + headers + b"\r\n{}"
+    got, body = raw_request(server, head)
+    assert got == status
+    assert "error" in json.loads(body)
+    head = b"POST /nowhere HTTP/1.1\r\nHost: x\r\n" + headers + b"\r\n{}"
+    assert raw_request(server, head)[0] == 404
+
+
+def test_hot_codes_are_cached(server, connection):
+    service = server.service
+    request(connection, "GET", "/group/011")
+    hits = service.lookup.cache_info().hits
+    request(connection, "GET", "/group/011")
+    request(
+        connection, "POST", "/batch", json.dumps([{"type": "group", "code": "011"}])
+    )
+    assert service.lookup.cache_info().hits == hits + 2
+
+
+def test_loadtest(server):
+    host, port = server.server_address[:2]
+    summary = loadtest.run(f"http://{host}:{port}", requests=200, concurrency=4)
+    assert summary["completed"] == 200
+    assert summary["errors"] == 0
+    assert summary["latency_ms"]["p50"] <= summary["latency_ms"]["max"]
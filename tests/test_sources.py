@@ -0,0 +1,182 @@
+import json
+
+import pytest
+
+from isic4kit import ISIC4Classifier
+from isic4kit import sources
+
+FULL_CSV = """code,description,parent
+A,Agriculture,
+01,Crop production,
+011,Non-perennial crops,
+0111,Growing of cereals,
+01111,Growing of wheat,
+011111,Growing of durum wheat,
+011190,Growing of other cereals,
+B,Mining,
+05,Mining of coal,
+051,Mining of hard coal,
+0510,Mining of hard coal,
+"""
+
+EXTENSION_CSV = """code,description
+011101,Growing of wheat
+011102,Growing of barley
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ISIC4KIT_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+def write(path, content):
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def test_load_full_csv(tmp_path):
+    isic = ISIC4Classifier(source=write(tmp_path / "national.csv", FULL_CSV))
+
+    assert [s.code for s in isic.sections] == ["A", "B"]
+    assert isic.get_division("01").groups[0].code == "011"
+    class_ = isic.get_class("0111")
+    assert [s.code for s in class_.subclasses] == ["01111", "011190"]
+    assert isic.get_subclass("011111").description == "Growing of durum wheat"
+    assert isic.get_subclass("011111") in isic.get_subclass("01111").subclasses
+
+
+def test_extension_extends_bundled_data(tmp_path):
+    source = write(tmp_path / "ext.csv", EXTENSION_CSV)
+    isic = ISIC4Classifier(source=source, background_index=False)
+
+    assert len(isic.sections) == len(ISIC4Classifier().sections)
+    assert [s.code for s in isic.get_class("0111").subclasses] == ["011101", "011102"]
+
+    results = isic.search("barley").results
+    assert [(r.type, r.code, r.path) for r in results] == [
+        ("subclass", "011102", "a/01/011/0111/011102")
+    ]
+    assert results[0].hierarchy.subclass == "011102"
+    assert results[0].hierarchy.class_ == "0111"
+
+
+def test_subclass_search_and_lookup_without_index(tmp_path):
+    isic = ISIC4Classifier(source=write(tmp_path / "national.csv", FULL_CSV))
+    isic._index = None
+
+    assert isic.get_subclass("011111").code == "011111"
+    assert isic.get_subclass("099999") is None
+    assert [r.code for r in isic.search("wheat").results] == ["01111", "011111"]
+
+
+def test_directory_source(tmp_path):
+    write(tmp_path / "en.csv", FULL_CSV)
+    isic = ISIC4Classifier(language="en", source=tmp_path)
+    assert isic.get_subclass("01111") is not None
+
+    with pytest.raises(ValueError, match="Available languages: en"):
+        ISIC4Classifier(language="fr", source=tmp_path)
+
+
+def test_nested_and_flat_json(tmp_path):
+    nested = {
+        "sections": [
+            {
+                "section": "a",
+                "description": "Agriculture",
+                "divisions": [
+                    {
+                        "division": "01",
+                        "description": "Crops",
+                        "groups": [
+                            {
+                                "group": "011",
+                                "description": "Non-perennial",
+                                "classes": [
+                                    {
+                                        "class": "0111",
+                                        "description": "Cereals",
+                                        "subclasses": [
+                                            {
+                                                "subclass": "01111",
+                                                "description": "Wheat",
+                                            }
+                                        ],
+                                    }
+                                ],
+                            }
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+    flat = [
+        {"code": "a", "description": "Agriculture"},
+        {"code": "01", "description": "Crops", "parent": "a"},
+        {"code": "011", "description": "Non-perennial"},
+        {"code": "0111", "description": "Cereals"},
+        {"code": "01111", "description": "Wheat", "parent": "0111"},
+    ]
+    write(tmp_path / "nested.json", json.dumps(nested))
+    write(tmp_path / "flat.json", json.dumps({"records": flat}))
+
+    from_nested = ISIC4Classifier(source=tmp_path / "nested.json")
+    from_flat = ISIC4Classifier(source=tmp_path / "flat.json")
+    assert from_nested.sections == from_flat.sections
+    assert from_flat.get_subclass("01111").description == "Wheat"
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        (FULL_CSV + "0111,Duplicate,\n", "duplicate code '0111'"),
+        (FULL_CSV + "0999,Orphan,\n", "no parent found for code '0999'"),
+        (FULL_CSV + "01X,Bad code,\n", "invalid ISIC code '01X'"),
+        (FULL_CSV + "0512,Wrong parent,011\n", "does not start with parent '011'"),
+        (FULL_CSV + "0512,,\n", "missing description"),
+        (
+            "code,description,parent\n01,Division first,\nA,Section,\n",
+            "division '01' has no section",
+        ),
+        ("name,description\nx,y\n", "missing CSV column"),
+    ],
+)
+def test_validation_errors(tmp_path, content, message):
+    source = write(tmp_path / "bad.csv", content)
+    with pytest.raises(ValueError, match=message):
+        ISIC4Classifier(source=source)
+
+
+def test_missing_source(tmp_path):
+    with pytest.raises(ValueError, match="does not exist"):
+        ISIC4Classifier(source=tmp_path / "missing.csv")
+
+
+def test_compiled_cache(tmp_path, cache_dir, monkeypatch):
+    source = write(tmp_path / "national.csv", FULL_CSV)
+    first = ISIC4Classifier(source=source)
+    assert list((cache_dir / "compiled").glob("*.marshal"))
+
+    def fail(path):
+        raise AssertionError("source parsed despite cache")
+
+    monkeypatch.setattr(sources, "read_records", fail)
+    second = ISIC4Classifier(source=source)
+    assert second.sections == first.sections
+    assert second.data_version == first.data_version
+
+    write(source, FULL_CSV.replace("durum", "hard"))
+    with pytest.raises(AssertionError):
+        ISIC4Classifier(source=source)
+
+
+def test_bundled_data_round_trip():
+    bundled = json.loads((sources.BUNDLED_DATA_DIR / "en.json").read_text("utf-8"))
+    compiled = sources.compile_records(sources.flatten(bundled))
+
+    isic = ISIC4Classifier()
+    assert ISIC4Classifier._build_sections(compiled) == isic.sections
+    assert len(isic.data_version) == 64
@@ -0,0 +1,99 @@
+import contextlib
+import io
+
+import pytest
+
+from isic4kit import ISIC4Classifier, Tree
+from isic4kit.text import find_spans, match_spans, normalize, offset_map
+
+QUERIES = {
+    "en": ["mining", "of", "C", "05", "", "nonexistent"],
+    "ar": ["زراعة", "صناعة", "تعدين", "05", "ة", ""],
+}
+
+
+@pytest.fixture(scope="module", params=["en", "ar"])
+def classifiers(request):
+    language = request.param
+    objects = ISIC4Classifier(language=language, background_index=False)
+    linear = ISIC4Classifier(language=language, background_index=False)
+    linear._index = None
+    columnar = ISIC4Classifier(language=language, storage="columnar")
+    return language, objects, linear, columnar
+
+
+def test_normalize_strips_arabic_diacritics():
+    assert normalize("الزِّراعـة") == "الزراعة"
+    assert normalize("Mining") == "mining"
+    assert offset_map("Mining of coal") is None
+    offsets = offset_map("زِرا")
+    assert list(offsets) == [0, 2, 3, 4]
+    assert find_spans("aa", "aaaa") == [(0, 2), (2, 4)]
+    assert find_spans("", "abc") == []
+
+
+def test_spans_map_back_to_original_text():
+    description = "الصِّناعة والصِّناعة"
+    spans = match_spans(normalize("صناعة"), "10", description)
+    assert spans["code"] == []
+    assert [description[s:e] for s, e in spans["description"]] == ["صِّناعة"] * 2
+    # Diacritics on the last matched letter belong to the span
+    assert match_spans("زر", "x", "زَرَع")["description"] == [(0, 4)]
+    # Characters whose lower case is longer still map to whole characters
+    assert match_spans("i", "x", "İx")["description"] == [(0, 1)]
+
+
+def test_spans_agree_across_search_paths(classifiers):
+    language, objects, linear, columnar = classifiers
+    for query in QUERIES[language]:
+        expected = objects.search(query, spans=True)
+        assert linear.search(query, spans=True) == expected
+        assert columnar.search(query, spans=True) == expected
+        for result in expected.results:
+            spans = result.spans
+            assert spans.code or spans.description or not query
+            for start, end in spans.description:
+                assert normalize(result.description[start:end]) == normalize(query)
+            for start, end in spans.code:
+                assert normalize(result.code[start:end]) == normalize(query)
+
+
+def test_diacritics_are_ignored_when_matching():
+    isic = ISIC4Classifier(language="ar", background_index=False)
+    plain = [r.code for r in isic.search("صناعة").results]
+    assert [r.code for r in isic.search("صِناعة").results] == plain
+    assert any(
+        "صناعة" not in r.description and "صناعة" in normalize(r.description)
+        for r in isic.search("صناعة").results
+    )
+
+
+def test_spans_are_off_by_default():
+    isic = ISIC4Classifier(background_index=False)
+    assert all(r.spans is None for r in isic.search("mining").results)
+    assert (
+        isic.search_json("mining") == isic.search("mining").model_dump_json().encode()
+    )
+    assert isic.search_json("mining", spans=True) == (
+        isic.search("mining", spans=True).model_dump_json().encode()
+    )
+
+
+def test_highlight_rendering():
+    isic = ISIC4Classifier(background_index=False)
+    results = isic.search("coal", spans=True)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        results.results[0].print_tree(highlight=("[", "]"))
+        results.print_tree(highlight=("[", "]"))
+    lines = output.getvalue().splitlines()
+    assert lines[0] == "└── 05: Mining of [coal] and lignite"
+    assert "        └── 051: Mining of hard [coal]" in lines
+
+    assert Tree.mark("abcabc", [(0, 1), (3, 4)], Tree.BOLD) == (
+        "\033[1ma\033[0mbc\033[1ma\033[0mbc"
+    )
+    plain = io.StringIO()
+    with contextlib.redirect_stdout(plain):
+        results.results[0].print_tree()
+    assert plain.getvalue() == "└── 05: Mining of coal and lignite\n"
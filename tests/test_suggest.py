@@ -0,0 +1,114 @@
+import pytest
+
+from isic4kit import ISIC4Classifier
+from isic4kit.suggest import ISICSuggestIndex, normalize_code
+
+
+@pytest.fixture(scope="module")
+def isic():
+    return ISIC4Classifier(background_index=False)
+
+
+def _codes(suggestions):
+    return [suggestion.code for suggestion in suggestions]
+
+
+def test_typos(isic):
+    (suggestion,) = isic.suggest("0119x")
+    assert (suggestion.input, suggestion.code, suggestion.reason) == (
+        "0119x",
+        "0119",
+        "typo",
+    )
+    assert suggestion.type == "class"
+    assert suggestion.description == isic.get_class("0119").description
+    assert "0119" in _codes(isic.suggest("0191"))  # swapped digits
+    assert _codes(isic.suggest("0x119")) == ["0119"]  # inserted character
+    assert _codes(isic.suggest("0120", limit=3)) == ["0121", "0122", "0123"]
+
+
+def test_ancestors_and_siblings(isic):
+    suggestions = isic.suggest("9999")
+    assert [(s.code, s.reason) for s in suggestions] == [
+        ("9499", "typo"),
+        ("990", "sibling"),
+        ("99", "ancestor"),
+    ]
+    scores = [s.score for s in suggestions]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0 < score < 1 for score in scores)
+
+
+def test_valid_codes_and_levels(isic):
+    assert [(s.code, s.reason, s.score) for s in isic.suggest(" 01.19 ")] == [
+        ("0119", "exact", 1.0)
+    ]
+    assert _codes(isic.suggest("0120", limit=2, item_type="group")) == ["012", "120"]
+    # A valid code of another level is not exact
+    assert "0119" not in _codes(isic.suggest("0119", item_type="group"))
+    assert isic.suggest("") == []
+    with pytest.raises(ValueError):
+        isic.suggest("0120", item_type="sector")
+
+
+def test_limit_applies_to_every_path(isic):
+    assert isic.suggest("0111", limit=0) == []
+    assert isic.suggest("0120", limit=0) == []
+    assert len(isic.suggest("0120", limit=1)) == 1
+    with pytest.raises(ValueError, match="limit"):
+        isic.suggest("0111", limit=-1)
+    with pytest.raises(ValueError, match="limit"):
+        list(isic.suggest_many(["0120"], limit=-2))
+
+
+def test_suggest_many(isic):
+    results = list(isic.suggest_many(["0111", "0120", "0120", "zzzzzzz"], limit=2))
+    assert results == [
+        ("0111", ("0111",)),
+        ("0120", ("0121", "0122")),
+        ("0120", ("0121", "0122")),
+        ("zzzzzzz", ()),
+    ]
+
+
+def test_typos_match_brute_force(isic):
+    suggest_index = isic.suggest_index()
+    assert isic.suggest_index() is suggest_index
+
+    def one_edit(a, b):
+        if a == b:
+            return False
+        if len(a) == len(b):
+            diff = [i for i in range(len(a)) if a[i] != b[i]]
+            return len(diff) == 1 or (
+                len(diff) == 2
+                and diff[1] == diff[0] + 1
+                and a[diff[0]] == b[diff[1]]
+                and a[diff[1]] == b[diff[0]]
+            )
+        if len(a) > len(b):
+            a, b = b, a
+        return len(b) == len(a) + 1 and any(
+            b[:i] + b[i + 1 :] == a for i in range(len(b))
+        )
+
+    codes = suggest_index.codes
+    for query in ["0120", "1091", "9x9", "0111", "01", "a1", "4923", "49023", "z"]:
+        key = normalize_code(query)
+        if key in suggest_index.keys:
+            continue
+        expected = {
+            node_id for node_id, code in enumerate(codes) if one_edit(key, code)
+        }
+        typos = {
+            node_id
+            for node_id, reason, _ in suggest_index.suggest(query, limit=len(codes))
+            if reason == "typo"
+        }
+        assert typos == expected, query
+
+
+def test_columnar_storage():
+    isic = ISIC4Classifier(storage="columnar")
+    assert _codes(isic.suggest("0119x")) == ["0119"]
+    assert isinstance(isic.suggest_index(), ISICSuggestIndex)
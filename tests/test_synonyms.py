@@ -0,0 +1,166 @@
+import json
+
+import pytest
+
+from isic4kit import ISIC4Classifier
+from isic4kit.cache import ISICSearchCache
+from isic4kit.fts import fts5_available
+from isic4kit.index import current_index
+from isic4kit.synonyms import SYNONYMS_DIR, ISICSynonyms, open_synonyms
+from isic4kit.text import normalize_query
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ISIC4KIT_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _codes(results):
+    return [result.code for result in results.results]
+
+
+@pytest.mark.parametrize("language", ["en", "ar"])
+def test_bundled_expansions_match_nodes(language):
+    isic = ISIC4Classifier(language, background_index=False, synonyms=True)
+    index = current_index(isic)
+    masks = isic.synonyms.compile(index)
+    assert len(masks) == len(isic.synonyms) > 20
+    # Every bundled expansion is a code or occurs in some description
+    for term, expansions in isic.synonyms.table.items():
+        assert masks[term], term
+        for expansion in expansions:
+            assert index.lookup(expansion) or index.term_mask(
+                normalize_query(expansion)
+            ), (term, expansion)
+
+
+def test_search_with_synonyms():
+    plain = ISIC4Classifier(background_index=False)
+    isic = ISIC4Classifier(background_index=False, synonyms=True)
+    assert _codes(plain.search("trucking")) == []
+    assert _codes(isic.search("Trucking ")) == ["4923"]
+    # Expansions come first, then the other direct matches, in hierarchy order
+    restaurants = _codes(isic.search("restaurant"))
+    assert set(_codes(plain.search("restaurant"))) < set(restaurants)
+    index = current_index(isic)
+    expansions = [
+        node.code for node in index.select(isic.synonyms.mask(index, "restaurant"))
+    ]
+    assert "5610" in expansions
+    assert restaurants[: len(expansions)] == expansions
+    rest = restaurants[len(expansions) :]
+    assert rest == [node.code for node in index.nodes if node.code in rest]
+    # Queries without synonyms are unchanged
+    assert isic.search("coal") == plain.search("coal")
+    assert (
+        isic.search_json("trucking")
+        == isic.search("trucking").model_dump_json().encode()
+    )
+
+
+def test_short_terms_list_expansions_first():
+    isic = ISIC4Classifier(background_index=False, synonyms=True)
+    index = current_index(isic)
+    subtree = [node.code for node in index.nodes if node.code[:2] in ("62", "63")]
+    codes = _codes(isic.search("IT"))
+    # "it" occurs in many words, e.g. "activities", but the 62/63 subtree leads
+    assert len(codes) > len(subtree)
+    assert codes[: len(subtree)] == subtree
+    assert codes == _codes(isic.search("it"))
+    assert isic.search_json("it") == isic.search("it").model_dump_json().encode()
+
+
+def test_arabic_synonyms():
+    isic = ISIC4Classifier("ar", background_index=False, synonyms=True)
+    assert _codes(isic.search("مطعم")) == ["56", "561", "5610"]
+    assert "4923" in _codes(isic.search("شاحنات"))
+
+
+def test_spans_of_text_expansions():
+    isic = ISIC4Classifier(background_index=False, synonyms=True)
+    (result,) = isic.search("trucking", spans=True).results
+    assert result.spans.description == [(0, 25)]
+    pages = []
+    page = isic.search_page("restaurant", limit=2)
+    while True:
+        pages.extend(page.results)
+        if page.next_cursor is None:
+            break
+        page = isic.search_page("restaurant", limit=2, cursor=page.next_cursor)
+    assert pages == isic.search("restaurant").results
+
+
+def test_user_file_extends_bundled_table(tmp_path):
+    path = tmp_path / "synonyms.json"
+    path.write_text(
+        json.dumps({"Trucking": ["0510"], "coal miner": "051"}), encoding="utf-8"
+    )
+    isic = ISIC4Classifier(background_index=False, synonyms=path)
+    assert _codes(isic.search("trucking")) == ["0510", "4923"]
+    assert _codes(isic.search("coal miner")) == ["051", "0510"]
+    mapping = ISIC4Classifier(
+        background_index=False, synonyms={"coal miner": ["hard coal"]}
+    )
+    assert _codes(mapping.search("coal miner")) == ["051", "0510"]
+    assert "trucking" in mapping.synonyms
+
+
+def test_invalid_tables(tmp_path):
+    path = tmp_path / "bad.json"
+    path.write_text('{"trucking": [1]}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        ISIC4Classifier(background_index=False, synonyms=path)
+    path.write_text("[]", encoding="utf-8")
+    with pytest.raises(ValueError):
+        ISICSynonyms.load("en", path)
+    with pytest.raises(ValueError):
+        ISICSynonyms.load("en", tmp_path / "missing.json")
+
+
+def test_open_synonyms():
+    assert open_synonyms(None, "en") is None
+    assert open_synonyms(False, "en") is None
+    synonyms = ISICSynonyms({"Trucking": ["4923"], "TRUCKING": ["4923", "49"]})
+    assert synonyms.get("trucking") == ("4923", "49")
+    assert open_synonyms(synonyms, "en") is synonyms
+    assert len(open_synonyms(True, "xx")) == 0
+    assert len(open_synonyms(True, "en")) == len(
+        json.loads((SYNONYMS_DIR / "en.json").read_text(encoding="utf-8"))
+    )
+
+
+def test_compiled_per_index():
+    isic = ISIC4Classifier(background_index=False, synonyms=True)
+    index = current_index(isic)
+    masks = isic.synonyms.compile(index)
+    assert isic.synonyms.compile(index) is masks
+    isic.sections = list(isic.sections)
+    assert isic.synonyms.compile(current_index(isic)) is not masks
+
+
+def test_cache_key_includes_synonyms(tmp_path):
+    cache = ISICSearchCache(tmp_path / "search.sqlite3")
+    plain = ISIC4Classifier(background_index=False, search_cache=cache)
+    isic = ISIC4Classifier(background_index=False, search_cache=cache, synonyms=True)
+    assert _codes(plain.search("trucking")) == []
+    assert _codes(isic.search("trucking")) == ["4923"]
+    assert _codes(plain.search("trucking")) == []
+
+
+@pytest.mark.skipif(not fts5_available(), reason="SQLite without FTS5")
+def test_full_text_backend():
+    isic = ISIC4Classifier(
+        background_index=False,
+        search_backend="fts",
+        synonyms={"freight": ["8610"]},
+    )
+    assert _codes(isic.search("freight")) == [
+        "8610",
+        "4912",
+        "4923",
+        "5012",
+        "5022",
+        "512",
+        "5120",
+    ]
@@ -0,0 +1,115 @@
+import contextlib
+import io
+import sys
+
+import pytest
+
+from isic4kit import ISIC4Classifier, Tree
+
+
+class Node:
+    def __init__(self, code, children=()):
+        self.code = code
+        self.description = f"Node {code}"
+        self.children = list(children)
+
+
+def _reference(node, prefix="", is_last=True):
+    """The recursive rendering Tree.print used to implement."""
+    lines = [f"{prefix}{'└── ' if is_last else '├── '}{Tree.label(node)}\n"]
+    child_prefix = prefix + ("    " if is_last else "│   ")
+    children = Tree.children(node)
+    for i, child in enumerate(children):
+        lines += _reference(child, child_prefix, i == len(children) - 1)
+    return lines
+
+
+@pytest.fixture(scope="module")
+def isic():
+    return ISIC4Classifier(background_index=False)
+
+
+def test_print_matches_recursive_rendering(isic):
+    for section in isic.sections:
+        output = io.StringIO()
+        Tree.print(section, "  ", is_last=False, file=output)
+        assert output.getvalue() == "".join(_reference(section, "  ", False))
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        isic.sections[0].print_tree()
+    assert stdout.getvalue() == "".join(_reference(isic.sections[0]))
+
+
+def test_deep_hierarchies_do_not_recurse():
+    root = node = Node("0")
+    for i in range(1, sys.getrecursionlimit() + 100):
+        child = Node(str(i))
+        node.children.append(child)
+        node = child
+    output = io.StringIO()
+    Tree.print(root, file=output)
+    lines = output.getvalue().splitlines()
+    assert len(lines) == sys.getrecursionlimit() + 100
+    assert lines[-1].endswith(f"└── {node.code}: Node {node.code}")
+
+
+def test_max_depth(isic):
+    section = isic.get_section("B")
+    output = io.StringIO()
+    section.print_tree(max_depth=1, file=output)
+    assert output.getvalue().splitlines() == ["└── b: Mining and quarrying"] + [
+        f"    {'└' if i == len(section.divisions) - 1 else '├'}── "
+        f"{division.code}: {division.description}"
+        for i, division in enumerate(section.divisions)
+    ]
+    output = io.StringIO()
+    section.print_tree(max_depth=0, file=output)
+    assert output.getvalue() == "└── b: Mining and quarrying\n"
+    with pytest.raises(ValueError):
+        section.print_tree(max_depth=-1)
+
+
+def test_level_filters(isic):
+    output = io.StringIO()
+    isic.get_division("05").print_tree(levels=("division", "class"), file=output)
+    assert output.getvalue().splitlines() == [
+        "└── 05: Mining of coal and lignite",
+        "    ├── 0510: Mining of hard coal (anthracite)",
+        "    └── 0520: Mining of lignite",
+    ]
+    # Hidden roots are replaced by their shown descendants
+    output = io.StringIO()
+    isic.get_group("051").print_tree(levels=["class"], file=output)
+    assert output.getvalue() == "└── 0510: Mining of hard coal (anthracite)\n"
+    output = io.StringIO()
+    isic.search("mining").print_tree(levels=["division"], max_depth=0, file=output)
+    assert [line[4:6] for line in output.getvalue().splitlines()] == [
+        "05",
+        "07",
+        "08",
+        "09",
+        "28",
+    ]
+    with pytest.raises(ValueError):
+        Tree.print(isic.sections[0], levels=["sector"])
+
+
+def test_search_result_options(isic):
+    result = isic.search("hard coal", spans=True).results[-1]
+    output = io.StringIO()
+    result.print_tree(highlight=("[", "]"), file=output, max_depth=0)
+    assert output.getvalue() == "└── 0510: Mining of [hard coal] (anthracite)\n"
+    output = io.StringIO()
+    result.print_tree(file=output, levels=["division"])
+    assert output.getvalue() == ""
+
+
+def test_columnar_views_share_the_engine():
+    objects = ISIC4Classifier(background_index=False)
+    columnar = ISIC4Classifier(storage="columnar")
+    node = columnar.columns.node(columnar.columns.lookup("05"))
+    expected = io.StringIO()
+    objects.get_division("05").print_tree(levels=["class"], file=expected)
+    output = io.StringIO()
+    node.print_tree(levels=["class"], file=output)
+    assert output.getvalue() == expected.getvalue()